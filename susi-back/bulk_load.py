@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+입결 업로드 스크립트 공용 적재 유틸리티
+
+- copy_rows: 파라미터 튜플 목록을 COPY FROM STDIN(CSV)으로 적재
+- swap_load: 섀도 테이블에 적재/인덱싱한 뒤 이름 변경으로 원본 테이블과 교체
+  (인덱스/제약조건/기본값/코멘트/권한/트리거/소유 시퀀스와 기존 행의 created_at을 이어받음.
+   다른 테이블이 외래키로 참조하는 테이블은 원본 삭제가 실패해 교체되지 않으며,
+   RLS 정책/규칙 등 그 밖의 객체는 옮기지 않는다)
+- convert_column: 엑셀 컬럼 하나를 INSERT 파라미터 값 목록으로 변환 (NumPy 연산, 필요 시 셀 단위)
+"""
+
+import csv
+import io
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from psycopg2.extensions import quote_ident
+
+# 교체 시 원본 테이블 잠금 대기 한도 (조회가 길게 물려 있으면 교체를 포기)
+SWAP_LOCK_TIMEOUT = '5s'
+
+# 교체 시 같은 키의 기존 행에서 값을 이어받는 컬럼 (upsert 경로에서는 갱신되지 않던 값)
+CARRY_OVER_COLUMNS = ('created_at',)
+
+
+def copy_rows(cursor, table, columns, rows):
+    """
+    rows를 CSV로 직렬화해 COPY FROM STDIN으로 table에 적재, 적재한 행 수 반환
+
+    susi-front/scripts/mock_data_db.py도 이 함수로 적재한다.
+    """
+    # None은 따옴표 없는 빈 값으로 기록되어 CSV COPY에서 NULL로 읽힌다
+    # (csv.writer는 빈 문자열도 같은 빈 값으로 쓰므로 빈 문자열 역시 NULL로 적재된다)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    buffer.seek(0)
+
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+        buffer,
+    )
+    return count
+
+
+def dedup_last(rows, key_index=0):
+    """같은 키가 여러 번 나오면 마지막 행만 남김 (ON CONFLICT DO UPDATE와 같은 결과)"""
+    return list({row[key_index]: row for row in rows}.values())
+
+
+def shadow_name(name, suffix='_shadow'):
+    """식별자 길이 한도(63자)를 넘지 않도록 suffix를 붙인 이름"""
+    return name[:63 - len(suffix)] + suffix
+
+
+def _table_indexes(cursor, table):
+    """원본 테이블의 인덱스 정의와 (있으면) 그 인덱스를 쓰는 제약조건"""
+    cursor.execute("""
+        SELECT ic.relname, pg_get_indexdef(ix.indexrelid), con.conname, con.contype
+        FROM pg_index ix
+        JOIN pg_class ic ON ic.oid = ix.indexrelid
+        LEFT JOIN pg_constraint con
+            ON con.conindid = ix.indexrelid AND con.conrelid = ix.indrelid
+        WHERE ix.indrelid = %s::regclass
+        ORDER BY ic.relname
+    """, (table,))
+    return cursor.fetchall()
+
+
+def _owned_sequences(cursor, table):
+    """serial 컬럼이 소유한 시퀀스 목록 [(컬럼명, 시퀀스명)]"""
+    cursor.execute("""
+        SELECT a.attname, pg_get_serial_sequence(%s, a.attname)
+        FROM pg_attribute a
+        WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+    """, (table, table))
+    return [(col, seq) for col, seq in cursor.fetchall() if seq]
+
+
+def _table_columns(cursor, table):
+    cursor.execute("""
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = %s::regclass AND attnum > 0 AND NOT attisdropped
+    """, (table,))
+    return [name for name, in cursor.fetchall()]
+
+
+def _load_carrying_over(cursor, table, shadow, columns, rows, key_column, carried):
+    """
+    임시 테이블에 COPY한 뒤, 원본에 같은 키가 있는 행은 carried 컬럼 값을 원본에서 가져와 섀도 테이블에 넣음
+
+    원본에 없는 키는 carried 컬럼을 비워 두어 섀도 테이블의 기본값이 들어간다.
+    (적재 후 UPDATE하면 섀도 테이블에 죽은 튜플이 행 수만큼 생기므로 INSERT 두 번으로 나눔)
+    """
+    stage = shadow_name(table, '_stage')
+    column_list = ', '.join(columns)
+    staged_columns = ', '.join(f's.{col}' for col in columns)
+    cursor.execute(f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS SELECT {column_list} FROM {table} WITH NO DATA")
+    copy_rows(cursor, stage, columns, rows)
+    cursor.execute(f"""
+        INSERT INTO {shadow} ({column_list}, {', '.join(carried)})
+        SELECT {staged_columns}, {', '.join(f't.{col}' for col in carried)}
+        FROM {stage} s JOIN {table} t ON t.{key_column} = s.{key_column}
+    """)
+    cursor.execute(f"""
+        INSERT INTO {shadow} ({column_list})
+        SELECT {staged_columns}
+        FROM {stage} s
+        WHERE NOT EXISTS (SELECT 1 FROM {table} t WHERE t.{key_column} = s.{key_column})
+    """)
+    cursor.execute(f"DROP TABLE {stage}")
+
+
+def _copy_table_comment(cursor, table, shadow):
+    """테이블 코멘트 복사 (컬럼/제약조건 코멘트는 LIKE ... INCLUDING COMMENTS로 복사됨)"""
+    cursor.execute("SELECT obj_description(%s::regclass, 'pg_class')", (table,))
+    comment, = cursor.fetchone()
+    if comment is not None:
+        cursor.execute(f"COMMENT ON TABLE {shadow} IS %s", (comment,))
+
+
+def _copy_grants(cursor, table, shadow):
+    """원본 테이블에 부여된 권한(소유자 제외)을 섀도 테이블에 다시 부여"""
+    cursor.execute("""
+        SELECT CASE WHEN acl.grantee = 0 THEN NULL ELSE pg_get_userbyid(acl.grantee) END,
+               acl.privilege_type, acl.is_grantable
+        FROM pg_class c, aclexplode(c.relacl) acl
+        WHERE c.oid = %s::regclass AND acl.grantee <> c.relowner
+        ORDER BY 1, 2
+    """, (table,))
+    for grantee, privilege, grantable in cursor.fetchall():
+        role = 'PUBLIC' if grantee is None else quote_ident(grantee, cursor)
+        option = ' WITH GRANT OPTION' if grantable else ''
+        cursor.execute(f"GRANT {privilege} ON {shadow} TO {role}{option}")
+
+
+def _copy_triggers(cursor, table, shadow):
+    """원본 테이블의 사용자 정의 트리거를 섀도 테이블에 생성 (트리거 이름은 테이블마다 따로라 그대로 사용)"""
+    cursor.execute("""
+        SELECT pg_get_triggerdef(oid)
+        FROM pg_trigger
+        WHERE tgrelid = %s::regclass AND NOT tgisinternal
+        ORDER BY tgname
+    """, (table,))
+    for trigger_def, in cursor.fetchall():
+        cursor.execute(re.sub(
+            r'^(CREATE (?:CONSTRAINT )?TRIGGER \S+ .*? ON )\S+',
+            lambda m: f'{m.group(1)}{shadow}',
+            trigger_def,
+        ))
+
+
+def _build_indexes(cursor, table, shadow):
+    """
+    원본과 같은 인덱스/제약조건을 섀도 테이블에 임시 이름으로 생성
+
+    Returns:
+        renames: 교체 후 원래 이름으로 되돌릴 [(종류, 임시 이름, 원래 이름)]
+    """
+    renames = []
+    for index_name, index_def, con_name, con_type in _table_indexes(cursor, table):
+        temp_name = shadow_name(index_name, '_shadow')
+        shadow_def = re.sub(
+            r'^(CREATE (?:UNIQUE )?INDEX )\S+( ON (?:ONLY )?)\S+',
+            lambda m: f'{m.group(1)}{quote_ident(temp_name, cursor)}{m.group(2)}{shadow}',
+            index_def,
+        )
+        cursor.execute(shadow_def)
+
+        if con_name is None:
+            renames.append(('index', temp_name, index_name))
+            continue
+
+        if con_type not in ('p', 'u'):
+            raise ValueError(f"{table}: 지원하지 않는 제약조건 유형 '{con_type}' ({con_name})")
+        constraint = 'PRIMARY KEY' if con_type == 'p' else 'UNIQUE'
+        # USING INDEX는 인덱스 이름을 제약조건 이름으로 바꾸므로 같은 임시 이름을 사용
+        cursor.execute(
+            f"ALTER TABLE {shadow} ADD CONSTRAINT {quote_ident(temp_name, cursor)} "
+            f"{constraint} USING INDEX {quote_ident(temp_name, cursor)}"
+        )
+        renames.append(('constraint', temp_name, con_name))
+
+    return renames
+
+
+def swap_load(conn, table, columns, rows, key_index=0):
+    """
+    섀도 테이블에 적재 후 원본과 교체
+
+    1. {table}_shadow 를 원본과 같은 컬럼/기본값/코멘트로 생성하고 COPY로 적재
+       (CARRY_OVER_COLUMNS 중 원본에 있고 columns에 없는 컬럼은 같은 키의 기존 행 값을 이어받음)
+    2. 원본과 같은 인덱스/제약조건/권한/트리거를 생성하고 ANALYZE 후 커밋
+    3. 짧은 트랜잭션에서 원본을 삭제하고 섀도 테이블 이름을 원본으로 변경
+
+    3번 전까지 조회는 기존 데이터를 그대로 본다.
+    트리거는 적재가 끝난 뒤 생성하므로 이번 적재 행에는 실행되지 않는다.
+    다른 테이블이 외래키로 참조하고 있으면 3번의 DROP TABLE이 실패하고 원본이 그대로 남는다.
+
+    Returns:
+        timings: {'load': 초, 'index': 초, 'swap': 초}
+    """
+    shadow = shadow_name(table, '_shadow')
+    cursor = conn.cursor()
+    timings = {}
+
+    started = time.perf_counter()
+    cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+    cursor.execute(
+        f"CREATE TABLE {shadow} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS)"
+    )
+    table_columns = _table_columns(cursor, table)
+    carried = [col for col in CARRY_OVER_COLUMNS if col in table_columns and col not in columns]
+    if carried:
+        _load_carrying_over(cursor, table, shadow, columns, dedup_last(rows, key_index), columns[key_index], carried)
+    else:
+        copy_rows(cursor, shadow, columns, dedup_last(rows, key_index))
+    timings['load'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    renames = _build_indexes(cursor, table, shadow)
+    _copy_table_comment(cursor, table, shadow)
+    _copy_grants(cursor, table, shadow)
+    _copy_triggers(cursor, table, shadow)
+    cursor.execute(f"ANALYZE {shadow}")
+    sequences = _owned_sequences(cursor, table)
+    conn.commit()
+    timings['index'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    try:
+        cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+        cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        # 원본을 지우면 소유 시퀀스도 함께 삭제되므로 섀도 테이블로 소유권을 먼저 이전
+        for col, seq in sequences:
+            cursor.execute(f"ALTER SEQUENCE {seq} OWNED BY {shadow}.{col}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {shadow} RENAME TO {table}")
+        for kind, temp_name, name in renames:
+            if kind == 'constraint':
+                cursor.execute(
+                    f"ALTER TABLE {table} RENAME CONSTRAINT "
+                    f"{quote_ident(temp_name, cursor)} TO {quote_ident(name, cursor)}"
+                )
+            else:
+                cursor.execute(
+                    f"ALTER INDEX {quote_ident(temp_name, cursor)} RENAME TO {quote_ident(name, cursor)}"
+                )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    timings['swap'] = time.perf_counter() - started
+
+    cursor.close()
+    return timings
+
+
+def convert_cell(val, dtype, zero_as_null=True):
+    """값 하나를 dtype('str' | 'int' | 'float')으로 변환 (NaN -> None, zero_as_null이면 0 -> None)"""
+    if pd.isna(val):
+        return None
+    if zero_as_null and val == 0:
+        return None
+    if dtype == 'str':
+        return str(val)
+    if dtype == 'int':
+        return int(val)
+    return float(val)
+
+
+def _convert_cells(col, dtype, zero_as_null, on_error):
+    if on_error is None:
+        return [convert_cell(val, dtype, zero_as_null) for val in col.tolist()]
+
+    values = []
+    for idx, val in enumerate(col.tolist()):
+        try:
+            values.append(convert_cell(val, dtype, zero_as_null))
+        except (TypeError, ValueError, OverflowError) as e:
+            on_error(idx, e)
+            values.append(None)
+    return values
+
+
+def convert_column(col, dtype, zero_as_null=True, on_error=None):
+    """
+    컬럼 하나를 NumPy 연산으로 변환 (NaN -> None, zero_as_null, int/float 캐스팅)
+
+    convert_cell을 셀마다 호출한 것과 타입/값까지 같은 결과를 낸다.
+    숫자로 추론되지 않는 컬럼(문자열 혼재 등)이나 int64 범위를 벗어나는 값이 있으면 셀 단위로 변환한다.
+
+    Args:
+        on_error: 셀 변환 실패 시 on_error(행 위치, 예외)를 호출하고 None을 넣음 (없으면 예외를 그대로 올림)
+    """
+    if dtype == 'str':
+        return _convert_cells(col, dtype, zero_as_null, on_error)
+
+    inferred = col.infer_objects()
+    if not pd.api.types.is_numeric_dtype(inferred) or pd.api.types.is_bool_dtype(inferred):
+        return _convert_cells(col, dtype, zero_as_null, on_error)
+
+    raw = inferred.to_numpy()
+    null_mask = inferred.isna().to_numpy()
+    if zero_as_null:
+        null_mask = null_mask | (raw == 0)
+
+    if dtype == 'float':
+        converted = inferred.to_numpy(dtype=np.float64).tolist()
+    elif pd.api.types.is_integer_dtype(inferred):
+        converted = raw.tolist()
+    else:
+        floats = inferred.to_numpy(dtype=np.float64)
+        kept = floats[~null_mask]
+        if not (np.isfinite(kept).all() and (np.abs(kept) < 2 ** 63).all()):
+            return _convert_cells(col, dtype, zero_as_null, on_error)
+        converted = np.trunc(np.where(null_mask, 0, floats)).astype(np.int64).tolist()
+
+    out = np.array(converted, dtype=object)
+    out[null_mask] = None
+    return out.tolist()
@@ -3,13 +3,13 @@
 """
 등급컷 데이터 컬럼 확인
 """
-import pandas as pd
+from excel_reader import print_timings, read_sheet
 
 def main():
     excel_file = r"e:\Dev\github\Susi\susi-back\uploads\교과 학종 out 240823.xlsx"
 
     # 교과 시트 읽기 (행 1을 헤더로)
-    df = pd.read_excel(excel_file, sheet_name='교과', header=1)
+    df = read_sheet(excel_file, '교과', header=1)
 
     print("=== 교과 시트 전체 컬럼명 ===")
     for idx, col in enumerate(df.columns):
@@ -31,5 +31,7 @@ def main():
     print(f"\n샘플 데이터:")
     print(df[display_cols].head().to_string())
 
+    print_timings()
+
 if __name__ == "__main__":
     main()
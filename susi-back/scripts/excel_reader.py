@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+엑셀 적재 스크립트 공용 리더 (susi-front/scripts의 변환 스크립트도 이 모듈을 경로로 import해서 사용)
+
+- 필요한 컬럼만 파싱 (columns: 헤더명 목록 또는 컬럼 인덱스 목록)
+- python-calamine이 설치되어 있으면 calamine 엔진 사용 (pip install python-calamine)
+  없으면 pandas 기본 openpyxl(read-only) 엔진 사용
+- 시트별 파싱 시간 기록 (print_timings)
+- 파싱 결과 캐시: 워크북 내용 해시 + 시트/헤더/컬럼/행 수 조합마다 Parquet 파일을
+  워크북 옆 .excel-cache/ 에 저장하고, 같은 워크북이면 엑셀 대신 캐시를 읽는다.
+  워크북 내용이 바뀌면 해시가 달라져 자동으로 다시 파싱하고 이전 캐시는 지운다.
+  (pyarrow가 없거나 Parquet로 저장할 수 없는 시트는 pickle로 저장)
+
+환경변수
+    EXCEL_ENGINE=openpyxl   엔진 강제
+    EXCEL_CACHE=0           캐시 사용 안 함
+    EXCEL_CACHE_DIR=경로    캐시 디렉터리 지정
+"""
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+# [(파일명, 시트명, 초, 행 수, 엔진)]
+PARSE_TIMINGS = []
+
+CACHE_ENABLED = os.environ.get('EXCEL_CACHE', '1') != '0'
+CACHE_DIR_NAME = '.excel-cache'
+
+# (절대경로, 크기, 수정시각) -> 내용 해시
+_file_hashes = {}
+
+
+def _detect_engine():
+    forced = os.environ.get('EXCEL_ENGINE')
+    if forced:
+        return forced
+    # calamine 엔진은 pandas 2.2부터 지원
+    major, minor = (int(part) for part in pd.__version__.split('.')[:2])
+    if (major, minor) < (2, 2):
+        return 'openpyxl'
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return 'openpyxl'
+    return 'calamine'
+
+
+ENGINE = _detect_engine()
+
+
+def _usecols(columns):
+    """columns를 pd.read_excel의 usecols로 변환 (헤더명은 있는 것만 선택)"""
+    if columns is None:
+        return None
+    columns = list(columns)
+    if all(isinstance(col, int) for col in columns):
+        return columns
+    wanted = set(columns)
+    return lambda name: name in wanted
+
+
+def file_hash(path):
+    """워크북 내용 해시 (같은 실행 안에서는 크기/수정시각이 같으면 재사용)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        _file_hashes[key] = digest.hexdigest()[:16]
+    return _file_hashes[key]
+
+
+def _cache_dir(path):
+    return os.environ.get('EXCEL_CACHE_DIR') or os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+
+
+def _cache_stem(path):
+    """<워크북명>-<절대경로 해시> (EXCEL_CACHE_DIR을 같이 쓰는 같은 이름의 다른 워크북과 구분)"""
+    path_hash = hashlib.sha1(os.path.abspath(str(path)).encode('utf-8')).hexdigest()[:8]
+    return f"{os.path.splitext(os.path.basename(str(path)))[0]}-{path_hash}"
+
+
+def _cache_path(path, sheet_name, columns, header, nrows):
+    options = json.dumps([str(sheet_name), header, nrows, None if columns is None else list(columns)],
+                         ensure_ascii=False, default=str)
+    options_hash = hashlib.sha1(options.encode('utf-8')).hexdigest()[:12]
+    # 파일명: <워크북명>-<경로 해시>__<내용 해시>__<옵션 해시>.<확장자>
+    return os.path.join(_cache_dir(path), f"{_cache_stem(path)}__{file_hash(path)}__{options_hash}")
+
+
+def _load_cached(cache_path):
+    for ext, reader in (('.parquet', pd.read_parquet), ('.pkl', pd.read_pickle)):
+        if os.path.exists(cache_path + ext):
+            try:
+                return reader(cache_path + ext)
+            except Exception:
+                # 손상된 캐시는 무시하고 다시 파싱
+                os.remove(cache_path + ext)
+    return None
+
+
+def _prune_stale(path):
+    """같은 경로의 워크북 내용이 바뀌어 더 이상 쓰지 않는 이전 해시의 캐시 파일 삭제"""
+    cache_dir = _cache_dir(path)
+    stem = _cache_stem(path)
+    current = file_hash(path)
+    for name in os.listdir(cache_dir):
+        parts = name.rsplit('__', 2)
+        if len(parts) == 3 and parts[0] == stem and parts[1] != current:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _store_cached(path, cache_path, df):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    _prune_stale(path)
+    try:
+        df.to_parquet(cache_path + '.parquet')
+    except Exception:
+        # pyarrow 미설치, 숫자/문자 혼재 컬럼, 문자열이 아닌 컬럼명 등
+        if os.path.exists(cache_path + '.parquet'):
+            os.remove(cache_path + '.parquet')
+        df.to_pickle(cache_path + '.pkl')
+
+
+def _record(path, sheet_name, started, df, source):
+    PARSE_TIMINGS.append((os.path.basename(str(path)), sheet_name, time.perf_counter() - started, len(df), source))
+
+
+def read_sheet(path, sheet_name=0, columns=None, header=0, nrows=None):
+    """시트 하나를 DataFrame으로 읽기"""
+    return read_sheets(path, [sheet_name], columns=columns, header=header, nrows=nrows)[sheet_name]
+
+
+def read_sheets(path, sheet_names, columns=None, header=0, nrows=None):
+    """
+    여러 시트를 읽어 {시트명: DataFrame} 반환 (캐시에 없는 시트만 워크북을 한 번 열어 파싱)
+
+    columns는 모든 시트에 공통인 목록이거나 {시트명: 목록} 형태
+    """
+    def sheet_columns(sheet_name):
+        return columns.get(sheet_name) if isinstance(columns, dict) else columns
+
+    frames = {}
+    pending = []
+    for sheet_name in sheet_names:
+        cache_path = _cache_path(path, sheet_name, sheet_columns(sheet_name), header, nrows) if CACHE_ENABLED else None
+        if cache_path:
+            started = time.perf_counter()
+            df = _load_cached(cache_path)
+            if df is not None:
+                _record(path, sheet_name, started, df, 'cache')
+                frames[sheet_name] = df
+                continue
+        pending.append((sheet_name, cache_path))
+
+    if pending:
+        with pd.ExcelFile(path, engine=ENGINE) as xlsx:
+            for sheet_name, cache_path in pending:
+                started = time.perf_counter()
+                df = xlsx.parse(sheet_name, header=header, usecols=_usecols(sheet_columns(sheet_name)), nrows=nrows)
+                _record(path, sheet_name, started, df, ENGINE)
+                if cache_path:
+                    _store_cached(path, cache_path, df)
+                frames[sheet_name] = df
+
+    return {sheet_name: frames[sheet_name] for sheet_name in sheet_names}
+
+
+def sheet_names(path):
+    """워크북의 시트 이름 목록 (캐시 사용 시 JSON으로 저장)"""
+    cache_path = _cache_path(path, '__sheet_names__', None, None, None) + '.json' if CACHE_ENABLED else None
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    with pd.ExcelFile(path, engine=ENGINE) as xlsx:
+        names = list(xlsx.sheet_names)
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        _prune_stale(path)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            json.dump(names, f, ensure_ascii=False)
+    return names
+
+
+def print_timings():
+    """지금까지 읽은 시트별 파싱 시간 출력"""
+    if not PARSE_TIMINGS:
+        return
+    print("\n[excel] 시트별 파싱 시간")
+    for file_name, sheet_name, seconds, rows, source in PARSE_TIMINGS:
+        print(f"  - {file_name} [{sheet_name}]: {seconds:.2f}s ({rows}행, {source})")
@@ -2,13 +2,33 @@
 # -*- coding: utf-8 -*-
 """
 엑셀 파일에서 입학 전형 데이터를 데이터베이스에 삽입하는 스크립트
+
+사용법:
+    python import-admission-data.py                       # 행 단위 삽입
+    python import-admission-data.py --staged              # 시트 단위 일괄 upsert
+    python import-admission-data.py --parallel [--staged] # 교과/학종 시트 동시 삽입
+    python import-admission-data.py --replay-rejects import-admission-rejects.jsonl
+                                                          # 실패한 행만 다시 삽입
+
+행 단위 삽입은 행마다 SAVEPOINT를 두어 실패한 행만 되돌리고,
+실패한 행은 원본 값과 함께 --reject-file(JSONL)에 기록한다.
 """
+import argparse
+import datetime
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 import sys
 import io
 
+from excel_reader import print_timings, read_sheet, read_sheets
+
 # Windows 콘솔 UTF-8 설정
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
@@ -22,6 +42,15 @@ DB_CONFIG = {
     'password': 'tsuser1234'
 }
 
+# 행 단위 삽입에서 실패한 행을 기록할 파일 (JSONL)
+REJECT_FILE = 'import-admission-rejects.jsonl'
+
+# (시트명, 카테고리 ID, 점수 삽입 여부)
+SHEETS = [
+    ('교과', 1, True),
+    ('학종', 2, False),
+]
+
 def get_db_connection():
     """데이터베이스 연결"""
     return psycopg2.connect(**DB_CONFIG)
@@ -49,52 +78,221 @@ def insert_categories(conn):
     cursor.close()
     print("✅ 카테고리 삽입 완료\n")
 
-def get_or_create_university(cursor, univ_name):
-    """대학명으로 대학 ID 조회 (없으면 None 반환)"""
-    # 정확한 매칭
-    cursor.execute("SELECT id FROM ts_universities WHERE name = %s", (univ_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    # 비슷한 이름 찾기 (예: "가천대" -> "가천대학교")
-    cursor.execute("SELECT id, name FROM ts_universities WHERE name LIKE %s", (f"%{univ_name}%",))
-    result = cursor.fetchone()
-    if result:
-        print(f"    ⚠️  '{univ_name}' -> '{result[1]}' (ID: {result[0]}) 매칭")
-        return result[0]
-
-    print(f"    ❌ 대학 '{univ_name}' 찾을 수 없음")
-    return None
-
-def get_or_create_general_field(cursor, field_name):
-    """계열명으로 계열 ID 조회 또는 생성"""
-    if not field_name or pd.isna(field_name):
+class RejectWriter:
+    """
+    실패한 행 기록 (dead-letter)
+
+    한 줄에 {"sheet", "row_index", "error", "values"} 하나씩 JSONL로 남긴다.
+    values는 엑셀 원본 값이라 --replay-rejects로 그대로 다시 삽입할 수 있다.
+    파일은 행 단위 삽입/재실행할 때마다 새로 쓰므로 항상 마지막 행 단위 실행의 실패 행만 담긴다.
+    (--staged 실행은 파일을 만들지 않아 이전 reject 파일이 그대로 남는다)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _json_value(value):
+        if isinstance(value, (list, tuple, dict)):
+            return str(value)
+        if pd.isna(value):
+            return None
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if hasattr(value, 'item'):  # numpy 스칼라
+            return value.item()
+        return value
+
+    def write(self, sheet_name, row_index, error, row):
+        record = {
+            'sheet': sheet_name,
+            'row_index': int(row_index),
+            'error': str(error),
+            'values': {str(key): self._json_value(value) for key, value in row.items()},
+        }
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        self._file.close()
+        if self.count:
+            print(f"\n⚠️  실패한 행 {self.count}개 기록: {self.path}")
+
+def load_rejects(path):
+    """reject 파일을 시트별 DataFrame으로 복원 (원래 행 번호를 인덱스로 유지)"""
+    records = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                records.setdefault(record['sheet'], []).append(record)
+
+    return {
+        sheet_name: pd.DataFrame(
+            [record['values'] for record in sheet_records],
+            index=[record['row_index'] for record in sheet_records],
+        )
+        for sheet_name, sheet_records in records.items()
+    }
+
+class LookupResolver:
+    """
+    대학/계열 ID 조회 캐시
+
+    ts_universities, ts_general_fields를 한 번에 읽어 두고 메모리에서 조회한다.
+    행마다 SELECT(대학 최대 2회, 계열 1회)를 하던 것을 대체하며,
+    새 계열은 시트 단위로 모아 한 번에 생성한다.
+    시트를 병렬로 삽입할 때도 공유할 수 있도록 조회/생성은 잠금 안에서 수행한다.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._lock = threading.RLock()
+        self.universities = {}      # 대학명 -> id
+        self.university_rows = []   # [(id, 대학명)] - 부분 일치 검색용 (id 순)
+        self.resolved = {}          # 조회한 대학명 -> id 또는 None (실패도 기억)
+        self.general_fields = {}    # 계열명 -> id
+
+        self.hits = 0           # 메모리에서 바로 응답
+        self.misses = 0         # 처음 보는 이름이라 해석 필요
+        self.queries = 0        # 실제로 실행한 쿼리 수
+        self.legacy_queries = 0  # 행 단위 조회였다면 실행했을 쿼리 수
+        self.commits = 0        # 계열 생성 커밋 수 (행 단위 삽입이 세이브포인트를 다시 잡는 데 사용)
+
+        self._preload()
+
+    def _preload(self):
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id, name FROM ts_universities ORDER BY id")
+        self.university_rows = cursor.fetchall()
+        self.universities = {}
+        for univ_id, name in self.university_rows:
+            self.universities.setdefault(name, univ_id)
+
+        cursor.execute("SELECT id, name FROM ts_general_fields")
+        self.general_fields = {name: field_id for field_id, name in cursor.fetchall()}
+        cursor.close()
+        self.queries += 2
+
+        print(f"  캐시 로드: 대학 {len(self.universities)}개, 계열 {len(self.general_fields)}개")
+
+    def university_id(self, univ_name):
+        """대학명으로 대학 ID 조회 (없으면 None 반환)"""
+        with self._lock:
+            return self._university_id(univ_name)
+
+    def _university_id(self, univ_name):
+        if univ_name in self.resolved:
+            self.hits += 1
+            univ_id = self.resolved[univ_name]
+            # 정확 매칭은 1회, 부분 매칭/실패는 2회 조회했었음
+            self.legacy_queries += 1 if univ_name in self.universities else 2
+            return univ_id
+
+        self.misses += 1
+
+        # 정확한 매칭
+        if univ_name in self.universities:
+            self.legacy_queries += 1
+            univ_id = self.universities[univ_name]
+            self.resolved[univ_name] = univ_id
+            return univ_id
+
+        # 비슷한 이름 찾기 (예: "가천대" -> "가천대학교")
+        self.legacy_queries += 2
+        for univ_id, name in self.university_rows:
+            if univ_name in name:
+                print(f"    ⚠️  '{univ_name}' -> '{name}' (ID: {univ_id}) 매칭")
+                self.resolved[univ_name] = univ_id
+                return univ_id
+
+        print(f"    ❌ 대학 '{univ_name}' 찾을 수 없음")
+        self.resolved[univ_name] = None
         return None
 
-    cursor.execute("SELECT id FROM ts_general_fields WHERE name = %s", (field_name,))
-    result = cursor.fetchone()
-    if result:
-        return result[0]
-
-    # 없으면 생성
-    cursor.execute("""
-        INSERT INTO ts_general_fields (name)
-        VALUES (%s)
-        RETURNING id
-    """, (field_name,))
-    field_id = cursor.fetchone()[0]
-    print(f"    ✅ 계열 생성: {field_name} (ID: {field_id})")
-    return field_id
-
-def import_gyogwa_data(conn, excel_file):
+    def ensure_general_fields(self, field_names):
+        """캐시에 없는 계열명을 한 번에 생성"""
+        with self._lock:
+            self._ensure_general_fields(field_names)
+
+    def _ensure_general_fields(self, field_names):
+        new_names = sorted({
+            name for name in field_names
+            if name and not pd.isna(name) and name not in self.general_fields
+        })
+        if not new_names:
+            return
+
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            INSERT INTO ts_general_fields (name)
+            SELECT unnest(%s::text[])
+            RETURNING id, name
+        """, (new_names,))
+        for field_id, name in cursor.fetchall():
+            self.general_fields[name] = field_id
+            print(f"    ✅ 계열 생성: {name} (ID: {field_id})")
+        # 행 단위 오류 롤백에 휩쓸리지 않도록 바로 커밋
+        self.conn.commit()
+        self.commits += 1
+        cursor.close()
+        self.queries += 1
+
+    def general_field_id(self, field_name):
+        """계열명으로 계열 ID 조회 (캐시에 없으면 생성)"""
+        if not field_name or pd.isna(field_name):
+            return None
+
+        with self._lock:
+            return self._general_field_id(field_name)
+
+    def _general_field_id(self, field_name):
+        self.legacy_queries += 1
+        if field_name in self.general_fields:
+            self.hits += 1
+            return self.general_fields[field_name]
+
+        self.misses += 1
+        self.legacy_queries += 1
+        self._ensure_general_fields([field_name])
+        return self.general_fields[field_name]
+
+    def print_stats(self):
+        lookups = self.hits + self.misses
+        hit_rate = self.hits / lookups * 100 if lookups else 0
+        print(f"  - 조회 캐시: {lookups}회 조회, 적중률 {hit_rate:.1f}%, "
+              f"쿼리 {self.queries}회 실행 (행 단위 조회 대비 {self.legacy_queries - self.queries}회 절약)")
+
+def resolve_general_field(conn, cursor, resolver, field_name):
+    """
+    행 단위 삽입 중 계열 ID 조회/생성
+
+    새 계열을 만들면 resolver가 커밋해 행 세이브포인트가 사라지므로 다시 잡는다.
+    (이 행은 아직 아무것도 쓰지 않았고, 커밋된 이전 행은 이미 삽입 건수에 포함됨)
+    """
+    commits = resolver.commits
+    general_field_id = resolver.general_field_id(field_name)
+    if resolver.conn is conn and resolver.commits != commits:
+        cursor.execute("SAVEPOINT import_row")
+    return general_field_id
+
+def import_gyogwa_data(conn, excel_file, resolver, df=None, rejects=None):
     """교과 전형 데이터 삽입"""
     print("\n=== 2. 교과 전형 데이터 삽입 ===")
 
-    # 엑셀 읽기
-    df = pd.read_excel(excel_file, sheet_name='교과', header=1)
+    # 엑셀 읽기 (병렬 모드에서는 미리 읽은 시트를 받음)
+    if df is None:
+        df = read_sheet(excel_file, '교과', columns=EXCEL_COLUMNS, header=1)
     print(f"총 {len(df)}개 행 읽음")
 
+    if '대계열' in df.columns:
+        resolver.ensure_general_fields(df['대계열'].dropna().unique())
+
     cursor = conn.cursor()
 
     # 카운터
@@ -104,6 +302,8 @@ def import_gyogwa_data(conn, excel_file):
     skipped = 0
 
     for idx, row in df.iterrows():
+        # 이 행에서 실패하면 여기까지만 되돌림 (대학/계열 조회 실패도 포함)
+        cursor.execute("SAVEPOINT import_row")
         try:
             # 필수 데이터 확인
             year = row.get('년도')
@@ -115,17 +315,19 @@ def import_gyogwa_data(conn, excel_file):
             general_field_name = row.get('대계열')
 
             if pd.isna(year) or pd.isna(univ_name) or pd.isna(admission_name) or pd.isna(unit_name):
+                cursor.execute("RELEASE SAVEPOINT import_row")
                 skipped += 1
                 continue
 
             # 대학 ID 조회
-            univ_id = get_or_create_university(cursor, univ_name)
+            univ_id = resolver.university_id(univ_name)
             if not univ_id:
+                cursor.execute("RELEASE SAVEPOINT import_row")
                 skipped += 1
                 continue
 
             # 계열 ID 조회/생성
-            general_field_id = get_or_create_general_field(cursor, general_field_name)
+            general_field_id = resolve_general_field(conn, cursor, resolver, general_field_name)
 
             # 카테고리 ID (학생부교과 = 1)
             category_id = 1
@@ -140,7 +342,6 @@ def import_gyogwa_data(conn, excel_file):
             """, (admission_name, int(year), basic_type, univ_id, category_id))
 
             admission_id = cursor.fetchone()[0]
-            admissions_inserted += 1
 
             # Recruitment Unit 삽입
             recruitment_number = row.get('모집\n인원')
@@ -158,7 +359,6 @@ def import_gyogwa_data(conn, excel_file):
             """, (unit_name, recruitment_number, admission_id, general_field_id))
 
             unit_id = cursor.fetchone()[0]
-            units_inserted += 1
 
             # Scores 삽입 (등급50, 등급70)
             def safe_numeric(value):
@@ -193,7 +393,8 @@ def import_gyogwa_data(conn, excel_file):
             }
 
             # 점수 데이터가 있으면 삽입
-            if not all(pd.isna(v) for v in [grade_50, grade_70, convert_50, convert_70]):
+            has_scores = not all(pd.isna(v) for v in [grade_50, grade_70, convert_50, convert_70])
+            if has_scores:
                 cursor.execute("""
                     INSERT INTO ts_recruitment_unit_scores (
                         recruitment_unit_id, grade_50_cut, grade_70_cut,
@@ -220,6 +421,11 @@ def import_gyogwa_data(conn, excel_file):
                     risk_cols['risk_minus_4'],
                     risk_cols['risk_minus_5'],
                 ))
+
+            cursor.execute("RELEASE SAVEPOINT import_row")
+            admissions_inserted += 1
+            units_inserted += 1
+            if has_scores:
                 scores_inserted += 1
 
             # 주기적으로 커밋 (배치 처리)
@@ -229,7 +435,10 @@ def import_gyogwa_data(conn, excel_file):
 
         except Exception as e:
             print(f"  ❌ 오류 (행 {idx}): {e}")
-            conn.rollback()  # 트랜잭션 롤백
+            cursor.execute("ROLLBACK TO SAVEPOINT import_row")  # 이 행만 롤백
+            cursor.execute("RELEASE SAVEPOINT import_row")
+            if rejects is not None:
+                rejects.write('교과', idx, e, row)
             skipped += 1
             continue
 
@@ -241,15 +450,20 @@ def import_gyogwa_data(conn, excel_file):
     print(f"  - Recruitment Units: {units_inserted}")
     print(f"  - Scores: {scores_inserted}")
     print(f"  - 건너뛴 행: {skipped}")
+    resolver.print_stats()
 
-def import_hakjong_data(conn, excel_file):
+def import_hakjong_data(conn, excel_file, resolver, df=None, rejects=None):
     """학종 전형 데이터 삽입"""
     print("\n=== 3. 학종 전형 데이터 삽입 ===")
 
-    # 엑셀 읽기
-    df = pd.read_excel(excel_file, sheet_name='학종', header=1)
+    # 엑셀 읽기 (병렬 모드에서는 미리 읽은 시트를 받음)
+    if df is None:
+        df = read_sheet(excel_file, '학종', columns=EXCEL_COLUMNS, header=1)
     print(f"총 {len(df)}개 행 읽음")
 
+    if '대계열' in df.columns:
+        resolver.ensure_general_fields(df['대계열'].dropna().unique())
+
     cursor = conn.cursor()
 
     admissions_inserted = 0
@@ -257,6 +471,8 @@ def import_hakjong_data(conn, excel_file):
     skipped = 0
 
     for idx, row in df.iterrows():
+        # 이 행에서 실패하면 여기까지만 되돌림 (대학/계열 조회 실패도 포함)
+        cursor.execute("SAVEPOINT import_row")
         try:
             year = row.get('년도')
             univ_name = row.get('대학명')
@@ -266,15 +482,17 @@ def import_hakjong_data(conn, excel_file):
             general_field_name = row.get('대계열')
 
             if pd.isna(year) or pd.isna(univ_name) or pd.isna(admission_name) or pd.isna(unit_name):
+                cursor.execute("RELEASE SAVEPOINT import_row")
                 skipped += 1
                 continue
 
-            univ_id = get_or_create_university(cursor, univ_name)
+            univ_id = resolver.university_id(univ_name)
             if not univ_id:
+                cursor.execute("RELEASE SAVEPOINT import_row")
                 skipped += 1
                 continue
 
-            general_field_id = get_or_create_general_field(cursor, general_field_name)
+            general_field_id = resolve_general_field(conn, cursor, resolver, general_field_name)
 
             # 카테고리 ID (학생부종합 = 2)
             category_id = 2
@@ -288,7 +506,6 @@ def import_hakjong_data(conn, excel_file):
             """, (admission_name, int(year), basic_type, univ_id, category_id))
 
             admission_id = cursor.fetchone()[0]
-            admissions_inserted += 1
 
             recruitment_number = row.get('모집\n인원')
             if pd.isna(recruitment_number):
@@ -304,6 +521,8 @@ def import_hakjong_data(conn, excel_file):
                 RETURNING id
             """, (unit_name, recruitment_number, admission_id, general_field_id))
 
+            cursor.execute("RELEASE SAVEPOINT import_row")
+            admissions_inserted += 1
             units_inserted += 1
 
             if (idx + 1) % 100 == 0:
@@ -312,7 +531,10 @@ def import_hakjong_data(conn, excel_file):
 
         except Exception as e:
             print(f"  ❌ 오류 (행 {idx}): {e}")
-            conn.rollback()  # 트랜잭션 롤백
+            cursor.execute("ROLLBACK TO SAVEPOINT import_row")  # 이 행만 롤백
+            cursor.execute("RELEASE SAVEPOINT import_row")
+            if rejects is not None:
+                rejects.write('학종', idx, e, row)
             skipped += 1
             continue
 
@@ -323,8 +545,238 @@ def import_hakjong_data(conn, excel_file):
     print(f"  - Admissions: {admissions_inserted}")
     print(f"  - Recruitment Units: {units_inserted}")
     print(f"  - 건너뛴 행: {skipped}")
+    resolver.print_stats()
+
+# 시트 단위 일괄 삽입 시 ts_recruitment_unit_scores 컬럼 -> 엑셀 컬럼
+SCORE_COLUMNS = [
+    ('grade_50_cut', '등급50'),
+    ('grade_70_cut', '등급70'),
+    ('convert_50_cut', '변환50'),
+    ('convert_70_cut', '변환70'),
+    ('risk_plus_5', '위험도(+)5'),
+    ('risk_plus_4', '위험도(+)4'),
+    ('risk_plus_3', '위험도(+)3'),
+    ('risk_plus_2', '위험도(+)2'),
+    ('risk_plus_1', '위험도(+)1'),
+    ('risk_minus_1', '위험도(-1)'),
+    ('risk_minus_2', '위험도(-2)'),
+    ('risk_minus_3', '위험도(-3)'),
+    ('risk_minus_4', '위험도(-4)'),
+    ('risk_minus_5', '위험도(-5)'),
+]
+
+# 이 중 하나라도 값이 있어야 점수 행을 삽입
+SCORE_REQUIRED_COLUMNS = ['grade_50_cut', 'grade_70_cut', 'convert_50_cut', 'convert_70_cut']
+
+# 엑셀에서 실제로 사용하는 컬럼 (이 컬럼만 파싱)
+EXCEL_COLUMNS = [
+    '년도', '대학명', '전형명', '일반특별', '모집단위명', '중심전형분류', '대계열', '모집\n인원',
+] + [excel_column for _, excel_column in SCORE_COLUMNS]
+
+def _numeric_column(df, column):
+    """safe_numeric의 컬럼 버전: 숫자/숫자 문자열은 float, 나머지는 NaN"""
+    if column not in df.columns:
+        return pd.Series(float('nan'), index=df.index)
+    values = df[column].map(lambda v: v.strip() if isinstance(v, str) else v)
+    return pd.to_numeric(values, errors='coerce').astype(float)
+
+def _to_params(df, columns):
+    """DataFrame 컬럼들을 NaN -> None 처리한 파라미터 튜플 목록"""
+    frame = df[columns].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+def import_sheet_staged(conn, df, category_id, resolver, with_scores):
+    """
+    시트 하나를 일괄 삽입 (행 수와 무관하게 시트당 upsert 3회)
+
+    1. 전형을 DataFrame에서 중복 제거 후 한 번에 upsert하고 RETURNING id를 다시 매핑
+    2. 모집단위를 (전형 ID, 모집단위명) 기준으로 중복 제거 후 한 번에 upsert
+    3. 점수를 한 번에 삽입
+
+    행 단위 삽입과 같은 결과가 되도록 전형 유형/계열은 처음 나온 행,
+    모집인원은 마지막으로 나온 행 값을 사용한다. 시트 전체가 한 트랜잭션이다.
+
+    Returns:
+        counts: {'admissions', 'units', 'scores', 'skipped'}
+    """
+    total_rows = len(df)
+    df = df.dropna(subset=['년도', '대학명', '전형명', '모집단위명']).copy()
+    # RETURNING 결과(텍스트)와 다시 매핑할 수 있도록 이름은 문자열로 통일
+    df['전형명'] = df['전형명'].astype(str)
+    df['모집단위명'] = df['모집단위명'].astype(str)
+
+    # 대학/계열 ID는 고유값 단위로만 조회
+    univ_ids = {name: resolver.university_id(name) for name in df['대학명'].unique()}
+    df['university_id'] = df['대학명'].map(univ_ids)
+    df = df[df['university_id'].notna()].copy()
+
+    if '대계열' in df.columns:
+        resolver.ensure_general_fields(df['대계열'].dropna().unique())
+        field_ids = {name: resolver.general_field_id(name) for name in df['대계열'].dropna().unique()}
+        df['general_field_id'] = df['대계열'].map(field_ids).astype('Int64')
+    else:
+        df['general_field_id'] = pd.Series(pd.NA, index=df.index, dtype='Int64')
+
+    df['university_id'] = df['university_id'].astype(int)
+    df['year'] = df['년도'].astype(int)
+    df['category_id'] = category_id
+    # 행 단위 삽입에서는 값이 비어 있으면 enum 캐스팅 오류로 그 행만 실패했지만,
+    # 일괄 삽입에서는 시트 전체가 실패하므로 기본값으로 채운다
+    df['basic_type'] = df['일반특별'].fillna('일반') if '일반특별' in df.columns else '일반'
+    recruitment_number = df['모집\n인원'] if '모집\n인원' in df.columns else pd.Series(index=df.index, dtype=float)
+    # 행 단위 삽입의 int()와 같이 소수점 이하는 버린다 (3.5 -> 3, Int64 캐스팅은 소수를 거부함)
+    recruitment_number = np.trunc(pd.to_numeric(recruitment_number, errors='coerce').astype(float))
+    df['recruitment_number'] = recruitment_number.where(np.isfinite(recruitment_number)).astype('Int64')
+
+    cursor = conn.cursor()
+
+    # 1. 전형
+    admission_keys = ['전형명', 'year', 'university_id']
+    admissions = df.drop_duplicates(subset=admission_keys, keep='first')
+    returned = execute_values(cursor, """
+        INSERT INTO ts_admissions (name, year, basic_type, university_id, category_id)
+        VALUES %s
+        ON CONFLICT (name, year, university_id, category_id)
+        DO UPDATE SET name = EXCLUDED.name
+        RETURNING id, name, year, university_id
+    """, _to_params(admissions, ['전형명', 'year', 'basic_type', 'university_id', 'category_id']),
+        template='(%s, %s, %s::ts_admissions_basic_type_enum, %s, %s)',
+        page_size=max(len(admissions), 1), fetch=True)
+    admission_ids = {(name, year, univ_id): adm_id for adm_id, name, year, univ_id in returned}
+    df['admission_id'] = [admission_ids[key] for key in df[admission_keys].itertuples(index=False, name=None)]
+
+    # 2. 모집단위
+    unit_keys = ['admission_id', '모집단위명']
+    units = df.drop_duplicates(subset=unit_keys, keep='last').copy()
+    first_field_ids = df.drop_duplicates(subset=unit_keys, keep='first').set_index(unit_keys)['general_field_id']
+    units['general_field_id'] = pd.array(
+        [first_field_ids[key] for key in units[unit_keys].itertuples(index=False, name=None)], dtype='Int64')
+    returned = execute_values(cursor, """
+        INSERT INTO ts_recruitment_units (name, recruitment_number, admission_id, general_field_id)
+        VALUES %s
+        ON CONFLICT (admission_id, name)
+        DO UPDATE SET recruitment_number = EXCLUDED.recruitment_number
+        RETURNING id, admission_id, name
+    """, _to_params(units, ['모집단위명', 'recruitment_number', 'admission_id', 'general_field_id']),
+        page_size=max(len(units), 1), fetch=True)
+    unit_ids = {(adm_id, name): unit_id for unit_id, adm_id, name in returned}
+    df['recruitment_unit_id'] = [unit_ids[key] for key in df[unit_keys].itertuples(index=False, name=None)]
+
+    # 3. 점수
+    scores_inserted = 0
+    if with_scores:
+        for column, excel_column in SCORE_COLUMNS:
+            df[column] = _numeric_column(df, excel_column)
+        scores = df[df[SCORE_REQUIRED_COLUMNS].notna().any(axis=1)]
+        score_columns = ['recruitment_unit_id'] + [column for column, _ in SCORE_COLUMNS]
+        if len(scores):
+            execute_values(cursor, f"""
+                INSERT INTO ts_recruitment_unit_scores ({', '.join(score_columns)})
+                VALUES %s
+                ON CONFLICT DO NOTHING
+            """, _to_params(scores, score_columns), page_size=len(scores))
+        scores_inserted = len(scores)
+
+    conn.commit()
+    cursor.close()
+
+    return {
+        'admissions': len(admissions),
+        'units': len(units),
+        'scores': scores_inserted,
+        'skipped': total_rows - len(df),
+    }
+
+def import_staged_sheet(conn, sheet_name, df, category_id, resolver, with_scores):
+    """시트 하나를 일괄 삽입하고 결과 출력"""
+    print(f"\n=== {sheet_name} 전형 데이터 일괄 삽입 ===")
+    print(f"총 {len(df)}개 행 읽음")
+
+    try:
+        counts = import_sheet_staged(conn, df, category_id, resolver, with_scores)
+    except Exception:
+        conn.rollback()
+        raise
+
+    print(f"\n✅ {sheet_name} 전형 일괄 삽입 완료:")
+    print(f"  - Admissions: {counts['admissions']}")
+    print(f"  - Recruitment Units: {counts['units']}")
+    if with_scores:
+        print(f"  - Scores: {counts['scores']}")
+    print(f"  - 건너뛴 행: {counts['skipped']}")
+    resolver.print_stats()
+
+def import_staged(conn, excel_file, resolver):
+    """교과/학종 시트를 시트 단위 일괄 삽입"""
+    frames = read_sheets(excel_file, [sheet_name for sheet_name, _, _ in SHEETS], columns=EXCEL_COLUMNS, header=1)
+    for sheet_name, category_id, with_scores in SHEETS:
+        import_staged_sheet(conn, sheet_name, frames[sheet_name], category_id, resolver, with_scores)
+
+# 행 단위 삽입 함수 (시트명 -> 함수)
+ROW_IMPORTERS = {
+    '교과': import_gyogwa_data,
+    '학종': import_hakjong_data,
+}
+
+def import_parallel(excel_file, resolver, staged, rejects=None):
+    """
+    워크북을 한 번만 파싱한 뒤 교과/학종 시트를 별도 커넥션에서 동시에 삽입
+
+    두 시트에 필요한 계열은 워커 시작 전에 한 번에 생성해 두므로
+    워커끼리 ts_general_fields 생성을 두고 경합하지 않는다.
+    """
+    started = time.perf_counter()
+    sheet_names = [sheet_name for sheet_name, _, _ in SHEETS]
+    frames = read_sheets(excel_file, sheet_names, columns=EXCEL_COLUMNS, header=1)
+    print(f"워크북 파싱: {time.perf_counter() - started:.2f}s ({', '.join(f'{name} {len(frames[name])}행' for name in sheet_names)})")
+
+    field_names = set()
+    for df in frames.values():
+        if '대계열' in df.columns:
+            field_names.update(df['대계열'].dropna().unique())
+    resolver.ensure_general_fields(field_names)
+
+    pool = ThreadedConnectionPool(1, len(SHEETS), **DB_CONFIG)
+
+    def run(sheet_name, category_id, with_scores):
+        sheet_started = time.perf_counter()
+        conn = pool.getconn()
+        try:
+            if staged:
+                import_staged_sheet(conn, sheet_name, frames[sheet_name], category_id, resolver, with_scores)
+            else:
+                ROW_IMPORTERS[sheet_name](conn, excel_file, resolver, df=frames[sheet_name], rejects=rejects)
+        finally:
+            pool.putconn(conn)
+        return time.perf_counter() - sheet_started
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(SHEETS)) as executor:
+            futures = {
+                sheet_name: executor.submit(run, sheet_name, category_id, with_scores)
+                for sheet_name, category_id, with_scores in SHEETS
+            }
+            elapsed = {sheet_name: future.result() for sheet_name, future in futures.items()}
+    finally:
+        pool.closeall()
+
+    print(f"\n⏱️  시트별 소요: {', '.join(f'{name} {sec:.2f}s' for name, sec in elapsed.items())}")
+    print(f"⏱️  전체 소요: {time.perf_counter() - started:.2f}s")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='교과/학종 입학 전형 데이터 삽입')
+    parser.add_argument('--staged', action='store_true',
+                        help='시트 단위로 전형/모집단위/점수를 일괄 upsert')
+    parser.add_argument('--parallel', action='store_true',
+                        help='워크북을 한 번만 읽고 교과/학종 시트를 별도 커넥션에서 동시에 삽입')
+    parser.add_argument('--reject-file', default=REJECT_FILE,
+                        help=f'행 단위 삽입에서 실패한 행을 기록할 JSONL 파일 (기본: {REJECT_FILE})')
+    parser.add_argument('--replay-rejects', metavar='FILE',
+                        help='엑셀 대신 reject 파일의 행만 다시 삽입')
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
     excel_file = r"e:\Dev\github\Susi\susi-back\uploads\교과 학종 out 240823.xlsx"
 
     try:
@@ -335,13 +787,41 @@ def main():
         # 1. 카테고리 삽입
         insert_categories(conn)
 
-        # 2. 교과 전형 데이터 삽입
-        import_gyogwa_data(conn, excel_file)
+        # 대학/계열 조회 캐시
+        resolver = LookupResolver(conn)
+
+        # 재실행할 행은 reject 파일을 새로 쓰기 전에 읽어 둠 (같은 파일이어도 안전)
+        replay_frames = load_rejects(args.replay_rejects) if args.replay_rejects else None
+        # 일괄 삽입(--staged)은 reject를 쓰지 않으므로 이전 행 단위 실행의 reject 파일을 그대로 둠
+        row_mode = replay_frames is not None or not args.staged
+        rejects = RejectWriter(args.reject_file) if row_mode else None
+
+        try:
+            if replay_frames is not None:
+                # 2-3. 실패했던 행만 다시 삽입
+                print(f"reject 파일 재실행: {args.replay_rejects}")
+                for sheet_name, _, _ in SHEETS:
+                    if sheet_name in replay_frames:
+                        ROW_IMPORTERS[sheet_name](conn, excel_file, resolver,
+                                                  df=replay_frames[sheet_name], rejects=rejects)
+            elif args.parallel:
+                # 2-3. 교과/학종 시트 동시 삽입
+                import_parallel(excel_file, resolver, args.staged, rejects=rejects)
+            elif args.staged:
+                # 2-3. 교과/학종 시트 단위 일괄 삽입
+                import_staged(conn, excel_file, resolver)
+            else:
+                # 2. 교과 전형 데이터 삽입
+                import_gyogwa_data(conn, excel_file, resolver, rejects=rejects)
 
-        # 3. 학종 전형 데이터 삽입
-        import_hakjong_data(conn, excel_file)
+                # 3. 학종 전형 데이터 삽입
+                import_hakjong_data(conn, excel_file, resolver, rejects=rejects)
+        finally:
+            if rejects is not None:
+                rejects.close()
 
         conn.close()
+        print_timings()
         print("\n🎉 모든 데이터 삽입 완료!")
 
     except Exception as e:
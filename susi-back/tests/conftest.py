@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""susi-back 업로드 스크립트 테스트 공용 설정 (스크립트를 모듈로 import할 수 있도록 경로 추가)"""
+
+import os
+import sys
+
+BACK_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACK_DIR)
+sys.path.insert(0, os.path.join(BACK_DIR, 'scripts'))
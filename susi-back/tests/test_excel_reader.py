@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""excel_reader: 파싱 캐시 적중, 워크북 변경 시 무효화, 같은 이름의 다른 워크북과 캐시 분리"""
+
+import os
+
+import pandas as pd
+
+import excel_reader
+
+
+def _write_workbook(path, values):
+    pd.DataFrame({'a': values}).to_excel(path, sheet_name='data', index=False)
+
+
+def _sources():
+    return [source for *_, source in excel_reader.PARSE_TIMINGS]
+
+
+def test_second_read_comes_from_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_reader, 'PARSE_TIMINGS', [])
+    path = tmp_path / 'book.xlsx'
+    _write_workbook(path, [1, 2, 3])
+
+    first = excel_reader.read_sheet(path, 'data')
+    second = excel_reader.read_sheet(path, 'data')
+    pd.testing.assert_frame_equal(first, second)
+    assert _sources() == [excel_reader.ENGINE, 'cache']
+
+
+def test_changed_workbook_is_reparsed_and_old_cache_pruned(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_reader, 'PARSE_TIMINGS', [])
+    path = tmp_path / 'book.xlsx'
+    _write_workbook(path, [1, 2, 3])
+    excel_reader.read_sheet(path, 'data')
+    old_files = set(os.listdir(tmp_path / excel_reader.CACHE_DIR_NAME))
+
+    _write_workbook(path, [4, 5])
+    assert excel_reader.read_sheet(path, 'data')['a'].tolist() == [4, 5]
+    assert not old_files & set(os.listdir(tmp_path / excel_reader.CACHE_DIR_NAME))
+
+
+def test_same_name_workbooks_share_cache_dir_without_evicting(tmp_path, monkeypatch):
+    monkeypatch.setattr(excel_reader, 'PARSE_TIMINGS', [])
+    monkeypatch.setenv('EXCEL_CACHE_DIR', str(tmp_path / 'cache'))
+    first, second = tmp_path / 'x' / 'book.xlsx', tmp_path / 'y' / 'book.xlsx'
+    for path, values in ((first, [1]), (second, [2])):
+        path.parent.mkdir()
+        _write_workbook(path, values)
+
+    for _ in range(2):
+        assert excel_reader.read_sheet(first, 'data')['a'].tolist() == [1]
+        assert excel_reader.read_sheet(second, 'data')['a'].tolist() == [2]
+    assert _sources() == [excel_reader.ENGINE, excel_reader.ENGINE, 'cache', 'cache']
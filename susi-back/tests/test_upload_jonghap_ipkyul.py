@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""upload_jonghap_ipkyul: 공용 convert_column으로 변환하고 실패한 셀은 행별 오류로 보고"""
+
+import numpy as np
+import pandas as pd
+
+from bulk_load import convert_cell
+from upload_jonghap_ipkyul import COLUMN_SPECS, EXCEL_COLUMN_INDEXES, prepare_rows
+
+
+def _frame(rows=50):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({i: rng.uniform(0, 50, rows).round(1) for i in EXCEL_COLUMN_INDEXES})
+    for i in EXCEL_COLUMN_INDEXES:
+        df.loc[rng.random(rows) < 0.1, i] = 0
+        df.loc[rng.random(rows) < 0.1, i] = np.nan
+    df[0] = [f'J{i:04d}' for i in range(rows)]
+    return df
+
+
+def test_rows_match_cell_conversion():
+    df = _frame()
+    rows, errors = prepare_rows(df)
+    assert not errors
+    expected = [
+        tuple(convert_cell(df.iloc[idx, spec.index], spec.dtype, spec.zero_as_null) for spec in COLUMN_SPECS)
+        for idx in range(len(df))
+    ]
+    assert [repr(row) for row in rows] == [repr(row) for row in expected]
+
+
+def test_unconvertible_cells_are_reported_per_row():
+    df = _frame()
+    df[4] = df[4].astype(object)
+    df.loc[3, 4] = 'abc'
+    df.loc[8, 4] = float('inf')
+
+    rows, errors = prepare_rows(df)
+    assert sorted(errors) == [3, 8]
+    assert errors[3].startswith('admission_type_code: ')
+    assert len(rows) == len(df) - 2
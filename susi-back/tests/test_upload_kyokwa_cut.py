@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""upload_kyokwa_cut: 컬럼 단위 변환(prepare_rows)이 행 단위 변환과 타입/값까지 같은지 확인"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import upload_kyokwa_cut as kyokwa
+from upload_kyokwa_cut import COLUMNS, INTEGER_COLUMN_INDEXES, prepare_rows, prepare_rows_legacy
+
+ROWS = 200
+
+
+def _numeric_frame(rng):
+    """ida_id까지 모두 숫자인 시트 (NaN/0/소수 포함)"""
+    data = {0: np.arange(1, ROWS + 1)}
+    for i in range(1, len(COLUMNS)):
+        values = rng.uniform(0, 100, ROWS).round(2)
+        if i in INTEGER_COLUMN_INDEXES:
+            values = values.round()
+        values[rng.random(ROWS) < 0.1] = 0
+        values[rng.random(ROWS) < 0.1] = np.nan
+        data[i] = values
+    return pd.DataFrame(data)
+
+
+def _mixed_frame(rng):
+    """문자열 ida_id, 정수 컬럼, 문자열이 섞인 object 컬럼이 있는 시트"""
+    df = _numeric_frame(rng)
+    df[0] = [f'K{i:05d}' for i in range(ROWS)]
+    df[INTEGER_COLUMN_INDEXES[0]] = rng.integers(0, 30, ROWS)
+    mixed = df[1].astype(object)
+    mixed[::17] = '1.5'
+    df[1] = mixed
+    return df
+
+
+def _assert_identical(df):
+    expected = prepare_rows_legacy(df)
+    actual = prepare_rows(df)
+    assert len(expected) == len(actual) == len(df)
+    # repr까지 같아야 int/float/str 타입이 같은 것
+    assert [repr(row) for row in actual] == [repr(row) for row in expected]
+
+
+def test_mixed_frame_matches_row_conversion():
+    _assert_identical(_mixed_frame(np.random.default_rng(1)))
+
+
+def test_all_numeric_frame_matches_row_conversion():
+    _assert_identical(_numeric_frame(np.random.default_rng(2)))
+
+
+def test_all_numeric_ida_id_is_not_upcast():
+    # iterrows는 모든 컬럼이 숫자이면 행을 float64로 올려 ida_id가 '1.0'이 됨
+    df = _numeric_frame(np.random.default_rng(3))
+    assert next(df.iterrows())[1].iloc[0] == 1.0
+    assert prepare_rows(df)[0][0] == '1'
+    assert prepare_rows_legacy(df)[0][0] == '1'
+
+
+def test_verify_conversion_reports_success(capsys):
+    assert kyokwa.verify_conversion(_mixed_frame(np.random.default_rng(4)))
+    assert '0 mismatches' in capsys.readouterr().out
+
+
+def _with_integer_cell(value):
+    df = _numeric_frame(np.random.default_rng(5))
+    df[INTEGER_COLUMN_INDEXES[0]] = df[INTEGER_COLUMN_INDEXES[0]].astype(float)
+    df.loc[0, INTEGER_COLUMN_INDEXES[0]] = value
+    return df
+
+
+def test_int64_overflow_falls_back_to_cells():
+    # int64 범위를 벗어나면 셀 단위 변환(파이썬 int)으로 처리되어 결과가 같음
+    df = _with_integer_cell(2.0 ** 70)
+    _assert_identical(df)
+    assert prepare_rows(df)[0][INTEGER_COLUMN_INDEXES[0]] == 2 ** 70
+
+
+def test_infinite_integer_cell_raises_like_row_conversion():
+    df = _with_integer_cell(float('inf'))
+    with pytest.raises(OverflowError):
+        prepare_rows_legacy(df)
+    with pytest.raises(OverflowError):
+        prepare_rows(df)
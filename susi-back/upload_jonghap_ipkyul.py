@@ -2,13 +2,29 @@
 # -*- coding: utf-8 -*-
 """
 종합전형 입결 데이터 업로드 스크립트
+
+엑셀 컬럼 -> DB 컬럼 매핑은 COLUMN_SPECS 한 곳에서 관리한다.
+새 입시 연도를 추가할 때는 YEAR_BLOCKS에 (연도, 시작 컬럼 인덱스)만 추가하면
+INSERT 컬럼 목록, ON CONFLICT 갱신 절, 변환 로직이 모두 함께 바뀐다.
+
+사용법:
+    python upload_jonghap_ipkyul.py               # 기본 (DELETE 후 execute_batch)
+    python upload_jonghap_ipkyul.py --mode swap   # 섀도 테이블 적재 후 이름 변경으로 교체
 """
 
-import pandas as pd
+import argparse
+from collections import namedtuple
+
 import psycopg2
 from psycopg2.extras import execute_batch
+import os
 import sys
 
+from bulk_load import convert_column, swap_load
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from excel_reader import print_timings, read_sheet
+
 # 데이터베이스 연결 정보
 DB_CONFIG = {
     'host': 'localhost',
@@ -21,11 +37,102 @@ DB_CONFIG = {
 # 엑셀 파일 경로
 EXCEL_FILE = 'uploads/26_jonghap_ipkyul_수정.xlsx'
 
+TABLE_NAME = 'susi_jonghap_ipkyul'
+
+# name: DB 컬럼명, index: 엑셀 컬럼 인덱스, dtype: 'str' | 'int' | 'float',
+# zero_as_null: 0을 NULL로 저장할지 여부
+ColumnSpec = namedtuple('ColumnSpec', ['name', 'index', 'dtype', 'zero_as_null'])
+
+# 연도별 블록: (연도, 엑셀 시작 컬럼 인덱스)
+YEAR_BLOCKS = [
+    (2023, 12),
+    (2024, 18),
+    (2025, 24),
+    (2026, 30),
+]
+
+# 연도 블록 내부 순서 그대로의 (컬럼명, 타입)
+YEAR_BLOCK_FIELDS = [
+    ('recruitment', 'int'),
+    ('competition_rate', 'float'),
+    ('additional_pass_rank', 'int'),
+    ('actual_competition_rate', 'float'),
+    ('grade_50p', 'float'),
+    ('grade_70p', 'float'),
+]
+
+COLUMN_SPECS = [
+    ColumnSpec('ida_id', 0, 'str', False),
+    ColumnSpec('university_name', 1, 'str', False),
+    ColumnSpec('university_code', 2, 'str', False),
+    ColumnSpec('admission_type', 3, 'str', False),
+    ColumnSpec('admission_type_code', 4, 'int', False),
+    ColumnSpec('admission_detail', 5, 'str', False),
+    # 6번 컬럼은 비어 있어 스킵
+    ColumnSpec('category', 7, 'str', False),
+    ColumnSpec('recruitment_unit', 8, 'str', False),
+    ColumnSpec('grade_avg', 9, 'float', True),
+    ColumnSpec('grade_70p_cut', 10, 'float', True),
+    ColumnSpec('grade_90p_cut', 11, 'float', True),
+] + [
+    ColumnSpec(f'{field}_{year}', start + offset, dtype, True)
+    for year, start in YEAR_BLOCKS
+    for offset, (field, dtype) in enumerate(YEAR_BLOCK_FIELDS)
+]
+
+COLUMNS = [spec.name for spec in COLUMN_SPECS]
+
+# 컬럼 위치(iloc)가 유지되도록 마지막으로 쓰는 컬럼까지 파싱
+EXCEL_COLUMN_INDEXES = list(range(max(spec.index for spec in COLUMN_SPECS) + 1))
+
+UPDATE_CLAUSE = ',\n    '.join(f'{col} = EXCLUDED.{col}' for col in COLUMNS[1:])
+
+INSERT_QUERY = f"""
+INSERT INTO {TABLE_NAME} (
+    {', '.join(COLUMNS)}
+) VALUES ({', '.join(['%s'] * len(COLUMNS))})
+ON CONFLICT (ida_id) DO UPDATE SET
+    {UPDATE_CLAUSE},
+    updated_at = NOW()
+"""
+
+
+def prepare_rows(df):
+    """
+    COLUMN_SPECS 기준으로 DataFrame 전체를 컬럼 단위로 변환
+
+    Returns:
+        rows: INSERT 파라미터 튜플 목록 (변환 실패 행 제외)
+        errors: {행 인덱스: 오류 메시지}
+    """
+    errors = {}
+
+    def on_error(spec):
+        return lambda idx, e: errors.setdefault(idx, f"{spec.name}: {e}")
+
+    columns = [
+        convert_column(df.iloc[:, spec.index], spec.dtype, spec.zero_as_null, on_error(spec))
+        for spec in COLUMN_SPECS
+    ]
+    rows = [values for idx, values in enumerate(zip(*columns)) if idx not in errors]
+    return rows, errors
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='종합전형 입결 데이터 업로드')
+    parser.add_argument('--mode', choices=['batch', 'swap'], default='batch',
+                        help='적재 방식 (batch: DELETE 후 execute_batch, swap: 섀도 테이블 적재 후 교체. '
+                             '권한/코멘트/트리거/created_at은 이어받고, 외래키로 참조되는 테이블은 교체 불가)')
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     try:
         # 1. 엑셀 파일 읽기
         print(f"[1/7] Reading Excel file: {EXCEL_FILE}")
-        df = pd.read_excel(EXCEL_FILE)
+        df = read_sheet(EXCEL_FILE, columns=EXCEL_COLUMN_INDEXES)
 
         print(f"      Total rows (with header): {len(df)}")
 
@@ -41,212 +148,38 @@ def main():
         conn = psycopg2.connect(**DB_CONFIG)
         cursor = conn.cursor()
 
-        # 3. 기존 데이터 삭제
-        print(f"\n[3/7] Deleting existing data...")
-        cursor.execute("DELETE FROM susi_jonghap_ipkyul")
-        deleted_count = cursor.rowcount
-        print(f"      Deleted {deleted_count} rows")
-
-        # 4. INSERT 쿼리 준비
-        insert_query = """
-        INSERT INTO susi_jonghap_ipkyul (
-            ida_id,
-            university_name,
-            university_code,
-            admission_type,
-            admission_type_code,
-            admission_detail,
-            category,
-            recruitment_unit,
-            grade_avg,
-            grade_70p_cut,
-            grade_90p_cut,
-            recruitment_2023,
-            competition_rate_2023,
-            additional_pass_rank_2023,
-            actual_competition_rate_2023,
-            grade_50p_2023,
-            grade_70p_2023,
-            recruitment_2024,
-            competition_rate_2024,
-            additional_pass_rank_2024,
-            actual_competition_rate_2024,
-            grade_50p_2024,
-            grade_70p_2024,
-            recruitment_2025,
-            competition_rate_2025,
-            additional_pass_rank_2025,
-            actual_competition_rate_2025,
-            grade_50p_2025,
-            grade_70p_2025,
-            recruitment_2026,
-            competition_rate_2026,
-            additional_pass_rank_2026,
-            actual_competition_rate_2026,
-            grade_50p_2026,
-            grade_70p_2026
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s
-        )
-        ON CONFLICT (ida_id) DO UPDATE SET
-            university_name = EXCLUDED.university_name,
-            university_code = EXCLUDED.university_code,
-            admission_type = EXCLUDED.admission_type,
-            admission_type_code = EXCLUDED.admission_type_code,
-            admission_detail = EXCLUDED.admission_detail,
-            category = EXCLUDED.category,
-            recruitment_unit = EXCLUDED.recruitment_unit,
-            grade_avg = EXCLUDED.grade_avg,
-            grade_70p_cut = EXCLUDED.grade_70p_cut,
-            grade_90p_cut = EXCLUDED.grade_90p_cut,
-            recruitment_2023 = EXCLUDED.recruitment_2023,
-            competition_rate_2023 = EXCLUDED.competition_rate_2023,
-            additional_pass_rank_2023 = EXCLUDED.additional_pass_rank_2023,
-            actual_competition_rate_2023 = EXCLUDED.actual_competition_rate_2023,
-            grade_50p_2023 = EXCLUDED.grade_50p_2023,
-            grade_70p_2023 = EXCLUDED.grade_70p_2023,
-            recruitment_2024 = EXCLUDED.recruitment_2024,
-            competition_rate_2024 = EXCLUDED.competition_rate_2024,
-            additional_pass_rank_2024 = EXCLUDED.additional_pass_rank_2024,
-            actual_competition_rate_2024 = EXCLUDED.actual_competition_rate_2024,
-            grade_50p_2024 = EXCLUDED.grade_50p_2024,
-            grade_70p_2024 = EXCLUDED.grade_70p_2024,
-            recruitment_2025 = EXCLUDED.recruitment_2025,
-            competition_rate_2025 = EXCLUDED.competition_rate_2025,
-            additional_pass_rank_2025 = EXCLUDED.additional_pass_rank_2025,
-            actual_competition_rate_2025 = EXCLUDED.actual_competition_rate_2025,
-            grade_50p_2025 = EXCLUDED.grade_50p_2025,
-            grade_70p_2025 = EXCLUDED.grade_70p_2025,
-            recruitment_2026 = EXCLUDED.recruitment_2026,
-            competition_rate_2026 = EXCLUDED.competition_rate_2026,
-            additional_pass_rank_2026 = EXCLUDED.additional_pass_rank_2026,
-            actual_competition_rate_2026 = EXCLUDED.actual_competition_rate_2026,
-            grade_50p_2026 = EXCLUDED.grade_50p_2026,
-            grade_70p_2026 = EXCLUDED.grade_70p_2026,
-            updated_at = NOW()
-        """
-
-        # 5. 데이터 변환 및 삽입
-        print(f"\n[4/7] Preparing data...")
-        data_to_insert = []
-
-        for idx, row in df.iterrows():
-            try:
-                # 컬럼 인덱스 매핑
-                # 0: ida_id (문자열)
-                # 1: university_name (문자열)
-                # 2: university_code (문자열)
-                # 3: admission_type (문자열)
-                # 4: admission_type_code (integer)
-                # 5: admission_detail (문자열)
-                # 6: (스킵)
-                # 7: category (문자열)
-                # 8: recruitment_unit (문자열)
-                # 9: grade_avg (numeric)
-                # 10: grade_70p_cut (numeric)
-                # 11: grade_90p_cut (numeric)
-                # 12-17: 2023년 데이터
-                # 18-23: 2024년 데이터
-                # 24-29: 2025년 데이터
-                # 30-35: 2026년 데이터
-
-                values = []
-
-                # ida_id
-                val = row.iloc[0]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # university_name
-                val = row.iloc[1]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # university_code
-                val = row.iloc[2]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # admission_type
-                val = row.iloc[3]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # admission_type_code
-                val = row.iloc[4]
-                values.append(int(val) if not pd.isna(val) else None)
-
-                # admission_detail
-                val = row.iloc[5]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # 6번 컬럼 스킵 (nan)
-
-                # category
-                val = row.iloc[7]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # recruitment_unit
-                val = row.iloc[8]
-                values.append(str(val) if not pd.isna(val) else None)
-
-                # grade_avg, grade_70p_cut, grade_90p_cut
-                for i in [9, 10, 11]:
-                    val = row.iloc[i]
-                    values.append(float(val) if not pd.isna(val) and val != 0 else None)
-
-                # 2023년 데이터 (12-17)
-                for i in [12, 13, 14, 15, 16, 17]:
-                    val = row.iloc[i]
-                    if i in [12, 14]:  # recruitment, additional_pass_rank (integer)
-                        values.append(int(val) if not pd.isna(val) and val != 0 else None)
-                    else:  # 나머지는 numeric
-                        values.append(float(val) if not pd.isna(val) and val != 0 else None)
-
-                # 2024년 데이터 (18-23)
-                for i in [18, 19, 20, 21, 22, 23]:
-                    val = row.iloc[i]
-                    if i in [18, 20]:  # recruitment, additional_pass_rank (integer)
-                        values.append(int(val) if not pd.isna(val) and val != 0 else None)
-                    else:
-                        values.append(float(val) if not pd.isna(val) and val != 0 else None)
-
-                # 2025년 데이터 (24-29)
-                for i in [24, 25, 26, 27, 28, 29]:
-                    val = row.iloc[i]
-                    if i in [24, 26]:  # recruitment, additional_pass_rank (integer)
-                        values.append(int(val) if not pd.isna(val) and val != 0 else None)
-                    else:
-                        values.append(float(val) if not pd.isna(val) and val != 0 else None)
-
-                # 2026년 데이터 (30-35)
-                for i in [30, 31, 32, 33, 34, 35]:
-                    val = row.iloc[i]
-                    if i in [30, 32]:  # recruitment, additional_pass_rank (integer)
-                        values.append(int(val) if not pd.isna(val) and val != 0 else None)
-                    else:
-                        values.append(float(val) if not pd.isna(val) and val != 0 else None)
-
-                data_to_insert.append(tuple(values))
-
-                # 진행상황 출력 (1000개마다)
-                if (idx + 1) % 1000 == 0:
-                    print(f"      Processing {idx + 1}/{len(df)} rows...")
-
-            except Exception as e:
-                print(f"      ERROR at row {idx}: {e}")
-                print(f"      Row data: {row.iloc[:12].to_dict()}")
-                continue
-
-        # Batch insert
-        print(f"\n[5/7] Executing batch insert...")
-        execute_batch(cursor, insert_query, data_to_insert, page_size=1000)
-
-        # 6. 커밋
-        conn.commit()
+        # 3. 기존 데이터 삭제 (swap 모드는 교체 시점까지 기존 데이터를 유지)
+        if args.mode == 'swap':
+            print(f"\n[3/7] Keeping existing data until swap...")
+        else:
+            print(f"\n[3/7] Deleting existing data...")
+            cursor.execute(f"DELETE FROM {TABLE_NAME}")
+            deleted_count = cursor.rowcount
+            print(f"      Deleted {deleted_count} rows")
+
+        # 4. 데이터 변환
+        print(f"\n[4/7] Preparing data ({len(COLUMN_SPECS)} columns, years: {[year for year, _ in YEAR_BLOCKS]})...")
+        data_to_insert, errors = prepare_rows(df)
+
+        for idx, error in sorted(errors.items()):
+            print(f"      ERROR at row {idx}: {error}")
+            print(f"      Row data: {df.iloc[idx, :12].to_dict()}")
+
+        if args.mode == 'swap':
+            print(f"\n[5/7] Loading shadow table and swapping...")
+            timings = swap_load(conn, TABLE_NAME, COLUMNS, data_to_insert)
+            print(f"      Shadow load: {timings['load']:.2f}s, index: {timings['index']:.2f}s")
+            print(f"      Swap window: {timings['swap'] * 1000:.0f}ms")
+        else:
+            # Batch insert
+            print(f"\n[5/7] Executing batch insert...")
+            execute_batch(cursor, INSERT_QUERY, data_to_insert, page_size=1000)
+
+            # 6. 커밋
+            conn.commit()
 
         # 7. 결과 확인
-        cursor.execute("SELECT COUNT(*) FROM susi_jonghap_ipkyul")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}")
         final_count = cursor.fetchone()[0]
 
         print(f"\n[6/7] Upload completed!")
@@ -254,9 +187,9 @@ def main():
 
         # 8. 샘플 데이터 확인
         print(f"\n[7/7] Sample data:")
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT ida_id, university_name, admission_type, grade_avg, recruitment_2025
-            FROM susi_jonghap_ipkyul
+            FROM {TABLE_NAME}
             LIMIT 5
         """)
         samples = cursor.fetchall()
@@ -267,6 +200,7 @@ def main():
         cursor.close()
         conn.close()
 
+        print_timings()
         print(f"\n=== SUCCESS: Data upload completed! ===")
 
     except Exception as e:
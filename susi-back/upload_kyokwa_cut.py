@@ -2,13 +2,30 @@
 # -*- coding: utf-8 -*-
 """
 교과전형 입결 데이터 업로드 스크립트
+
+사용법:
+    python upload_kyokwa_cut.py               # 기본 (execute_batch)
+    python upload_kyokwa_cut.py --mode copy   # COPY 스테이징 후 일괄 upsert
+    python upload_kyokwa_cut.py --mode swap   # 섀도 테이블 적재 후 이름 변경으로 교체
+    python upload_kyokwa_cut.py --verify      # 변환 결과를 기존 행 단위 변환과 비교 (DB 미접속)
+
+합성 DataFrame으로 두 변환을 비교하는 테스트: python -m pytest tests/test_upload_kyokwa_cut.py
 """
 
+import argparse
+import time
+
 import pandas as pd
 import psycopg2
 from psycopg2.extras import execute_batch
+import os
 import sys
 
+from bulk_load import convert_column, copy_rows, swap_load
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from excel_reader import print_timings, read_sheet
+
 # 데이터베이스 연결 정보
 DB_CONFIG = {
     'host': 'localhost',
@@ -21,11 +38,180 @@ DB_CONFIG = {
 # 엑셀 파일 경로
 EXCEL_FILE = 'uploads/26_kyokwa_ipkyul.xlsx'
 
+TABLE_NAME = 'susi_kyokwa_cut'
+
+# 연도별 반복 컬럼 (엑셀에서 연도마다 같은 순서로 9개씩)
+YEARS = [2023, 2024, 2025, 2026]
+YEAR_FIELDS = [
+    'recruitment',
+    'competition_rate',
+    'additional_pass_rank',
+    'actual_competition_rate',
+    'converted_score_50p',
+    'converted_score_70p',
+    'total_score',
+    'grade_50p',
+    'grade_70p',
+]
+
+# 엑셀 컬럼 순서 그대로의 DB 컬럼 (0번 = ida_id)
+COLUMNS = [
+    'ida_id',
+    'grade_avg',
+    'grade_initial_cut',
+    'grade_additional_cut',
+    'converted_score_initial_cut',
+    'converted_score_avg',
+    'converted_score_additional_cut',
+    'converted_total_score',
+] + [f'{field}_{year}' for year in YEARS for field in YEAR_FIELDS]
+
+UPDATE_CLAUSE = ',\n    '.join(f'{col} = EXCLUDED.{col}' for col in COLUMNS[1:])
+
+INSERT_QUERY = f"""
+INSERT INTO {TABLE_NAME} (
+    {', '.join(COLUMNS)}
+) VALUES ({', '.join(['%s'] * len(COLUMNS))})
+ON CONFLICT (ida_id) DO UPDATE SET
+    {UPDATE_CLAUSE},
+    updated_at = NOW()
+"""
+
+# integer로 저장되는 컬럼 (연도별 recruitment, additional_pass_rank)
+INTEGER_COLUMN_INDEXES = [8, 10, 17, 19, 26, 28, 35, 37]
+
+# COPY 모드: 세션 임시 테이블에 적재 후 한 번의 upsert로 병합
+STAGE_TABLE = f'{TABLE_NAME}_stage'
+
+MERGE_QUERY = f"""
+INSERT INTO {TABLE_NAME} ({', '.join(COLUMNS)})
+SELECT DISTINCT ON (ida_id) {', '.join(COLUMNS)}
+FROM {STAGE_TABLE}
+ORDER BY ida_id, src_row DESC
+ON CONFLICT (ida_id) DO UPDATE SET
+    {UPDATE_CLAUSE},
+    updated_at = NOW()
+"""
+
+
+def prepare_rows_legacy(df):
+    """
+    엑셀 DataFrame을 INSERT 파라미터 튜플 목록으로 변환 (행 단위, --verify 기준)
+
+    df.iterrows()는 모든 컬럼이 숫자인 DataFrame에서 행을 float64 Series로 만들어
+    숫자 ida_id가 '4.0'처럼 변환된다. 컬럼별 타입이 유지되도록 object로 바꾼 뒤 순회한다.
+    (문자열 컬럼이 섞인 실제 시트에서는 iterrows 결과와 같다)
+    """
+    data_to_insert = []
+
+    for idx, row in df.astype(object).iterrows():
+        # NaN을 None으로 변환
+        values = []
+        for i in range(44):  # 44개 컬럼
+            val = row.iloc[i]
+            if pd.isna(val):
+                values.append(None)
+            elif i == 0:  # ida_id (문자열)
+                values.append(str(val))
+            elif i in INTEGER_COLUMN_INDEXES:  # integer 컬럼들
+                values.append(int(val) if val != 0 and not pd.isna(val) else None)
+            else:  # numeric 컬럼들
+                values.append(float(val) if val != 0 and not pd.isna(val) else None)
+
+        data_to_insert.append(tuple(values))
+
+        # 진행상황 출력 (1000개마다)
+        if (idx + 1) % 1000 == 0:
+            print(f"      Processing {idx + 1}/{len(df)} rows...")
+
+    return data_to_insert
+
+
+def _column_dtype(i):
+    """엑셀 컬럼 위치 -> convert_column 타입 (0번 ida_id는 문자열, 0도 그대로 유지)"""
+    if i == 0:
+        return 'str', False
+    return ('int' if i in INTEGER_COLUMN_INDEXES else 'float'), True
+
+
+def prepare_rows(df):
+    """엑셀 DataFrame을 INSERT 파라미터 튜플 목록으로 변환 (컬럼 단위)"""
+    columns = [convert_column(df.iloc[:, i], *_column_dtype(i)) for i in range(len(COLUMNS))]
+    return list(zip(*columns))
+
+
+def verify_conversion(df):
+    """컬럼 단위 변환 결과가 행 단위 변환과 타입/값까지 동일한지 확인"""
+    expected = prepare_rows_legacy(df)
+    actual = prepare_rows(df)
+
+    if len(expected) != len(actual):
+        print(f"      Row count mismatch: legacy={len(expected)}, vectorized={len(actual)}")
+        return False
+
+    mismatches = [idx for idx, (a, b) in enumerate(zip(expected, actual)) if repr(a) != repr(b)]
+    for idx in mismatches[:10]:
+        print(f"      Mismatch at row {idx}:")
+        print(f"        legacy:     {expected[idx]!r}")
+        print(f"        vectorized: {actual[idx]!r}")
+
+    print(f"      Compared {len(expected)} rows, {len(mismatches)} mismatches")
+    return not mismatches
+
+
+def load_batch(cursor, rows):
+    """execute_batch로 한 행씩 upsert (기존 방식)"""
+    execute_batch(cursor, INSERT_QUERY, rows, page_size=1000)
+
+
+def load_copy(cursor, rows):
+    """
+    COPY FROM STDIN으로 임시 테이블에 적재한 뒤 한 번의 upsert로 병합
+
+    같은 ida_id가 여러 번 나오면 execute_batch와 동일하게 마지막 행이 반영된다.
+    """
+    cursor.execute(f"""
+        CREATE TEMP TABLE {STAGE_TABLE} ON COMMIT DROP AS
+        SELECT 0::bigint AS src_row, {', '.join(COLUMNS)}
+        FROM {TABLE_NAME}
+        WITH NO DATA
+    """)
+    copy_rows(
+        cursor,
+        STAGE_TABLE,
+        ['src_row'] + COLUMNS,
+        ((src_row, *values) for src_row, values in enumerate(rows)),
+    )
+    cursor.execute(MERGE_QUERY)
+
+
+LOADERS = {
+    'batch': load_batch,
+    'copy': load_copy,
+}
+
+# 기존 데이터를 지우지 않고 섀도 테이블과 교체하는 모드
+SWAP_MODE = 'swap'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='교과전형 입결 데이터 업로드')
+    parser.add_argument('--mode', choices=sorted([*LOADERS, SWAP_MODE]), default='batch',
+                        help='적재 방식 (batch: execute_batch, copy: COPY 스테이징 후 일괄 upsert, '
+                             'swap: 섀도 테이블 적재 후 교체. 권한/코멘트/트리거/created_at은 이어받고, '
+                             '외래키로 참조되는 테이블은 교체 불가)')
+    parser.add_argument('--verify', action='store_true',
+                        help='DB에 쓰지 않고 컬럼 단위 변환을 행 단위 변환과 비교')
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
     try:
         # 1. 엑셀 파일 읽기
         print(f"[1/7] Reading Excel file: {EXCEL_FILE}")
-        df = pd.read_excel(EXCEL_FILE)
+        df = read_sheet(EXCEL_FILE, columns=list(range(len(COLUMNS))))
 
         # 첫 번째 행이 헤더이므로 스킵
         print(f"      Total rows (with header): {len(df)}")
@@ -37,151 +223,55 @@ def main():
 
         print(f"      Data rows: {len(df)}")
 
+        if args.verify:
+            print(f"\n[verify] Comparing vectorized conversion against row-by-row loop...")
+            if not verify_conversion(df):
+                print(f"\n=== FAILED: Conversion mismatch ===")
+                sys.exit(1)
+            print_timings()
+            print(f"\n=== SUCCESS: Conversion is identical ===")
+            return
+
         # 2. 데이터베이스 연결
         print(f"\n[2/7] Connecting to database...")
         conn = psycopg2.connect(**DB_CONFIG)
         cursor = conn.cursor()
 
-        # 3. 기존 데이터 삭제
-        print(f"\n[3/7] Deleting existing data...")
-        cursor.execute("DELETE FROM susi_kyokwa_cut")
-        deleted_count = cursor.rowcount
-        print(f"      Deleted {deleted_count} rows")
-
-        # 4. INSERT 쿼리 준비
-        insert_query = """
-        INSERT INTO susi_kyokwa_cut (
-            ida_id,
-            grade_avg,
-            grade_initial_cut,
-            grade_additional_cut,
-            converted_score_initial_cut,
-            converted_score_avg,
-            converted_score_additional_cut,
-            converted_total_score,
-            recruitment_2023,
-            competition_rate_2023,
-            additional_pass_rank_2023,
-            actual_competition_rate_2023,
-            converted_score_50p_2023,
-            converted_score_70p_2023,
-            total_score_2023,
-            grade_50p_2023,
-            grade_70p_2023,
-            recruitment_2024,
-            competition_rate_2024,
-            additional_pass_rank_2024,
-            actual_competition_rate_2024,
-            converted_score_50p_2024,
-            converted_score_70p_2024,
-            total_score_2024,
-            grade_50p_2024,
-            grade_70p_2024,
-            recruitment_2025,
-            competition_rate_2025,
-            additional_pass_rank_2025,
-            actual_competition_rate_2025,
-            converted_score_50p_2025,
-            converted_score_70p_2025,
-            total_score_2025,
-            grade_50p_2025,
-            grade_70p_2025,
-            recruitment_2026,
-            competition_rate_2026,
-            additional_pass_rank_2026,
-            actual_competition_rate_2026,
-            converted_score_50p_2026,
-            converted_score_70p_2026,
-            total_score_2026,
-            grade_50p_2026,
-            grade_70p_2026
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s, %s, %s, %s,
-            %s, %s, %s, %s, %s, %s, %s, %s, %s
-        )
-        ON CONFLICT (ida_id) DO UPDATE SET
-            grade_avg = EXCLUDED.grade_avg,
-            grade_initial_cut = EXCLUDED.grade_initial_cut,
-            grade_additional_cut = EXCLUDED.grade_additional_cut,
-            converted_score_initial_cut = EXCLUDED.converted_score_initial_cut,
-            converted_score_avg = EXCLUDED.converted_score_avg,
-            converted_score_additional_cut = EXCLUDED.converted_score_additional_cut,
-            converted_total_score = EXCLUDED.converted_total_score,
-            recruitment_2023 = EXCLUDED.recruitment_2023,
-            competition_rate_2023 = EXCLUDED.competition_rate_2023,
-            additional_pass_rank_2023 = EXCLUDED.additional_pass_rank_2023,
-            actual_competition_rate_2023 = EXCLUDED.actual_competition_rate_2023,
-            converted_score_50p_2023 = EXCLUDED.converted_score_50p_2023,
-            converted_score_70p_2023 = EXCLUDED.converted_score_70p_2023,
-            total_score_2023 = EXCLUDED.total_score_2023,
-            grade_50p_2023 = EXCLUDED.grade_50p_2023,
-            grade_70p_2023 = EXCLUDED.grade_70p_2023,
-            recruitment_2024 = EXCLUDED.recruitment_2024,
-            competition_rate_2024 = EXCLUDED.competition_rate_2024,
-            additional_pass_rank_2024 = EXCLUDED.additional_pass_rank_2024,
-            actual_competition_rate_2024 = EXCLUDED.actual_competition_rate_2024,
-            converted_score_50p_2024 = EXCLUDED.converted_score_50p_2024,
-            converted_score_70p_2024 = EXCLUDED.converted_score_70p_2024,
-            total_score_2024 = EXCLUDED.total_score_2024,
-            grade_50p_2024 = EXCLUDED.grade_50p_2024,
-            grade_70p_2024 = EXCLUDED.grade_70p_2024,
-            recruitment_2025 = EXCLUDED.recruitment_2025,
-            competition_rate_2025 = EXCLUDED.competition_rate_2025,
-            additional_pass_rank_2025 = EXCLUDED.additional_pass_rank_2025,
-            actual_competition_rate_2025 = EXCLUDED.actual_competition_rate_2025,
-            converted_score_50p_2025 = EXCLUDED.converted_score_50p_2025,
-            converted_score_70p_2025 = EXCLUDED.converted_score_70p_2025,
-            total_score_2025 = EXCLUDED.total_score_2025,
-            grade_50p_2025 = EXCLUDED.grade_50p_2025,
-            grade_70p_2025 = EXCLUDED.grade_70p_2025,
-            recruitment_2026 = EXCLUDED.recruitment_2026,
-            competition_rate_2026 = EXCLUDED.competition_rate_2026,
-            additional_pass_rank_2026 = EXCLUDED.additional_pass_rank_2026,
-            actual_competition_rate_2026 = EXCLUDED.actual_competition_rate_2026,
-            converted_score_50p_2026 = EXCLUDED.converted_score_50p_2026,
-            converted_score_70p_2026 = EXCLUDED.converted_score_70p_2026,
-            total_score_2026 = EXCLUDED.total_score_2026,
-            grade_50p_2026 = EXCLUDED.grade_50p_2026,
-            grade_70p_2026 = EXCLUDED.grade_70p_2026,
-            updated_at = NOW()
-        """
-
-        # 5. 데이터 변환 및 삽입
+        # 3. 기존 데이터 삭제 (swap 모드는 교체 시점까지 기존 데이터를 유지)
+        if args.mode == SWAP_MODE:
+            print(f"\n[3/7] Keeping existing data until swap...")
+        else:
+            print(f"\n[3/7] Deleting existing data...")
+            cursor.execute(f"DELETE FROM {TABLE_NAME}")
+            deleted_count = cursor.rowcount
+            print(f"      Deleted {deleted_count} rows")
+
+        # 4. 데이터 변환
         print(f"\n[4/7] Preparing data...")
-        data_to_insert = []
-
-        for idx, row in df.iterrows():
-            # NaN을 None으로 변환
-            values = []
-            for i in range(44):  # 44개 컬럼
-                val = row.iloc[i]
-                if pd.isna(val):
-                    values.append(None)
-                elif i == 0:  # ida_id (문자열)
-                    values.append(str(val))
-                elif i in [8, 10, 17, 19, 26, 28, 35, 37]:  # integer 컬럼들
-                    values.append(int(val) if val != 0 and not pd.isna(val) else None)
-                else:  # numeric 컬럼들
-                    values.append(float(val) if val != 0 and not pd.isna(val) else None)
-
-            data_to_insert.append(tuple(values))
-
-            # 진행상황 출력 (1000개마다)
-            if (idx + 1) % 1000 == 0:
-                print(f"      Processing {idx + 1}/{len(df)} rows...")
-
-        # Batch insert
-        print(f"\n[5/7] Executing batch insert...")
-        execute_batch(cursor, insert_query, data_to_insert, page_size=1000)
-
-        # 6. 커밋
-        conn.commit()
+        started = time.perf_counter()
+        data_to_insert = prepare_rows(df)
+        prepare_elapsed = time.perf_counter() - started
+
+        # 5. 적재
+        print(f"\n[5/7] Loading rows (mode: {args.mode})...")
+        started = time.perf_counter()
+        if args.mode == SWAP_MODE:
+            timings = swap_load(conn, TABLE_NAME, COLUMNS, data_to_insert)
+            print(f"      Shadow load: {timings['load']:.2f}s, index: {timings['index']:.2f}s")
+            print(f"      Swap window: {timings['swap'] * 1000:.0f}ms")
+        else:
+            LOADERS[args.mode](cursor, data_to_insert)
+
+            # 6. 커밋
+            conn.commit()
+        load_elapsed = time.perf_counter() - started
+
+        row_count = len(data_to_insert)
+        print(f"      Prepare: {prepare_elapsed:.2f}s ({row_count / max(prepare_elapsed, 1e-9):,.0f} rows/sec)")
+        print(f"      Load:    {load_elapsed:.2f}s ({row_count / max(load_elapsed, 1e-9):,.0f} rows/sec)")
 
         # 7. 결과 확인
-        cursor.execute("SELECT COUNT(*) FROM susi_kyokwa_cut")
+        cursor.execute(f"SELECT COUNT(*) FROM {TABLE_NAME}")
         final_count = cursor.fetchone()[0]
 
         print(f"\n[6/7] Upload completed!")
@@ -189,9 +279,9 @@ def main():
 
         # 8. 샘플 데이터 확인
         print(f"\n[7/7] Sample data:")
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT ida_id, grade_avg, recruitment_2026, competition_rate_2026
-            FROM susi_kyokwa_cut
+            FROM {TABLE_NAME}
             LIMIT 5
         """)
         samples = cursor.fetchall()
@@ -202,6 +292,7 @@ def main():
         cursor.close()
         conn.close()
 
+        print_timings()
         print(f"\n=== SUCCESS: Data upload completed! ===")
 
     except Exception as e:
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+정시 입결(최초컷/추합컷) 조회 - 시뮬레이션 스크립트 공용
+
+- 연결 풀을 쓰는 requests.Session 하나로 군별/페이지별 요청을 동시에 보낸다
+- 응답은 CACHE_DIR에 저장하고 TTL 안에서는 재사용, TTL이 지나면 ETag/Last-Modified로 재검증
+- offline=True면 네트워크 없이 캐시 스냅숏만으로 동작 (캐시에 없는 군은 건너뜀)
+- 백엔드에 연결할 수 없으면 만료된 캐시라도 있으면 사용
+- fetch_admission_cuts_db: API 대신 PostgreSQL(js_admission)에서 필요한 (대학, 모집단위)만
+  서버 측 커서 한 번으로 조회 (psycopg2 필요, DB에 접근할 수 있는 환경용)
+
+반환 형식: {(대학명, 모집단위명): {'minCut', 'maxCut', 'totalScore'}}
+
+캐시/재검증/offline 동작 테스트 (scripts 디렉터리에서): python -m pytest tests/test_admission_cuts.py
+"""
+
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+ADMISSION_TYPES = ['가', '나', '다']
+CUT_YEAR = 2024
+
+CACHE_DIR = 'Uploads/.api-cache'
+CACHE_TTL = 60 * 60  # 초
+
+MAX_WORKERS = 6
+TIMEOUT = (3.05, 30)  # (연결, 응답) 초
+
+# DB 직접 조회용 연결 정보 (susi-back 스크립트와 같은 개발 DB)
+DB_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 5432,
+    'database': 'geobukschool_dev',
+    'user': 'tsuser',
+    'password': 'tsuser1234'
+}
+
+# 요청한 (대학명, 모집단위명) 쌍만 조회. API 경로와 같은 결과가 되도록 군 순서, id 순서로 정렬
+# (같은 키가 여러 군에 있으면 뒤의 값이 우선)
+CUTS_QUERY = """
+    WITH wanted (university_name, recruitment_name) AS (
+        SELECT DISTINCT * FROM unnest(%(university_names)s::text[], %(recruitment_names)s::text[])
+    )
+    SELECT u.name, a.recruitment_name, a.min_cut, a.max_cut, a.total_score
+    FROM js_admission a
+    JOIN ss_university u ON u.id = a.university_id
+    JOIN wanted w ON w.university_name = u.name AND w.recruitment_name = a.recruitment_name
+    WHERE a.year = %(year)s AND a.admission_type = ANY(%(admission_types)s::text[])
+    ORDER BY array_position(%(admission_types)s::text[], a.admission_type::text), a.id
+"""
+
+DB_FETCH_SIZE = 2000
+
+
+class CacheMiss(Exception):
+    """offline 모드에서 캐시에 없는 요청"""
+
+
+def create_session(pool_size=MAX_WORKERS):
+    """연결 재사용 + 일시적 오류(502/503/504) 재시도 세션"""
+    session = requests.Session()
+    retry = Retry(total=2, backoff_factor=0.5, status_forcelist=[502, 503, 504], allowed_methods=['GET'])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class ResponseCache:
+    """URL+파라미터별 JSON 응답 캐시 (ETag/Last-Modified와 받은 시각을 함께 저장)"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+
+    def _path(self, url, params):
+        key = json.dumps([url, sorted((params or {}).items())], ensure_ascii=False, default=str)
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode('utf-8')).hexdigest() + '.json')
+
+    def load(self, url, params):
+        path = self._path(url, params)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, params, body, headers):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entry = {
+            'url': url,
+            'params': params,
+            'etag': headers.get('ETag'),
+            'lastModified': headers.get('Last-Modified'),
+            'fetchedAt': time.time(),
+            'body': body,
+        }
+        # 동시에 쓰는 스레드가 있어도 깨진 파일을 읽지 않도록 임시 파일에 쓰고 교체
+        path = self._path(url, params)
+        temp_path = f'{path}.{os.getpid()}.{id(entry)}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+        return entry
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry.get('fetchedAt', 0) < self.ttl
+
+
+def get_json(session, cache, url, params, offline=False):
+    """
+    캐시를 거쳐 JSON 응답 조회
+
+    Returns:
+        (body, source): source는 'cache' | 'revalidated' | 'network' | 'stale'
+    """
+    entry = cache.load(url, params)
+    if offline:
+        if entry is None:
+            raise CacheMiss(f'{url} {params}')
+        return entry['body'], 'cache'
+    if cache.is_fresh(entry):
+        return entry['body'], 'cache'
+
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('lastModified'):
+        headers['If-Modified-Since'] = entry['lastModified']
+
+    try:
+        response = session.get(url, params=params, headers=headers, timeout=TIMEOUT)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+        if entry is None:
+            raise
+        return entry['body'], 'stale'
+
+    if response.status_code == 304 and entry is not None:
+        cache.store(url, params, entry['body'], {
+            'ETag': response.headers.get('ETag', entry.get('etag')),
+            'Last-Modified': response.headers.get('Last-Modified', entry.get('lastModified')),
+        })
+        return entry['body'], 'revalidated'
+
+    response.raise_for_status()
+    body = response.json()
+    cache.store(url, params, body, response.headers)
+    return body, 'network'
+
+
+def extract_items(data):
+    """API 응답에서 전형 목록 추출 ({ success, data: { items } } / { items } / { data: [...] } / [...])"""
+    if isinstance(data, dict):
+        if 'data' in data and isinstance(data['data'], dict):
+            return data['data'].get('items', [])
+        if 'items' in data:
+            return data['items']
+        return data.get('data', [])
+    return data
+
+
+def page_count(data):
+    """응답의 페이지 수 (meta.totalPages / meta.lastPage 가 없으면 1페이지)"""
+    candidates = [data]
+    if isinstance(data, dict):
+        candidates += [data.get('meta'), data.get('data')]
+        if isinstance(data.get('data'), dict):
+            candidates.append(data['data'].get('meta'))
+    for candidate in candidates:
+        if isinstance(candidate, dict):
+            for key in ('totalPages', 'lastPage'):
+                if isinstance(candidate.get(key), int):
+                    return max(candidate[key], 1)
+    return 1
+
+
+def _cut_entry(min_cut, max_cut, total_score):
+    return {
+        'minCut': float(min_cut) if min_cut else 0,
+        'maxCut': float(max_cut) if max_cut else 0,
+        'totalScore': float(total_score) if total_score else 1000,
+    }
+
+
+def index_cuts(admissions, cuts):
+    """대학명+모집단위로 컷 데이터 인덱싱"""
+    for adm in admissions:
+        if not isinstance(adm, dict):
+            continue
+
+        univ = adm.get('university', {})
+        univ_name = univ.get('name', '') if isinstance(univ, dict) else ''
+        recruitment_name = adm.get('recruitmentName', '')
+
+        if univ_name and recruitment_name:
+            cuts[(univ_name, recruitment_name)] = _cut_entry(
+                adm.get('minCut'), adm.get('maxCut'), adm.get('totalScore')
+            )
+
+
+def fetch_admission_cuts(api_base_url, year=CUT_YEAR, admission_types=ADMISSION_TYPES,
+                         offline=False, cache_dir=CACHE_DIR, ttl=CACHE_TTL):
+    """
+    백엔드 /explore/regular에서 군별 정시 입결 조회
+
+    1) 군별 첫 페이지를 동시에 요청하고 2) 페이지가 더 있으면 나머지 페이지를 동시에 요청한다.
+    결과는 군 순서, 페이지 순서대로 병합한다 (같은 키는 뒤의 값이 우선).
+    """
+    url = f'{api_base_url}/explore/regular'
+    cache = ResponseCache(cache_dir, ttl)
+    started = time.perf_counter()
+
+    def fetch(admission_type, page):
+        params = {'year': year, 'admission_type': admission_type}
+        if page > 1:
+            params['page'] = page
+        try:
+            return get_json(session, cache, url, params, offline)
+        except Exception as e:
+            return e, None
+
+    with create_session() as session, ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        first_pages = dict(zip(admission_types, pool.map(lambda t: fetch(t, 1), admission_types)))
+
+        rest = [
+            (admission_type, page)
+            for admission_type, (body, source) in first_pages.items()
+            if source is not None
+            for page in range(2, page_count(body) + 1)
+        ]
+        rest_pages = dict(zip(rest, pool.map(lambda args: fetch(*args), rest)))
+
+    cuts = {}
+    for admission_type, (body, source) in first_pages.items():
+        if source is None:
+            _print_error(admission_type, body)
+            continue
+
+        pages = [(body, source)] + [rest_pages[key] for key in rest if key[0] == admission_type]
+        failed = [result for result, page_source in pages if page_source is None]
+        if failed:
+            _print_error(admission_type, failed[0])
+            continue
+
+        admissions = [adm for page_body, _ in pages for adm in extract_items(page_body)]
+        index_cuts(admissions, cuts)
+
+        sources = sorted({page_source for _, page_source in pages})
+        page_info = f', {len(pages)}페이지' if len(pages) > 1 else ''
+        print(f'  - {admission_type}군: {len(admissions)}개 로드 ({"/".join(sources)}{page_info})')
+
+    print(f'  총 {len(cuts)}개 입결 데이터 로드 ({time.perf_counter() - started:.2f}s)')
+    return cuts
+
+
+def fetch_admission_cuts_db(keys, year=CUT_YEAR, admission_types=ADMISSION_TYPES, db_config=None):
+    """
+    js_admission에서 keys [(대학명, 모집단위명)]의 입결만 직접 조회
+
+    HTTP/JSON 직렬화와 ORM 엔티티 생성 없이 서버 측(named) 커서로 DB_FETCH_SIZE행씩 받아온다.
+    """
+    import psycopg2
+
+    # 대학명/모집단위가 비어 있는(NaN) 행은 API 경로에서도 매칭되지 않으므로 제외
+    keys = [key for key in dict.fromkeys(keys) if all(isinstance(name, str) for name in key)]
+    started = time.perf_counter()
+    cuts = {}
+
+    conn = psycopg2.connect(**(db_config or DB_CONFIG))
+    try:
+        with conn.cursor(name='admission_cuts') as cursor:
+            cursor.itersize = DB_FETCH_SIZE
+            cursor.execute(CUTS_QUERY, {
+                'university_names': [university_name for university_name, _ in keys],
+                'recruitment_names': [recruitment_name for _, recruitment_name in keys],
+                'year': year,
+                'admission_types': list(admission_types),
+            })
+            for univ_name, recruitment_name, min_cut, max_cut, total_score in cursor:
+                cuts[(univ_name, recruitment_name)] = _cut_entry(min_cut, max_cut, total_score)
+    finally:
+        conn.close()
+
+    print(f'  총 {len(cuts)}개 입결 데이터 로드 (DB, 요청 {len(keys)}개 모집단위, {time.perf_counter() - started:.2f}s)')
+    return cuts
+
+
+def _print_error(admission_type, error):
+    if isinstance(error, CacheMiss):
+        print(f'  - {admission_type}군: 오프라인 캐시 없음')
+    elif isinstance(error, requests.exceptions.ConnectionError):
+        print(f'  - {admission_type}군: 백엔드 연결 실패 (서버 확인 필요)')
+    else:
+        print(f'  - {admission_type}군: 오류 - {error}')
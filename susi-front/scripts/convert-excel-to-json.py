@@ -1,10 +1,31 @@
 # -*- coding: utf-8 -*-
+"""
+모의지원현황 엑셀 -> public/data JSON 변환
+
+사용법:
+    python scripts/convert-excel-to-json.py                    # mock-application-data.json + mock-application-lookup.json + university-lookup.json
+    python scripts/convert-excel-to-json.py --shard-by row     # 모집단위별 JSON 파일 + index.json도 저장
+    python scripts/convert-excel-to-json.py --shard-by university  # 대학코드별 JSON 파일 + index.json도 저장
+    python scripts/convert-excel-to-json.py --stream           # 도수분포/지원자 목록을 모집단위별로 바로 기록 (메모리 절약)
+
+--stream을 써도 세 시트의 DataFrame(엑셀 파싱 결과)과 basicInfo dict는 끝까지 메모리에 있다.
+줄어드는 것은 도수분포/지원자 목록의 JSON dict로, 모집단위 하나 분량만 만들고 바로 기록한다.
+"""
+import argparse
 import pandas as pd
 import json
 import math
+import os
 import sys
 import io
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'susi-back', 'scripts'))
+from excel_reader import print_timings, read_sheets
+from mock_data_writer import (
+    SHARD_DIR, SHARD_MODES, MockDataStreamWriter,
+    print_peak_rss, print_shard_report, write_lookup_index, write_shards,
+)
+
 # Force UTF-8 for stdout
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
@@ -32,13 +53,34 @@ def safe_str(val, default=""):
         return default
     return str(val)
 
+parser = argparse.ArgumentParser(description='모의지원현황 엑셀 -> JSON 변환')
+parser.add_argument('--shard-by', choices=SHARD_MODES,
+                    help=f'{SHARD_DIR}/에 모집단위(row) 또는 대학코드(university)별 압축 JSON + index.json 추가 저장')
+parser.add_argument('--stream', action='store_true',
+                    help='도수분포/지원자 목록을 모집단위별로 바로 JSON에 기록 (두 섹션의 전체 dict를 만들지 않음. '
+                         '시트 DataFrame과 basicInfo는 그대로 메모리에 둠, --shard-by와 함께 사용 불가)')
+args = parser.parse_args()
+if args.stream and args.shard_by:
+    parser.error('--stream은 --shard-by와 함께 사용할 수 없습니다 (샤드는 지원자 목록 전체가 필요)')
+
+output_path = 'public/data/mock-application-data.json'
+
 # Excel 파일 읽기
 excel_path = 'Uploads/모의지원현황_전체.xlsx'
 
+# 시트별로 변환에 사용하는 컬럼만 읽기
+SHEET_COLUMNS = {
+    '기본정보': ['row_id', '대학코드', '대학명', '구분', '모집단위', '모집인원', '경쟁률', '충원합격순위', '총합격자', '모의지원자수'],
+    '도수분포': ['row_id', '점수하한', '점수상한', '지원자수', '누적인원', '합격상태'],
+    '지원자목록': ['row_id', '순위', '점수', '합격상태', '비고'],
+}
+
 print('Reading Excel file...')
-df_basic = pd.read_excel(excel_path, sheet_name='기본정보')
-df_freq = pd.read_excel(excel_path, sheet_name='도수분포')
-df_applicants = pd.read_excel(excel_path, sheet_name='지원자목록')
+sheets = read_sheets(excel_path, list(SHEET_COLUMNS), columns=SHEET_COLUMNS)
+df_basic = sheets['기본정보']
+df_freq = sheets['도수분포']
+df_applicants = sheets['지원자목록']
+print_timings()
 
 print(f'기본정보: {len(df_basic)} rows')
 print(f'도수분포: {len(df_freq)} rows')
@@ -74,35 +116,53 @@ for _, row in df_basic.iterrows():
 print(f'\nConverted {len(mock_data["basicInfo"])} basicInfo entries')
 
 # 도수분포 변환 - 컬럼명: row_id, 점수하한, 점수상한, 지원자수, 누적인원, 합격상태
-for _, row in df_freq.iterrows():
-    row_id = str(safe_int(row['row_id']))
-    if row_id not in mock_data["frequencyDistribution"]:
-        mock_data["frequencyDistribution"][row_id] = []
-
-    mock_data["frequencyDistribution"][row_id].append({
-        "scoreLower": safe_float(row['점수하한']),
-        "scoreUpper": safe_float(row['점수상한']),
-        "applicantCount": safe_int(row['지원자수']),
-        "cumulativeCount": safe_int(row['누적인원']),
-        "passStatus": safe_str(row['합격상태'])
-    })
-
-print(f'Converted {len(mock_data["frequencyDistribution"])} frequencyDistribution entries')
+def iter_frequency():
+    """row_id별 도수분포 배열 (시트에 처음 나온 row_id 순서, 한 모집단위씩 생성)"""
+    row_ids = df_freq['row_id'].map(lambda val: str(safe_int(val)))
+    for row_id, group in df_freq.groupby(row_ids, sort=False):
+        yield row_id, [
+            {
+                "scoreLower": safe_float(row['점수하한']),
+                "scoreUpper": safe_float(row['점수상한']),
+                "applicantCount": safe_int(row['지원자수']),
+                "cumulativeCount": safe_int(row['누적인원']),
+                "passStatus": safe_str(row['합격상태'])
+            }
+            for _, row in group.iterrows()
+        ]
 
 # 지원자목록 변환 - 컬럼명: row_id, 순위, 점수, 합격상태, 비고
-for _, row in df_applicants.iterrows():
-    row_id = str(safe_int(row['row_id']))
-    if row_id not in mock_data["applicants"]:
-        mock_data["applicants"][row_id] = []
-
-    mock_data["applicants"][row_id].append({
-        "rank": safe_int(row['순위']),
-        "score": safe_float(row['점수']),
-        "passStatus": safe_str(row['합격상태']),
-        "note": safe_value(row['비고'])
-    })
-
-print(f'Converted {len(mock_data["applicants"])} applicants entries')
+def iter_applicants():
+    """row_id별 지원자 배열 (시트에 처음 나온 row_id 순서, 한 모집단위씩 생성)"""
+    row_ids = df_applicants['row_id'].map(lambda val: str(safe_int(val)))
+    for row_id, group in df_applicants.groupby(row_ids, sort=False):
+        yield row_id, [
+            {
+                "rank": safe_int(row['순위']),
+                "score": safe_float(row['점수']),
+                "passStatus": safe_str(row['합격상태']),
+                "note": safe_value(row['비고'])
+            }
+            for _, row in group.iterrows()
+        ]
+
+if args.stream:
+    # 기본정보를 먼저 기록하고 도수분포/지원자 목록은 모집단위별로 만들어 바로 기록
+    # (섹션은 이 스크립트가 만드는 세 개만, 비스트리밍 출력과 같은 순서)
+    with MockDataStreamWriter(output_path, list(mock_data)) as writer:
+        for row_id, value in mock_data["basicInfo"].items():
+            writer.write(row_id, {"basicInfo": value})
+        for row_id, items in iter_frequency():
+            writer.write(row_id, {"frequencyDistribution": items})
+        for row_id, items in iter_applicants():
+            writer.write(row_id, {"applicants": items})
+    print(f'Converted {writer.counts["frequencyDistribution"]} frequencyDistribution entries (streamed)')
+    print(f'Converted {writer.counts["applicants"]} applicants entries (streamed)')
+else:
+    mock_data["frequencyDistribution"] = dict(iter_frequency())
+    print(f'Converted {len(mock_data["frequencyDistribution"])} frequencyDistribution entries')
+    mock_data["applicants"] = dict(iter_applicants())
+    print(f'Converted {len(mock_data["applicants"])} applicants entries')
 
 # lookup 테이블 생성 - 대학명_모집단위_구분 -> row_id
 # 추가로 대학코드_모집단위_구분 -> row_id
@@ -118,10 +178,17 @@ for row_id, info in mock_data["basicInfo"].items():
 
 print(f'\nCreated lookup with {len(lookup)} entries')
 
-# JSON 파일로 저장
-with open('public/data/mock-application-data.json', 'w', encoding='utf-8') as f:
-    json.dump(mock_data, f, ensure_ascii=False, indent=2)
-print('Saved mock-application-data.json')
+# JSON 파일로 저장 (--stream이면 이미 저장됨)
+if not args.stream:
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(mock_data, f, ensure_ascii=False, indent=2)
+print(f"Saved mock-application-data.json ({os.path.getsize(output_path) / 1024 / 1024:,.1f}MB)")
+
+# 프론트 직접 조회용 정규화 키 인덱스 (대학명|모집단위, 대학코드|모집단위) + 충돌 리포트
+write_lookup_index(mock_data["basicInfo"])
+
+if args.shard_by:
+    print_shard_report(write_shards(mock_data, args.shard_by))
 
 with open('public/data/university-lookup.json', 'w', encoding='utf-8') as f:
     json.dump(lookup, f, ensure_ascii=False, indent=2)
@@ -135,4 +202,5 @@ for row_id, info in mock_data["basicInfo"].items():
         if int(row_id) > 130:
             break
 
+print_peak_rss()
 print('\nDone!')
@@ -8,18 +8,58 @@
 - 모집인원 순위 = 최초컷 (안정합격)
 - 충원합격 마지막 = 추합컷 (합격가능/추가합격)
 - 나머지 = 추합컷 미만 (불합격)
+
+사용법:
+    python scripts/generate_simulation.py                  # 배치 엔진 (전체 모집단위를 배열 연산으로 한 번에)
+    python scripts/generate_simulation.py --engine legacy  # 모집단위별 simulate_applicants
+    python scripts/generate_simulation.py --engine analytic  # 표본 추출 없이 clip한 정규분포 CDF로 기대 도수분포 계산
+    python scripts/generate_simulation.py --compare-analytic  # analytic과 표본 추출(batch) 결과 비교 (파일 저장 안 함)
+    python scripts/generate_simulation.py --pass-probability  # 모집단위별 반복 시뮬레이션으로 점수 -> 합격 확률 곡선 저장
+    python scripts/generate_simulation.py --verify         # --seed로 두 엔진 결과 비교 (파일 저장 안 함)
+    python scripts/generate_simulation.py --bin-width 2.5  # 도수분포 구간 폭 조정 (기본 5점)
+    python scripts/generate_simulation.py --workers 8      # 기본정보 행을 나눠 프로세스 8개로 병렬 실행
+    python scripts/generate_simulation.py --incremental    # 입력이 바뀐 모집단위만 다시 계산해 기존 JSON에 반영
+    python scripts/generate_simulation.py --offline        # 백엔드 없이 입결 응답 캐시로 실행
+    python scripts/generate_simulation.py --cut-source db  # API 대신 PostgreSQL에서 입결 직접 조회
+    python scripts/generate_simulation.py --shard-by row   # 모집단위별 JSON 파일 + index.json도 저장 (university: 대학코드별)
+    python scripts/generate_simulation.py --columnar       # 도수분포를 컬럼형 JSON(+ .gz/.br)으로도 저장
+    python scripts/generate_simulation.py --stream         # 모집단위별로 바로 JSON에 기록 (지원자 목록을 한 모집단위씩만 메모리에 유지)
+    python scripts/generate_simulation.py --load-db        # 기본정보/통계/도수분포를 PostgreSQL 테이블에 COPY로 적재 후 교체
+    python scripts/generate_simulation.py --excel-full     # 엑셀에 샘플 대신 전체 모집단위 도수분포 기록 (write-only, 행 한도 넘으면 이어짐 시트)
+    python scripts/generate_simulation.py --excel-full --excel-applicants  # 지원자목록 시트도 기록 (INCLUDE_APPLICANTS 필요)
+
+배치 엔진은 모집단위마다 (--seed, row_id)로 시드한 난수 생성기를 쓰므로
+같은 시드면 --workers 값과 관계없이 같은 결과가 나온다.
+
+합성 기본정보 시트로 엔진 일치/증분 실행을 확인하는 테스트 (scripts 디렉터리에서): python -m pytest tests/test_generate_simulation.py
 """
 
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
-import requests
 import sys
 import io
 import math
 import json
 from datetime import datetime
-
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+from statistics import NormalDist
+
+from admission_cuts import CACHE_DIR, CACHE_TTL, fetch_admission_cuts, fetch_admission_cuts_db
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'susi-back', 'scripts'))
+from excel_reader import print_timings, read_sheet
+from pass_probability import (
+    PASS_PROBABILITY_FILE, PassProbabilityIndex, benchmark, build_curves, print_benchmark, save_curves,
+)
+from mock_data_writer import (
+    COLUMNAR_FREQUENCY_FILE, SHARD_DIR, SHARD_MODES, ExcelStreamWriter, MockDataStreamWriter, convert_nan_to_none,
+    peak_rss, print_columnar_report, print_excel_report, print_peak_rss, print_shard_report,
+    write_columnar_frequency, write_lookup_index, write_shards,
+)
 
 # ============================================
 # 설정
@@ -29,79 +69,54 @@ OUTPUT_JSON = 'public/data/mock-application-data.json'
 OUTPUT_EXCEL = f'Uploads/모의지원_시뮬레이션_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
 API_BASE_URL = 'http://localhost:4001'  # NestJS 백엔드
 
+# 증분 실행용 매니페스트 (row_id별 입력 지문, OUTPUT_JSON과 함께 갱신)
+MANIFEST_FILE = 'Uploads/mock-application-manifest.json'
+
+# 시뮬레이션 규칙이 바뀌면 올려서 증분 실행 시 전체를 다시 계산하게 함
+SIMULATION_VERSION = 3  # 2: scoreQuantiles 추가, 3: 지원자 목록 note(비고) 추가
+
+# --excel-full 시트 컬럼 (모의지원현황_전체.xlsx / 백엔드 MockApplicationService와 같은 형식)
+EXCEL_FREQUENCY_COLUMNS = ['row_id', '점수하한', '점수상한', '지원자수', '누적인원', '합격상태']
+EXCEL_APPLICANT_COLUMNS = ['row_id', '순위', '점수', '합격상태', '비고']
+
+# 기본정보 시트에서 읽을 컬럼
+BASIC_COLUMNS = ['row_id', '대학코드', '대학명', '구분', '모집단위', '모집인원', '경쟁률', '충원합격순위', '총합격자', '모의지원자수']
+
 # 파일 크기 최적화: 지원자 목록 포함 여부
 INCLUDE_APPLICANTS = False  # True면 전체 지원자 목록 포함 (파일 크기 매우 큼)
 
-# ============================================
-# 백엔드 API에서 입결 데이터 가져오기
-# ============================================
-def fetch_admission_cuts():
-    """백엔드에서 정시 입결 데이터(최초컷/추합컷) 가져오기"""
-    cuts = {}
-
-    for admission_type in ['가', '나', '다']:
-        try:
-            # 정시 전형 목록 조회 (2024년)
-            response = requests.get(
-                f'{API_BASE_URL}/explore/regular',
-                params={'year': 2024, 'admission_type': admission_type},
-                timeout=30
-            )
-            if response.status_code == 200:
-                data = response.json()
-
-                # API 응답 구조: { success: true, data: { items: [...] } }
-                if isinstance(data, dict):
-                    if 'data' in data and isinstance(data['data'], dict):
-                        admissions = data['data'].get('items', [])
-                    elif 'items' in data:
-                        admissions = data['items']
-                    else:
-                        admissions = data.get('data', [])
-                else:
-                    admissions = data
-
-                # 대학명+모집단위로 인덱싱
-                for adm in admissions:
-                    if not isinstance(adm, dict):
-                        continue
-
-                    univ = adm.get('university', {})
-                    univ_name = univ.get('name', '') if isinstance(univ, dict) else ''
-                    recruitment_name = adm.get('recruitmentName', '')
-
-                    if univ_name and recruitment_name:
-                        key = (univ_name, recruitment_name)
-                        min_cut = adm.get('minCut')
-                        max_cut = adm.get('maxCut')
-                        total_score = adm.get('totalScore')
-
-                        cuts[key] = {
-                            'minCut': float(min_cut) if min_cut else 0,
-                            'maxCut': float(max_cut) if max_cut else 0,
-                            'totalScore': float(total_score) if total_score else 1000,
-                        }
-
-                print(f'  - {admission_type}군: {len(admissions)}개 로드')
-
-        except requests.exceptions.ConnectionError:
-            print(f'  - {admission_type}군: 백엔드 연결 실패 (서버 확인 필요)')
-        except Exception as e:
-            print(f'  - {admission_type}군: 오류 - {e}')
-
-    print(f'  총 {len(cuts)}개 입결 데이터 로드')
-    return cuts
+# scoreQuantiles: 0~100 백분위 점수표
+QUANTILE_LEVELS = np.arange(101) / 100
+
+# 도수분포 구간 폭 (점) - 더 촘촘한 차트가 필요하면 --bin-width로 조정
+BIN_WIDTH = 5
+
+# 합격상태 (코드 = 리스트 인덱스, 도수분포 대표 상태는 코드가 가장 작은 상태)
+PASS_STATUSES = ['안정합격', '추가합격', '합격가능', '불합격']
+
+# 기본 난수 시드 (--seed), --verify 시 두 엔진에 같은 난수열을 주는 데도 사용
+SEED = 20241
+
+# 병렬 실행 시 워커당 샤드 수 (모집단위별 지원자 수 편차를 고르게 나누기 위함)
+SHARDS_PER_WORKER = 4
+
+# --stream 배치 엔진이 한 번에 배열 연산하는 모집단위 수 (모집단위별 시드라 결과는 같음)
+STREAM_CHUNK_UNITS = 200
+
+# --pass-probability 모집단위별 반복 횟수
+PASS_REPLICATES = 200
 
 # ============================================
 # 지원자 점수 시뮬레이션
 # ============================================
-def simulate_applicants(row, cuts):
+def simulate_applicants(row, cuts, bin_width=None):
     """
     한 모집단위에 대한 지원자 점수 시뮬레이션
 
     Args:
         row: 기본정보 시트의 한 행
         cuts: 백엔드에서 가져온 컷 데이터
+        bin_width: 도수분포 구간 폭 (기본 BIN_WIDTH)
 
     Returns:
         applicants: 지원자 목록 [{순위, 점수, 합격상태, 비고}]
@@ -187,137 +202,533 @@ def simulate_applicants(row, cuts):
         })
 
     # 도수분포표 생성
-    freq_dist = generate_frequency_distribution(applicants, 모집인원, 합격자수)
+    freq_dist = generate_frequency_distribution(applicants, 모집인원, 합격자수, bin_width)
 
     return applicants, freq_dist
 
-def generate_frequency_distribution(applicants, 모집인원, 합격자수):
-    """도수분포표 생성 (5점 간격)"""
-    if not applicants:
-        return []
+def resolve_bin_width(bin_width=None):
+    """구간 폭 (없으면 BIN_WIDTH, 정수 값이면 int로 맞춰 구간 경계가 정수로 출력되게 함)"""
+    bin_width = bin_width or BIN_WIDTH
+    return int(bin_width) if float(bin_width).is_integer() else float(bin_width)
 
-    scores = [a['점수'] for a in applicants]
-    min_score = math.floor(min(scores) / 5) * 5
-    max_score = math.ceil(max(scores) / 5) * 5
 
-    bins = {}
-    for start in range(int(max_score), int(min_score) - 1, -5):
-        bins[start] = {'count': 0, 'statuses': []}
+def bin_lower_bounds(scores, bin_width=None):
+    """점수별 도수분포 구간 하한 (bin_width가 정수면 정수 배열)"""
+    bin_width = resolve_bin_width(bin_width)
+    lower = np.floor(np.asarray(scores, dtype=float) / bin_width) * bin_width
+    return lower.astype(np.int64) if isinstance(bin_width, int) else lower
 
-    for a in applicants:
-        bin_start = math.floor(a['점수'] / 5) * 5
-        if bin_start in bins:
-            bins[bin_start]['count'] += 1
-            bins[bin_start]['statuses'].append(a['합격상태'])
 
-    freq_dist = []
-    누적인원 = 0
+def generate_frequency_distribution(applicants, 모집인원, 합격자수, bin_width=None):
+    """
+    도수분포표 생성 (기본 5점 간격, bin_width로 조정)
 
-    for start in sorted(bins.keys(), reverse=True):
-        if bins[start]['count'] == 0:
-            continue
+    순위순 점수 배열에서 구간 번호를 구해 np.bincount로 구간별 인원을 세고,
+    대표 합격상태는 구간에 있는 상태 중 PASS_STATUSES 순서가 가장 앞선 것으로 정한다.
+    지원자가 없는 구간은 생략한다.
+    """
+    if not applicants:
+        return []
 
-        누적인원 += bins[start]['count']
+    bin_width = resolve_bin_width(bin_width)
+    lower = bin_lower_bounds([a['점수'] for a in applicants], bin_width)
+    status = np.array([PASS_STATUSES.index(a['합격상태']) for a in applicants])
 
-        # 해당 구간의 대표 합격상태 결정
-        statuses = bins[start]['statuses']
-        if '안정합격' in statuses:
-            합격상태 = '안정합격'
-        elif '추가합격' in statuses:
-            합격상태 = '추가합격'
-        elif '합격가능' in statuses:
-            합격상태 = '합격가능'
-        else:
-            합격상태 = '불합격'
+    # 구간 번호: 최고 구간 = 0, 아래로 갈수록 증가
+    top = lower.max()
+    bin_index = np.rint((top - lower) / bin_width).astype(np.int64)
+    counts = np.bincount(bin_index)
 
-        freq_dist.append({
+    # 상태별로 그 상태의 지원자가 있는 구간을 표시하고, 우선순위가 높은 상태부터 채운다
+    dominant = np.full(len(counts), len(PASS_STATUSES) - 1)
+    for code in range(len(PASS_STATUSES) - 2, -1, -1):
+        present = np.bincount(bin_index[status == code], minlength=len(counts)) > 0
+        dominant[present] = code
+
+    bin_start = np.zeros(len(counts), dtype=lower.dtype)
+    bin_start[bin_index] = lower
+    nonempty = np.flatnonzero(counts)
+
+    return [
+        {
             '점수하한': start,
-            '점수상한': start + 5,
-            '지원자수': bins[start]['count'],
+            '점수상한': start + bin_width,
+            '지원자수': count,
             '누적인원': 누적인원,
-            '합격상태': 합격상태
-        })
+            '합격상태': PASS_STATUSES[code],
+        }
+        for start, count, 누적인원, code in zip(
+            bin_start[nonempty].tolist(),
+            counts[nonempty].tolist(),
+            np.cumsum(counts)[nonempty].tolist(),
+            dominant[nonempty].tolist(),
+        )
+    ]
+
+# ============================================
+# 배치 시뮬레이션 (전체 모집단위 배열 연산)
+# ============================================
+def _int_column(col, default):
+    """int(x) if pd.notna(x) else default 를 컬럼 단위로"""
+    values = pd.to_numeric(col).astype(float).to_numpy()
+    return np.where(np.isnan(values), default, np.trunc(np.nan_to_num(values))).astype(np.int64)
+
+
+def prepare_units(df, cuts):
+    """
+    기본정보 시트 전체에서 모집단위별 시뮬레이션 파라미터 배열 생성 (simulate_applicants와 같은 규칙)
+
+    Returns:
+        units: {이름: 배열} (모집인원이 0 이하인 행은 제외, 'rows'는 df 내 위치)
+    """
+    모집인원 = _int_column(df['모집인원'], 0)
+    경쟁률 = pd.to_numeric(df['경쟁률']).astype(float).fillna(0).to_numpy()
+    충원합격순위 = _int_column(df['충원합격순위'], 0)
+
+    keep = 모집인원 > 0
+    rows = np.flatnonzero(keep)
+    모집인원, 경쟁률, 충원합격순위 = 모집인원[keep], 경쟁률[keep], 충원합격순위[keep]
+
+    cut_data = [cuts.get(key, {}) for key in zip(df['대학명'].to_numpy()[keep], df['모집단위'].to_numpy()[keep])]
+    최초컷 = np.array([c.get('minCut', 0) for c in cut_data], dtype=float)
+    추합컷 = np.array([c.get('maxCut', 0) for c in cut_data], dtype=float)
+    총점 = np.array([c.get('totalScore', 1000) for c in cut_data], dtype=float)
+
+    최초컷 = np.where(최초컷 == 0, 총점 * 0.65, 최초컷)
+    추합컷 = np.where(추합컷 == 0, 최초컷 * 0.98, 추합컷)
+    최고점 = np.minimum(최초컷 * 1.05, 총점)
+    최저점 = 추합컷 * 0.85
+    표준편차 = (최초컷 - 추합컷) / 3
+    표준편차 = np.where(표준편차 <= 0, (최고점 - 최저점) / 6, 표준편차)
+
+    지원인원 = np.maximum(np.ceil(모집인원 * 경쟁률), 1).astype(np.int64)
+
+    return {
+        'rows': rows,
+        'row_ids': df['row_id'].to_numpy()[keep],
+        '모집인원': 모집인원,
+        '충원합격순위': 충원합격순위,
+        '합격자수': 모집인원 + 충원합격순위,
+        '지원인원': 지원인원,
+        'offsets': np.concatenate(([0], np.cumsum(지원인원)[:-1])).astype(np.int64),
+        '최초컷': 최초컷,
+        '추합컷': 추합컷,
+        '최고점': 최고점,
+        '최저점': 최저점,
+        '평균': (최초컷 + 추합컷) / 2,
+        '표준편차': 표준편차,
+    }
+
+
+def pass_status_codes(rank, 모집인원, 합격자수, 충원합격순위):
+    """순위별 합격상태 코드 (PASS_STATUSES 위치, simulate_applicants와 같은 규칙)"""
+    return np.select(
+        [rank <= 모집인원, (rank <= 합격자수) & (rank <= 모집인원 + 충원합격순위 // 2), rank <= 합격자수],
+        [0, 1, 2],
+        default=3,
+    )
+
+
+def score_quantiles(scores, offsets, counts, safe_pass_threshold, pass_threshold):
+    """
+    모집단위별 백분위 점수표와 기준점 이상 인원
+
+    scores는 모집단위별 내림차순 점수를 이어 붙인 배열 (모집단위 i는 offsets[i]부터 counts[i]명).
+    백분위 q의 점수는 오름차순 위치 q/100 x (counts-1)에서 선형 보간 (np.quantile 기본 방식).
+
+    Returns:
+        {'scores': (모집단위 수, 101) 배열 (소수 둘째 자리), 'safePassCount': 배열, 'passCount': 배열}
+    """
+    position = QUANTILE_LEVELS[None, :] * (counts[:, None] - 1)
+    below = np.floor(position).astype(np.int64)
+    above = np.minimum(below + 1, counts[:, None] - 1)
+    # 오름차순 위치 k = 내림차순 위치 counts-1-k
+    descending = offsets[:, None] + counts[:, None] - 1
+    low, high = scores[descending - below], scores[descending - above]
+    table = np.round(low + (high - low) * (position - below), 2)
+
+    unit_of = np.repeat(np.arange(len(counts)), counts)
+    return {
+        'scores': table,
+        'safePassCount': np.add.reduceat(scores >= safe_pass_threshold[unit_of], offsets),
+        'passCount': np.add.reduceat(scores >= pass_threshold[unit_of], offsets),
+    }
+
+
+def _segmented_sort_desc(scores, unit_of):
+    """모집단위별로 점수 내림차순 정렬 (모집단위 순서는 유지)"""
+    return scores[np.lexsort((-scores, unit_of))]
+
+
+def unit_rng(seed, row_id):
+    """(전역 시드, row_id)로 시드한 모집단위별 난수 생성기"""
+    row_key = int.from_bytes(hashlib.sha256(str(row_id).encode('utf-8')).digest()[:8], 'big')
+    return np.random.default_rng([seed, row_key])
+
+
+def simulate_batch(units, rng=np.random, bin_width=None, seed=None):
+    """
+    전체 모집단위를 한 번에 시뮬레이션
 
-    return freq_dist
+    모든 지원자 점수를 하나의 배열에 모집단위 순서대로 이어 붙여 처리한다.
+    (모집단위 i의 지원자는 offsets[i]부터 지원인원[i]명)
+
+    seed가 없으면 rng 하나로 전체 점수를 뽑는다. 같은 난수 상태에서 simulate_applicants를
+    모집단위 순서대로 호출한 것과 같은 점수가 나온다.
+    seed가 있으면 모집단위마다 unit_rng(seed, row_id)로 뽑으므로 어떤 행 묶음으로 나눠 실행해도 결과가 같다.
+
+    Returns:
+        result: {
+            'scores': 순위순 점수 (소수 둘째 자리 반올림), 'status': 합격상태 코드,
+            'rank': 모집단위 내 순위, 'stats': {이름: 모집단위별 배열},
+            'freq': {이름: 도수분포 구간별 배열}, 'freq_offsets': 모집단위별 첫 구간 위치,
+            'quantiles': score_quantiles 결과,
+        }
+    """
+    counts = units['지원인원']
+    offsets = units['offsets']
+    unit_of = np.repeat(np.arange(len(counts)), counts)
+
+    # 정규분포 점수 생성 후 모집단위별 범위로 자르기
+    if seed is None:
+        scores = rng.normal(units['평균'][unit_of], units['표준편차'][unit_of])
+    else:
+        scores = np.concatenate([
+            unit_rng(seed, row_id).normal(mean, std, count)
+            for row_id, mean, std, count in zip(units['row_ids'], units['평균'], units['표준편차'], counts)
+        ])
+    scores = np.clip(scores, units['최저점'][unit_of], units['최고점'][unit_of])
+    scores = _segmented_sort_desc(scores, unit_of)
+
+    # 특정 순위에 컷 점수 고정 (모집인원 순위 = 최초컷, 충원합격 마지막 = 추합컷)
+    모집인원 = units['모집인원']
+    합격자수 = units['합격자수']
+    pin_first = 모집인원 <= counts
+    scores[(offsets + 모집인원 - 1)[pin_first]] = units['최초컷'][pin_first]
+    pin_last = (합격자수 <= counts) & (합격자수 > 모집인원)
+    scores[(offsets + 합격자수 - 1)[pin_last]] = units['추합컷'][pin_last]
+    scores = np.round(_segmented_sort_desc(scores, unit_of), 2)
+
+    # 순위 기준 합격상태
+    rank = np.arange(len(scores)) - offsets[unit_of] + 1
+    status = pass_status_codes(rank, 모집인원[unit_of], 합격자수[unit_of], units['충원합격순위'][unit_of])
+
+    # 통계 (정렬되어 있으므로 최고/최저/기준점은 위치로 바로 찾는다)
+    # 평균/표준편차는 반올림 경계에서 legacy와 같은 값이 나오도록 np.mean/np.std(pairwise 합)를 구간별로 적용
+    segments = np.split(scores, offsets[1:])
+    last = offsets + counts - 1
+    stats = {
+        'mean': np.array([segment.mean() for segment in segments]),
+        'stdDev': np.array([segment.std() for segment in segments]),
+        'min': scores[last],
+        'max': scores[offsets],
+        'safePassThreshold': scores[offsets + np.minimum(모집인원, counts) - 1],
+        'passThreshold': scores[offsets + np.minimum(np.maximum(모집인원, 합격자수), counts) - 1],
+    }
+
+    # 도수분포: 내림차순이므로 같은 구간의 지원자는 연속해 있다
+    bin_lower = bin_lower_bounds(scores, bin_width)
+    starts = np.flatnonzero(np.concatenate(([True], (bin_lower[1:] != bin_lower[:-1]) | (unit_of[1:] != unit_of[:-1]))))
+    ends = np.append(starts[1:], len(scores))
+    bin_unit = unit_of[starts]
+    freq = {
+        'scoreLower': bin_lower[starts],
+        'applicantCount': ends - starts,
+        'cumulativeCount': ends - offsets[bin_unit],
+        'passStatus': np.minimum.reduceat(status, starts),
+    }
+
+    return {
+        'scores': scores,
+        'status': status,
+        'rank': rank,
+        'stats': stats,
+        'freq': freq,
+        'freq_offsets': np.searchsorted(bin_unit, np.arange(len(counts) + 1)),
+        'quantiles': score_quantiles(scores, offsets, counts, stats['safePassThreshold'], stats['passThreshold']),
+    }
 
 # ============================================
-# 메인 실행
+# 해석적 도수분포 (표본 추출 없이 기댓값 계산)
 # ============================================
-def main():
-    print('=' * 50)
-    print('모의지원 시뮬레이션 데이터 생성')
-    print('=' * 50)
+_STANDARD_NORMAL = NormalDist()
+_normal_cdf = np.vectorize(_STANDARD_NORMAL.cdf, otypes=[float])
+_normal_ppf = np.vectorize(_STANDARD_NORMAL.inv_cdf, otypes=[float])
 
-    # 1. 백엔드에서 컷 데이터 가져오기
-    print('\n1. 백엔드 입결 데이터 조회...')
-    cuts = fetch_admission_cuts()
 
-    # 2. 기본정보 시트 읽기
-    print('\n2. 기본정보 시트 읽기...')
-    xlsx = pd.ExcelFile(INPUT_FILE)
-    df_basic = pd.read_excel(xlsx, sheet_name='기본정보')
-    print(f'   - {len(df_basic)}개 모집단위 로드')
+def _normal_pdf(z):
+    return np.exp(-0.5 * z * z) / math.sqrt(2 * math.pi)
+
+
+def clipped_normal_cdf(x, mean, std, low, high):
+    """P(X < x), X = clip(N(mean, std²), low, high) (low/high에 잘린 확률이 몰림)"""
+    inside = _normal_cdf((x - mean) / std)
+    return np.where(x <= low, 0.0, np.where(x > high, 1.0, inside))
+
+
+def clipped_normal_quantile(u, mean, std, low, high):
+    """X = clip(N(mean, std²), low, high)의 u 분위수"""
+    return np.clip(mean + std * _normal_ppf(np.clip(u, 1e-12, 1 - 1e-12)), low, high)
 
-    # 3. 시뮬레이션 실행 및 JSON 구조 생성
-    print('\n3. 시뮬레이션 실행...')
 
+def clipped_normal_moments(mean, std, low, high):
+    """E[X], E[X²] (X = clip(N(mean, std²), low, high))"""
+    alpha = (low - mean) / std
+    beta = (high - mean) / std
+    cdf_a, cdf_b = _normal_cdf(alpha), _normal_cdf(beta)
+    pdf_a, pdf_b = _normal_pdf(alpha), _normal_pdf(beta)
+    inside = cdf_b - cdf_a
+    first = low * cdf_a + high * (1 - cdf_b) + mean * inside + std * (pdf_a - pdf_b)
+    second = (low ** 2 * cdf_a + high ** 2 * (1 - cdf_b) + (mean ** 2 + std ** 2) * inside
+              + 2 * mean * std * (pdf_a - pdf_b) + std ** 2 * (alpha * pdf_a - beta * pdf_b))
+    return first, second
+
+
+def analytic_batch(units, bin_width=None):
+    """
+    전체 모집단위의 기대 도수분포를 clip한 정규분포 CDF로 직접 계산 (지원자 점수를 뽑지 않음)
+
+    - 구간 [하한, 상한)의 기대 인원 = 지원인원 × (F(상한) - F(하한)), 경계는 점수를 소수 둘째 자리로
+      반올림한 뒤 나누는 표본 추출과 맞추기 위해 0.005 내린 값을 쓴다.
+    - 컷 고정은 순위 제약으로 표현: 순위 모집인원(합격자수)의 지원자, 즉 그 순위 분위수에 있던 1명을
+      최초컷(추합컷) 구간으로 옮긴다. 평균/표준편차도 같은 보정을 한다.
+      최고/최저점과 기준점은 표본 추출처럼 고정 후 다시 정렬했을 때 해당 순위에 오는 점수로 구한다.
+    - 누적 기대 인원을 정수로 반올림해 구간 인원을 정하고, 합격상태는 구간의 가장 높은 순위로 정한다.
+
+    비용은 모집단위당 구간 수에 비례하고 경쟁률(지원인원)과 무관하며, 결과는 항상 같다.
+
+    Returns:
+        simulate_batch와 같은 형식의 {'stats', 'quantiles', 'freq', 'freq_offsets'} (지원자 배열 없음)
+    """
+    bin_width = resolve_bin_width(bin_width)
+    counts = units['지원인원']
+    모집인원 = units['모집인원']
+    합격자수 = units['합격자수']
+    mean = units['평균']
+    std = np.maximum(units['표준편차'], 1e-9)
+    low, high = units['최저점'], units['최고점']
+    first_cut, last_cut = units['최초컷'], units['추합컷']
+    pin_first = 모집인원 <= counts
+    pin_last = (합격자수 <= counts) & (합격자수 > 모집인원)
+
+    def score_at(rank):
+        """컷 고정 전 순위 rank의 기대 점수 (내림차순 순위의 분위수)"""
+        return clipped_normal_quantile(1 - (rank - 0.5) / counts, mean, std, low, high)
+
+    # (고정 여부, 컷 점수, 원래 그 순위에 있던 점수)
+    pins = [
+        (pin_first, first_cut, score_at(모집인원)),
+        (pin_last, last_cut, score_at(합격자수)),
+    ]
+
+    # 모집단위별 구간: 최고 구간부터 내림차순으로 이어 붙임
+    top = bin_lower_bounds(np.round(np.maximum.reduce([high, first_cut, last_cut]), 2), bin_width)
+    bottom = bin_lower_bounds(np.round(np.minimum.reduce([low, first_cut, last_cut]), 2), bin_width)
+    bins = np.rint((top - bottom) / bin_width).astype(np.int64) + 1
+    bin_offsets = np.concatenate(([0], np.cumsum(bins)[:-1]))
+    bin_unit = np.repeat(np.arange(len(counts)), bins)
+    lower = top[bin_unit] - (np.arange(bins.sum()) - bin_offsets[bin_unit]) * bin_width
+
+    params = (mean[bin_unit], std[bin_unit], low[bin_unit], high[bin_unit])
+    expected = counts[bin_unit] * (
+        clipped_normal_cdf(lower + bin_width - 0.005, *params) - clipped_normal_cdf(lower - 0.005, *params)
+    )
+
+    def bin_of(score):
+        return bin_offsets + np.rint((top - bin_lower_bounds(np.round(score, 2), bin_width)) / bin_width).astype(np.int64)
+
+    for pinned, cut, moved in pins:
+        np.add.at(expected, bin_of(cut)[pinned], 1)
+        np.add.at(expected, bin_of(moved)[pinned], -1)
+
+    # 모집단위별 누적 기대 인원 -> 정수 (단조 증가, 마지막 구간은 지원인원)
+    running = np.cumsum(expected)
+    running -= np.concatenate(([0], running))[bin_offsets][bin_unit]
+    cumulative = np.clip(np.floor(running + 0.5), 0, counts[bin_unit]).astype(np.int64)
+    cumulative[bin_offsets + bins - 1] = counts
+    # 앞 모집단위 지원인원 합을 더하면 전체 배열 누적 최댓값이 모집단위별 누적 최댓값이 된다
+    unit_base = units['offsets'][bin_unit]
+    cumulative = np.maximum.accumulate(cumulative + unit_base) - unit_base
+    previous = np.concatenate(([0], cumulative[:-1]))
+    previous[bin_offsets] = 0
+    applicant_count = cumulative - previous
+
+    keep = applicant_count > 0
+    kept_unit = bin_unit[keep]
+    status = pass_status_codes(
+        previous[keep] + 1, 모집인원[kept_unit], 합격자수[kept_unit], units['충원합격순위'][kept_unit]
+    )
+
+    first, second = clipped_normal_moments(mean, std, low, high)
+    for pinned, cut, moved in pins:
+        first = first + np.where(pinned, (cut - moved) / counts, 0)
+        second = second + np.where(pinned, (cut ** 2 - moved ** 2) / counts, 0)
+
+    # 고정 후 재정렬한 순위 -> 점수: 원래 분위수 중 고정된 순위를 뺀 나머지와 컷 점수를 합쳐 내림차순
+    removed = np.sort(np.stack([
+        np.where(pin_first, 모집인원, counts + 1),
+        np.where(pin_last, 합격자수, counts + 1),
+    ]), axis=0)
+
+    def remaining_above(score):
+        """고정된 순위를 뺀 나머지 중 score보다 높은 기대 점수 수"""
+        above = np.clip(np.floor(counts * (1 - clipped_normal_cdf(score, mean, std, low, high)) + 0.5), 0, counts)
+        return above - (removed <= above).sum(axis=0)
+
+    cut_ranks = [
+        np.where(pin_first, 1 + remaining_above(first_cut) + (pin_last & (last_cut > first_cut)), 0),
+        np.where(pin_last, 1 + remaining_above(last_cut) + (pin_first & (first_cut >= last_cut)), 0),
+    ]
+
+    def pinned_score_at(rank):
+        # rank 앞에 있는 컷 수만큼 당겨서 나머지 분위수 중 순서를 구하고, 빠진 순위를 건너뛴다
+        order = rank - sum((cut_rank > 0) & (cut_rank < rank) for cut_rank in cut_ranks)
+        for removed_rank in removed:
+            order = order + (removed_rank <= order)
+        score = score_at(np.minimum(order, counts))
+        for cut_rank, (_, cut, _) in zip(cut_ranks, pins):
+            score = np.where(cut_rank == rank, cut, score)
+        return score
+
+    stats = {
+        'mean': first,
+        'stdDev': np.sqrt(np.maximum(second - first ** 2, 0)),
+        'min': pinned_score_at(counts),
+        'max': pinned_score_at(np.ones_like(counts)),
+        'safePassThreshold': pinned_score_at(np.minimum(모집인원, counts)),
+        'passThreshold': pinned_score_at(np.minimum(np.maximum(모집인원, 합격자수), counts)),
+    }
+
+    # 백분위 q -> 내림차순 순위 1 + (1 - q/100) x (지원인원 - 1)에 오는 점수
+    quantile_ranks = np.rint(1 + (1 - QUANTILE_LEVELS[:, None]) * (counts - 1)).astype(np.int64)
+    quantiles = {
+        'scores': np.round(np.stack([pinned_score_at(rank) for rank in quantile_ranks], axis=1), 2),
+        'safePassCount': np.minimum(모집인원, counts),
+        'passCount': np.minimum(np.maximum(모집인원, 합격자수), counts),
+    }
+
+    return {
+        'stats': stats,
+        'quantiles': quantiles,
+        'freq': {
+            'scoreLower': lower[keep],
+            'applicantCount': applicant_count[keep],
+            'cumulativeCount': cumulative[keep],
+            'passStatus': status,
+        },
+        'freq_offsets': np.searchsorted(kept_unit, np.arange(len(counts) + 1)),
+    }
+
+# ============================================
+# JSON 구조 생성
+# ============================================
+def basic_info_entry(row, mock_count, stats):
+    """기본정보 + 통계 (프론트 형식)"""
+    모집인원 = int(row['모집인원']) if pd.notna(row['모집인원']) else 0
+    경쟁률 = float(row['경쟁률']) if pd.notna(row['경쟁률']) else 0
+    충원합격순위 = int(row['충원합격순위']) if pd.notna(row['충원합격순위']) else 0
+    총합격자 = int(row['총합격자']) if pd.notna(row['총합격자']) else 모집인원
+
+    safe_pass_threshold = stats['safePassThreshold']
+    pass_threshold = stats['passThreshold']
+
+    return {
+        'universityCode': row['대학코드'],
+        'universityName': row['대학명'],
+        'admissionType': row['구분'],
+        'recruitmentUnit': row['모집단위'],
+        'recruitmentCount': 모집인원,
+        'competitionRate': round(경쟁률, 2),
+        'additionalPassRank': 충원합격순위,
+        'totalPassCount': 총합격자,
+        'mockApplicantCount': mock_count,
+        # 통계 정보 추가
+        'stats': {
+            'mean': round(stats['mean'], 2),
+            'stdDev': round(stats['stdDev'], 2),
+            'min': round(stats['min'], 2),
+            'max': round(stats['max'], 2),
+            'safePassThreshold': round(safe_pass_threshold, 2) if safe_pass_threshold else None,
+            'passThreshold': round(pass_threshold, 2) if pass_threshold else None,
+        }
+    }
+
+
+def quantile_entry(quantiles, i):
+    """score_quantiles 결과 중 모집단위 i의 항목 (프론트 형식)"""
+    return {
+        'scores': quantiles['scores'][i].tolist(),
+        'safePassCount': int(quantiles['safePassCount'][i]),
+        'passCount': int(quantiles['passCount'][i]),
+    }
+
+
+def new_json_data():
     # JSON 구조 (프론트엔드 형식에 맞춤)
     json_data = {
         'basicInfo': {},           # row_id -> 기본정보 + 통계
         'frequencyDistribution': {},  # row_id -> 도수분포 배열
+        'scoreQuantiles': {},      # row_id -> 백분위 점수표 + 기준점 이상 인원
     }
     if INCLUDE_APPLICANTS:
         json_data['applicants'] = {}  # row_id -> 지원자 배열 (옵션)
+    return json_data
+
+
+def collect_units(units):
+    """iter_legacy/iter_batch가 내는 모집단위를 JSON 구조 하나로 모으기"""
+    json_data = new_json_data()
+    for row_id, basic_info, freq_dist, quantiles, applicants in units:
+        json_data['basicInfo'][row_id] = basic_info
+        json_data['frequencyDistribution'][row_id] = freq_dist
+        json_data['scoreQuantiles'][row_id] = quantiles
+        if INCLUDE_APPLICANTS:
+            json_data['applicants'][row_id] = applicants
+    return json_data
+
+
+def run_legacy(df_basic, cuts, bin_width=None):
+    """모집단위별 simulate_applicants 호출"""
+    return collect_units(iter_legacy(df_basic, cuts, bin_width))
+
+
+def iter_legacy(df_basic, cuts, bin_width=None):
+    """
+    모집단위별 (row_id, 기본정보, 도수분포, 백분위 점수표, 지원자 목록) 생성
 
+    지원자 목록은 INCLUDE_APPLICANTS일 때만 만들고 아니면 None
+    """
     for idx, row in df_basic.iterrows():
         row_id = str(row['row_id'])
-        applicants, freq_dist = simulate_applicants(row, cuts)
+        applicants, freq_dist = simulate_applicants(row, cuts, bin_width)
 
         if not applicants:
             continue
 
-        # 기본정보
-        모집인원 = int(row['모집인원']) if pd.notna(row['모집인원']) else 0
-        경쟁률 = float(row['경쟁률']) if pd.notna(row['경쟁률']) else 0
-        충원합격순위 = int(row['충원합격순위']) if pd.notna(row['충원합격순위']) else 0
-        총합격자 = int(row['총합격자']) if pd.notna(row['총합격자']) else 모집인원
-
         # 통계 계산 (히스토그램용)
         scores = [a['점수'] for a in applicants]
-        mean_score = np.mean(scores) if scores else 0
-        std_score = np.std(scores) if scores else 0
-        min_score = min(scores) if scores else 0
-        max_score = max(scores) if scores else 0
 
         # 합격 기준점 계산
         safe_pass_scores = [a['점수'] for a in applicants if a['합격상태'] == '안정합격']
         pass_scores = [a['점수'] for a in applicants if a['합격상태'] in ['안정합격', '추가합격', '합격가능']]
-        safe_pass_threshold = min(safe_pass_scores) if safe_pass_scores else None
-        pass_threshold = min(pass_scores) if pass_scores else None
-
-        json_data['basicInfo'][row_id] = {
-            'universityCode': row['대학코드'],
-            'universityName': row['대학명'],
-            'admissionType': row['구분'],
-            'recruitmentUnit': row['모집단위'],
-            'recruitmentCount': 모집인원,
-            'competitionRate': round(경쟁률, 2),
-            'additionalPassRank': 충원합격순위,
-            'totalPassCount': 총합격자,
-            'mockApplicantCount': len(applicants),
-            # 통계 정보 추가
-            'stats': {
-                'mean': round(mean_score, 2),
-                'stdDev': round(std_score, 2),
-                'min': round(min_score, 2),
-                'max': round(max_score, 2),
-                'safePassThreshold': round(safe_pass_threshold, 2) if safe_pass_threshold else None,
-                'passThreshold': round(pass_threshold, 2) if pass_threshold else None,
-            }
-        }
+
+        basic_info = basic_info_entry(row, len(applicants), {
+            'mean': np.mean(scores) if scores else 0,
+            'stdDev': np.std(scores) if scores else 0,
+            'min': min(scores) if scores else 0,
+            'max': max(scores) if scores else 0,
+            'safePassThreshold': min(safe_pass_scores) if safe_pass_scores else None,
+            'passThreshold': min(pass_scores) if pass_scores else None,
+        })
+
+        # 백분위 점수표 (지원자 목록은 순위순 = 내림차순, 기준점이 없으면 최저점 기준)
+        quantiles = quantile_entry(score_quantiles(
+            np.array(scores), np.array([0]), np.array([len(scores)]),
+            np.array([min(safe_pass_scores or scores)]), np.array([min(pass_scores or scores)]),
+        ), 0)
 
         # 도수분포표 (프론트 형식)
-        json_data['frequencyDistribution'][row_id] = [
+        freq_items = [
             {
                 'scoreLower': f['점수하한'],
                 'scoreUpper': f['점수상한'],
@@ -329,60 +740,694 @@ def main():
         ]
 
         # 지원자 목록 (프론트 형식) - 옵션
+        applicant_items = None
         if INCLUDE_APPLICANTS:
-            json_data['applicants'][row_id] = [
+            applicant_items = [
                 {
                     'rank': a['순위'],
                     'score': a['점수'],
-                    'passStatus': a['합격상태']
+                    'passStatus': a['합격상태'],
+                    'note': a['비고']
                 }
                 for a in applicants
             ]
 
+        yield row_id, basic_info, freq_items, quantiles, applicant_items
+
         if (idx + 1) % 500 == 0:
             print(f'   - {idx + 1}/{len(df_basic)} 완료')
 
-    print(f'   - 총 {len(json_data["basicInfo"])}개 모집단위 생성')
 
-    # 4. JSON 파일 저장
-    print('\n4. JSON 파일 저장...')
+def run_batch(df_basic, cuts, rng=np.random, bin_width=None, seed=None):
+    """simulate_batch 결과를 모집단위별 JSON 구조로 변환 (지원자 레코드는 INCLUDE_APPLICANTS일 때만 생성)"""
+    return collect_units(iter_batch(df_basic, cuts, rng, bin_width, seed))
+
+
+def frequency_items(freq, start, end, bin_width):
+    """simulate_batch/analytic_batch의 구간 배열(.tolist()) 중 [start, end)를 도수분포 항목으로"""
+    return [
+        {
+            'scoreLower': freq['scoreLower'][b],
+            'scoreUpper': freq['scoreLower'][b] + bin_width,
+            'applicantCount': freq['applicantCount'][b],
+            'cumulativeCount': freq['cumulativeCount'][b],
+            'passStatus': PASS_STATUSES[freq['passStatus'][b]]
+        }
+        for b in range(start, end)
+    ]
+
+
+def iter_batch(df_basic, cuts, rng=np.random, bin_width=None, seed=None):
+    """simulate_batch 결과를 모집단위별 (row_id, 기본정보, 도수분포, 백분위 점수표, 지원자 목록)으로 하나씩 생성"""
+    units = prepare_units(df_basic, cuts)
+    if not len(units['rows']):
+        return
+
+    bin_width = resolve_bin_width(bin_width)
+    result = simulate_batch(units, rng, bin_width, seed)
+
+    records = df_basic.to_dict('records')
+    offsets = units['offsets'].tolist()
+    counts = units['지원인원'].tolist()
+    freq_offsets = result['freq_offsets'].tolist()
+    # 통계는 legacy와 같은 반올림(np.round)이 되도록 np.float64 그대로 전달
+    stats = result['stats']
+    freq = {name: values.tolist() for name, values in result['freq'].items()}
+    모집인원 = units['모집인원'].tolist()
+    합격자수 = units['합격자수'].tolist()
+
+    for i, pos in enumerate(units['rows'].tolist()):
+        row = records[pos]
+        row_id = str(row['row_id'])
+
+        basic_info = basic_info_entry(
+            row, counts[i], {name: values[i] for name, values in stats.items()}
+        )
+
+        freq_items = frequency_items(freq, freq_offsets[i], freq_offsets[i + 1], bin_width)
+
+        applicant_items = None
+        if INCLUDE_APPLICANTS:
+            segment = slice(offsets[i], offsets[i] + counts[i])
+            # 비고: simulate_applicants와 같이 모집인원 순위 50%컷, 합격자수 순위 70%컷
+            notes = {모집인원[i]: '50%컷'}
+            notes.setdefault(합격자수[i], '70%컷')
+            applicant_items = [
+                {
+                    'rank': rank,
+                    'score': score,
+                    'passStatus': PASS_STATUSES[status],
+                    'note': notes.get(rank)
+                }
+                for rank, score, status in zip(
+                    result['rank'][segment].tolist(),
+                    result['scores'][segment].tolist(),
+                    result['status'][segment].tolist(),
+                )
+            ]
+
+        yield row_id, basic_info, freq_items, quantile_entry(result['quantiles'], i), applicant_items
+
+
+def iter_batch_chunked(df_basic, cuts, bin_width=None, seed=SEED, chunk_size=STREAM_CHUNK_UNITS):
+    """
+    기본정보를 chunk_size행씩 나눠 iter_batch 실행 (배열 연산 메모리를 청크 크기로 제한)
+
+    모집단위별 시드를 쓰므로 전체를 한 번에 계산한 것과 같은 결과가 나온다.
+    """
+    for start in range(0, len(df_basic), chunk_size):
+        yield from iter_batch(df_basic.iloc[start:start + chunk_size], cuts, bin_width=bin_width, seed=seed)
+
 
-    # NaN 값을 None으로 변환하는 함수
-    def convert_nan_to_none(obj):
-        if isinstance(obj, dict):
-            return {k: convert_nan_to_none(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_nan_to_none(item) for item in obj]
-        elif isinstance(obj, float) and (np.isnan(obj) or np.isinf(obj)):
-            return None
-        return obj
+def run_analytic(df_basic, cuts, bin_width=None):
+    """analytic_batch 결과를 모집단위별 JSON 구조로 변환 (지원자 목록 없음)"""
+    return collect_units(iter_analytic(df_basic, cuts, bin_width))
 
-    json_data_clean = convert_nan_to_none(json_data)
 
-    with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
-        json.dump(json_data_clean, f, ensure_ascii=False, indent=2)
-    print(f'   ✅ {OUTPUT_JSON}')
+def iter_analytic(df_basic, cuts, bin_width=None):
+    """analytic_batch 결과를 모집단위별 (row_id, 기본정보, 도수분포, 백분위 점수표, None)으로 하나씩 생성"""
+    units = prepare_units(df_basic, cuts)
+    if not len(units['rows']):
+        return
+
+    bin_width = resolve_bin_width(bin_width)
+    result = analytic_batch(units, bin_width)
+
+    records = df_basic.to_dict('records')
+    counts = units['지원인원'].tolist()
+    freq_offsets = result['freq_offsets'].tolist()
+    freq = {name: values.tolist() for name, values in result['freq'].items()}
+
+    for i, pos in enumerate(units['rows'].tolist()):
+        row = records[pos]
+        basic_info = basic_info_entry(row, counts[i], {name: values[i] for name, values in result['stats'].items()})
+        freq_items = frequency_items(freq, freq_offsets[i], freq_offsets[i + 1], bin_width)
+        yield str(row['row_id']), basic_info, freq_items, quantile_entry(result['quantiles'], i), None
+
+
+def open_excel_full(df_basic, include_applicants=False, path=OUTPUT_EXCEL):
+    """--excel-full용 write-only 엑셀 (기본정보 시트는 바로 기록, 도수분포/지원자목록은 export_unit_excel로 추가)"""
+    sheets = {
+        'basic': ('기본정보', list(df_basic.columns)),
+        'freq': ('도수분포', EXCEL_FREQUENCY_COLUMNS),
+    }
+    if include_applicants:
+        sheets['applicants'] = ('지원자목록', EXCEL_APPLICANT_COLUMNS)
+    excel = ExcelStreamWriter(path, sheets)
+    for row in df_basic.itertuples(index=False):
+        excel.append('basic', list(row))
+    return excel
+
+
+def _excel_row_id(row_id):
+    """엑셀 row_id 셀 값 (정수 문자열이면 기본정보 시트처럼 숫자로, 아니면 키 그대로)"""
+    try:
+        return int(row_id)
+    except ValueError:
+        return row_id
+
+
+def export_unit_excel(excel, row_id, freq_dist, applicants=None):
+    """모집단위 하나의 도수분포(와 지원자 목록) 행을 엑셀에 추가"""
+    row_id = _excel_row_id(row_id)
+    for f in freq_dist:
+        excel.append('freq', [
+            row_id, f['scoreLower'], f['scoreUpper'], f['applicantCount'], f['cumulativeCount'], f['passStatus'],
+        ])
+    if 'applicants' in excel.sheets:
+        for a in applicants or []:
+            excel.append('applicants', [row_id, a['rank'], a['score'], a['passStatus'], a['note']])
+
+
+def write_stream(units, path=OUTPUT_JSON, excel=None):
+    """
+    모집단위를 만드는 대로 path에 기록 (NaN/Inf는 기록 시점에 None으로 정리)
+
+    지원자 목록은 기록 후 바로 버리고, 이후 단계에 필요한 나머지 섹션만 모아 반환한다.
+    excel(open_excel_full)을 주면 같은 모집단위의 도수분포/지원자 행도 바로 추가한다.
+    """
+    sections = list(new_json_data())
+    json_data = {section: {} for section in sections if section != 'applicants'}
+    with MockDataStreamWriter(path, sections) as writer:
+        for row_id, basic_info, freq_dist, quantiles, applicants in units:
+            values = {'basicInfo': basic_info, 'frequencyDistribution': freq_dist, 'scoreQuantiles': quantiles}
+            if INCLUDE_APPLICANTS:
+                values['applicants'] = applicants
+            clean = writer.write(row_id, values)
+            for section in json_data:
+                json_data[section][row_id] = clean[section]
+            if excel is not None:
+                export_unit_excel(excel, row_id, clean['frequencyDistribution'], clean.get('applicants'))
+    return json_data
+
+
+# ============================================
+# 병렬 실행 (기본정보 행 샤딩)
+# ============================================
+_worker_cuts = None
+
+
+def _init_worker(cuts):
+    """워커 프로세스마다 컷 데이터를 한 번만 전달받아 보관"""
+    global _worker_cuts
+    _worker_cuts = cuts
+
+
+def _simulate_shard(shard_index, df_shard, bin_width, seed):
+    started = time.perf_counter()
+    json_data = run_batch(df_shard, _worker_cuts, bin_width=bin_width, seed=seed)
+    return shard_index, json_data, time.perf_counter() - started, os.getpid()
+
+
+def run_parallel(df_basic, cuts, workers, bin_width=None, seed=SEED):
+    """
+    기본정보 행을 연속 구간 샤드로 나눠 프로세스 풀에서 run_batch 실행 후 행 순서대로 병합
+
+    모집단위별 시드를 쓰므로 결과는 workers=1로 실행한 것과 같다.
+    """
+    shard_count = max(min(len(df_basic), workers * SHARDS_PER_WORKER), 1)
+    bounds = np.linspace(0, len(df_basic), shard_count + 1).astype(int)
+    shards = [df_basic.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    results = [None] * shard_count
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cuts,)) as pool:
+        futures = [
+            pool.submit(_simulate_shard, shard_index, shard, bin_width, seed)
+            for shard_index, shard in enumerate(shards)
+        ]
+        for future in as_completed(futures):
+            shard_index, shard_data, elapsed, pid = future.result()
+            results[shard_index] = (shard_data, elapsed, pid)
+
+    json_data = new_json_data()
+    print(f'   - 샤드별 실행 시간 (워커 {workers}개, 샤드 {shard_count}개)')
+    for shard_index, (shard_data, elapsed, pid) in enumerate(results):
+        for section, units in shard_data.items():
+            json_data[section].update(units)
+        applicant_count = sum(info['mockApplicantCount'] for info in shard_data['basicInfo'].values())
+        print(f'     · 샤드 {shard_index + 1}/{shard_count} [행 {bounds[shard_index]}-{bounds[shard_index + 1] - 1}] '
+              f'{len(shard_data["basicInfo"])}개 모집단위, 지원자 {applicant_count:,}명: {elapsed:.2f}s (pid {pid})')
+
+    return json_data
+
+
+# ============================================
+# 증분 실행 (입력이 바뀐 모집단위만 다시 계산)
+# ============================================
+def _fingerprint_value(value):
+    """지문용 값 정규화 (NaN -> None, 숫자는 float로 맞춰 3과 3.0을 같은 값으로 취급)"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return float(value)
+    return str(value)
+
+
+def input_fingerprints(df, cuts, seed, bin_width=None):
+    """
+    row_id별 입력 지문
+
+    기본정보 행 값, 해당 모집단위의 minCut/maxCut/totalScore, 시드와 출력 설정(구간 폭,
+    지원자 목록 포함 여부, SIMULATION_VERSION)을 해시한다. 배치 엔진은 모집단위별 시드를 쓰므로
+    지문이 같으면 다시 계산해도 같은 결과가 나온다.
+    """
+    settings = [SIMULATION_VERSION, seed, resolve_bin_width(bin_width), INCLUDE_APPLICANTS]
+    fingerprints = {}
+    for row in df.to_dict('records'):
+        cut_data = cuts.get((row['대학명'], row['모집단위']), {})
+        payload = [
+            settings,
+            [_fingerprint_value(row[col]) for col in BASIC_COLUMNS],
+            [cut_data.get(key) for key in ('minCut', 'maxCut', 'totalScore')],
+        ]
+        encoded = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        fingerprints[str(row['row_id'])] = hashlib.sha1(encoded).hexdigest()
+    return fingerprints
+
+
+def file_sha256(path):
+    """파일 내용 sha256 (매니페스트를 만든 뒤 출력 파일이 바뀌었는지 확인)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """이전 실행의 매니페스트 {'output', 'outputSha256', 'rows': {row_id: 지문}} (없으면 빈 dict)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(fingerprints, path=MANIFEST_FILE, output=OUTPUT_JSON):
+    """지문과 함께 방금 저장한 output의 sha256을 기록"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'output': output,
+            'outputSha256': file_sha256(output),
+            'updatedAt': datetime.now().isoformat(timespec='seconds'),
+            'rows': fingerprints,
+        }, f, ensure_ascii=False)
+
+
+def run_incremental(df_basic, fingerprints, simulate):
+    """
+    지문이 바뀐 행만 simulate(df)로 다시 계산하고 나머지는 기존 OUTPUT_JSON에서 가져와 행 순서대로 병합
+
+    매니페스트나 기존 결과가 없거나, 매니페스트 저장 후 OUTPUT_JSON이 바뀌었으면
+    (convert-excel-to-json.py가 같은 파일을 덮어쓴 경우 등) 전체를 계산한다.
+    지문이 같아도 기존 결과에 없는 행은 다시 계산한다 (지원자가 없어 건너뛴 행도 매번 다시 확인).
+    """
+    manifest = load_manifest()
+    previous = manifest.get('rows', {})
+    if not previous or not os.path.exists(OUTPUT_JSON):
+        print('   - 이전 매니페스트/결과가 없어 전체 모집단위 계산')
+        return simulate(df_basic)
+    if manifest.get('output') != OUTPUT_JSON or manifest.get('outputSha256') != file_sha256(OUTPUT_JSON):
+        print(f'   - {OUTPUT_JSON}이 매니페스트 저장 이후 바뀌어 전체 모집단위 계산')
+        return simulate(df_basic)
+
+    with open(OUTPUT_JSON, encoding='utf-8') as f:
+        existing = json.load(f)
+
+    row_ids = [str(row_id) for row_id in df_basic['row_id'].tolist()]
+    missing = np.array([row_id not in existing.get('basicInfo', {}) for row_id in row_ids], dtype=bool)
+    changed = missing | np.array([fingerprints[row_id] != previous.get(row_id) for row_id in row_ids], dtype=bool)
+    recomputed = simulate(df_basic[changed]) if changed.any() else new_json_data()
+
+    json_data = new_json_data()
+    for row_id, is_changed in zip(row_ids, changed.tolist()):
+        source = recomputed if is_changed else existing
+        for section, units in json_data.items():
+            if row_id in source.get(section, {}):
+                units[row_id] = source[section][row_id]
+
+    removed = len(previous.keys() - set(row_ids))
+    print(f'   - 재사용 {int((~changed).sum())}개, 재계산 {int(changed.sum())}개 '
+          f'(기존 결과에 없던 {int(missing.sum())}개 포함), 삭제 {removed}개 행')
+    return json_data
+
+
+def engine_mismatches(df_basic, cuts, bin_width=None, seed=SEED):
+    """
+    같은 전역 시드로 legacy/batch 엔진을 실행해 모집단위별 JSON 결과 비교
+
+    Returns:
+        (legacy 결과, 불일치 [(섹션, row_id)])
+    """
+    results = {}
+    for name, run in (('legacy', run_legacy), ('batch', run_batch)):
+        np.random.seed(seed)
+        started = time.perf_counter()
+        results[name] = convert_nan_to_none(run(df_basic, cuts, bin_width=bin_width))
+        print(f'   - {name}: {time.perf_counter() - started:.2f}s')
+
+    mismatches = []
+    for section, legacy_units in results['legacy'].items():
+        batch_units = results['batch'][section]
+        for row_id in legacy_units.keys() | batch_units.keys():
+            if json.dumps(legacy_units.get(row_id)) != json.dumps(batch_units.get(row_id)):
+                mismatches.append((section, row_id))
+    return results['legacy'], mismatches
+
+
+def verify_engines(df_basic, cuts, bin_width=None, seed=SEED):
+    """engine_mismatches 결과 출력, 불일치가 있으면 종료 코드 1"""
+    legacy, mismatches = engine_mismatches(df_basic, cuts, bin_width, seed)
+    for section, row_id in mismatches[:5]:
+        print(f'   ❌ {section}[{row_id}] 불일치')
+
+    if mismatches:
+        print(f'   ❌ 불일치 {len(mismatches)}건')
+        sys.exit(1)
+    print(f'   ✅ {len(legacy["basicInfo"])}개 모집단위 결과 일치')
+
+
+def simulate_pass_thresholds(units, replicates=PASS_REPLICATES, seed=SEED):
+    """
+    모집단위마다 시뮬레이션을 replicates번 반복해 기준점 분포 생성
+
+    모집단위 하나의 반복 전체를 (반복, 지원자) 배열 하나로 뽑아 행별로 정렬/컷 고정한다.
+    기준점은 batch 결과의 safePassThreshold(모집인원 순위 점수)/passThreshold(합격자수 순위 점수)와 같고,
+    첫 번째 반복은 같은 시드의 batch 결과와 같다.
+
+    Returns:
+        {'safe': (모집단위 수, replicates) 배열, 'pass': 같은 형식}
+    """
+    thresholds = {kind: np.empty((len(units['rows']), replicates)) for kind in ('safe', 'pass')}
+    params = zip(
+        units['row_ids'], units['평균'], units['표준편차'], units['최저점'], units['최고점'],
+        units['지원인원'].tolist(), units['모집인원'].tolist(), units['합격자수'].tolist(),
+        units['최초컷'], units['추합컷'],
+    )
+    for i, (row_id, mean, std, low, high, count, 모집인원, 합격자수, 최초컷, 추합컷) in enumerate(params):
+        scores = np.clip(unit_rng(seed, row_id).normal(mean, std, (replicates, count)), low, high)
+        scores = -np.sort(-scores, axis=1)
+        if 모집인원 <= count:
+            scores[:, 모집인원 - 1] = 최초컷
+        if 모집인원 < 합격자수 <= count:
+            scores[:, 합격자수 - 1] = 추합컷
+        scores = -np.sort(-scores, axis=1)
+        # 반올림은 순서를 바꾸지 않으므로 기준점 열만 반올림
+        thresholds['safe'][i] = np.round(scores[:, min(모집인원, count) - 1], 2)
+        thresholds['pass'][i] = np.round(scores[:, min(max(모집인원, 합격자수), count) - 1], 2)
+    return thresholds
+
+
+def write_pass_probability(df_basic, cuts, replicates=PASS_REPLICATES, seed=SEED, path=PASS_PROBABILITY_FILE):
+    """반복 시뮬레이션 -> 점수별 합격 확률 곡선 저장 + 전체 모집단위 평가 지연 시간 측정"""
+    started = time.perf_counter()
+    units = prepare_units(df_basic, cuts)
+    thresholds = simulate_pass_thresholds(units, replicates, seed)
+    curves = build_curves(units['row_ids'], thresholds)
+    size = save_curves(curves, replicates, seed, path)
+    applicant_count = int(units['지원인원'].sum())
+    print(f'   ✅ {path} ({len(curves["rowIds"]):,}개 모집단위 x {replicates}회, '
+          f'지원자 {applicant_count * replicates:,}명 시뮬레이션, {size / 1024:,.1f}KB, '
+          f'{time.perf_counter() - started:.2f}s)')
+
+    if not len(curves['rowIds']):
+        return
+    index = PassProbabilityIndex(curves)
+    scores = np.random.default_rng(seed).uniform(index.base, index.base + index.span, 200)
+    print_benchmark(benchmark(index, scores), index.unit_count)
+
+
+def _unit_histograms(result, unit_count):
+    """모집단위별 {구간 하한: 인원}"""
+    freq_offsets = result['freq_offsets'].tolist()
+    lower = result['freq']['scoreLower'].tolist()
+    count = result['freq']['applicantCount'].tolist()
+    return [
+        dict(zip(lower[freq_offsets[i]:freq_offsets[i + 1]], count[freq_offsets[i]:freq_offsets[i + 1]]))
+        for i in range(unit_count)
+    ]
+
+
+def _total_variation(histograms_a, histograms_b, totals):
+    """모집단위별 도수분포 총변동거리 (0: 같음, 1: 겹치는 구간 없음)"""
+    return np.array([
+        0.5 * sum(abs(a.get(key, 0) - b.get(key, 0)) for key in a.keys() | b.keys()) / total
+        for a, b, total in zip(histograms_a, histograms_b, totals)
+    ])
+
+
+def compare_analytic(df_basic, cuts, bin_width=None, seed=SEED, worst=5):
+    """
+    analytic과 표본 추출(batch) 결과 비교
+
+    모집단위별 도수분포 총변동거리(TVD)와 통계 차이를 출력한다. 시드만 다른 batch 두 번의 TVD를
+    표본 잡음 기준선으로 함께 보여준다.
+    """
+    units = prepare_units(df_basic, cuts)
+    if not len(units['rows']):
+        print('   - 비교할 모집단위가 없습니다')
+        return
+    bin_width = resolve_bin_width(bin_width)
+    unit_count = len(units['rows'])
+    totals = units['지원인원'].tolist()
+
+    runs = [
+        ('batch', lambda: simulate_batch(units, bin_width=bin_width, seed=seed)),
+        ('batch (시드+1)', lambda: simulate_batch(units, bin_width=bin_width, seed=seed + 1)),
+        ('analytic', lambda: analytic_batch(units, bin_width)),
+    ]
+    results = {}
+    for name, run in runs:
+        started = time.perf_counter()
+        results[name] = run()
+        print(f'   - {name}: {time.perf_counter() - started:.2f}s')
+
+    histograms = {name: _unit_histograms(result, unit_count) for name, result in results.items()}
+    tvd = _total_variation(histograms['analytic'], histograms['batch'], totals)
+    noise = _total_variation(histograms['batch (시드+1)'], histograms['batch'], totals)
+
+    def describe(values):
+        return f'중앙값 {np.median(values):.4f}, 95% {np.percentile(values, 95):.4f}, 최대 {values.max():.4f}'
+
+    print(f'   - 도수분포 TVD analytic vs batch: {describe(tvd)}')
+    print(f'   - 도수분포 TVD batch vs batch(시드+1) (표본 잡음): {describe(noise)}')
+    for name in ('mean', 'stdDev', 'safePassThreshold', 'passThreshold'):
+        diff = np.abs(results['analytic']['stats'][name] - results['batch']['stats'][name])
+        noise_diff = np.abs(results['batch (시드+1)']['stats'][name] - results['batch']['stats'][name])
+        print(f'   - {name} 차이(절댓값): {describe(diff)} (표본 잡음 중앙값 {np.median(noise_diff):.4f})')
+
+    row_ids = units['row_ids']
+    print(f'   - TVD가 큰 모집단위 {min(worst, unit_count)}개')
+    for i in np.argsort(-tvd)[:worst]:
+        print(f'     · row_id {row_ids[i]}: TVD {tvd[i]:.4f} (표본 잡음 {noise[i]:.4f}), 지원인원 {totals[i]:,}명')
+
+
+# ============================================
+# 메인 실행
+# ============================================
+def parse_args():
+    parser = argparse.ArgumentParser(description='모의지원 시뮬레이션 데이터 생성')
+    parser.add_argument('--engine', choices=['batch', 'legacy', 'analytic'], default='batch',
+                        help='batch: 전체 모집단위 배열 연산, legacy: 모집단위별 simulate_applicants, '
+                             'analytic: 표본 추출 없이 기대 도수분포 계산 (지원자 목록 없음)')
+    parser.add_argument('--verify', action='store_true',
+                        help='같은 시드로 두 엔진 결과를 비교하고 종료 (파일 저장 안 함)')
+    parser.add_argument('--compare-analytic', action='store_true',
+                        help='analytic 엔진과 표본 추출(batch) 결과를 비교하고 종료 (파일 저장 안 함)')
+    parser.add_argument('--bin-width', type=float, default=BIN_WIDTH,
+                        help=f'도수분포 구간 폭 (기본 {BIN_WIDTH}점)')
+    parser.add_argument('--seed', type=int, default=SEED,
+                        help=f'난수 시드 (기본 {SEED}, 배치 엔진은 모집단위마다 (시드, row_id)로 시드)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='배치 엔진 병렬 프로세스 수 (기본 1, 결과는 워커 수와 관계없이 동일)')
+    parser.add_argument('--cut-source', choices=['api', 'db'], default='api',
+                        help='입결 조회 경로 (api: 백엔드 /explore/regular, db: js_admission 직접 조회)')
+    parser.add_argument('--offline', action='store_true',
+                        help=f'백엔드에 요청하지 않고 {CACHE_DIR}의 입결 응답 캐시만 사용')
+    parser.add_argument('--cache-ttl', type=int, default=CACHE_TTL,
+                        help=f'입결 응답 캐시 유효 시간 (초, 기본 {CACHE_TTL}, 지나면 ETag로 재검증, 0이면 항상 재검증)')
+    parser.add_argument('--shard-by', choices=SHARD_MODES,
+                        help=f'{SHARD_DIR}/에 모집단위(row) 또는 대학코드(university)별 압축 JSON + index.json 추가 저장')
+    parser.add_argument('--columnar', action='store_true',
+                        help=f'도수분포를 모집단위별 병렬 배열 형식으로 {COLUMNAR_FREQUENCY_FILE}(+ .gz/.br)에 추가 저장')
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'{MANIFEST_FILE}와 입력 지문이 다른 행만 다시 계산해 기존 JSON에 반영 (batch 엔진)')
+    parser.add_argument('--pass-probability', action='store_true',
+                        help=f'모집단위마다 --replicates번 반복 시뮬레이션해 점수 -> 합격 확률 곡선을 {PASS_PROBABILITY_FILE}에 저장')
+    parser.add_argument('--replicates', type=int, default=PASS_REPLICATES,
+                        help=f'--pass-probability 반복 횟수 (기본 {PASS_REPLICATES})')
+    parser.add_argument('--load-db', action='store_true',
+                        help='기본정보/통계/도수분포를 PostgreSQL mock_application_* 테이블에 COPY로 적재하고 한 번에 교체')
+    parser.add_argument('--excel-full', action='store_true',
+                        help='엑셀에 처음 100개 샘플 대신 전체 모집단위 도수분포를 기록 (write-only, 시트 행 한도를 넘으면 이어짐 시트)')
+    parser.add_argument('--excel-applicants', action='store_true',
+                        help='--excel-full 엑셀에 지원자목록 시트도 기록 (INCLUDE_APPLICANTS=True 필요)')
+    parser.add_argument('--stream', action='store_true',
+                        help=f'모집단위를 만드는 대로 {OUTPUT_JSON}에 기록 (지원자 목록은 한 모집단위씩만 메모리에 유지)')
+    return parser.parse_args()
+
+
+def main():
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    args = parse_args()
+    if (args.workers > 1 or args.incremental) and args.engine != 'batch':
+        print('--workers/--incremental은 batch 엔진에서만 사용할 수 있습니다')
+        sys.exit(1)
+    if args.engine == 'analytic' and INCLUDE_APPLICANTS:
+        print('analytic 엔진은 지원자 목록을 만들지 않으므로 INCLUDE_APPLICANTS=False에서만 사용할 수 있습니다')
+        sys.exit(1)
+    if args.stream and (args.workers > 1 or args.incremental):
+        print('--stream은 --workers/--incremental과 함께 사용할 수 없습니다')
+        sys.exit(1)
+    if args.stream and args.shard_by and INCLUDE_APPLICANTS:
+        # 샤드는 지원자 목록까지 메모리에 모아야 하므로 스트리밍과 맞지 않음
+        print('INCLUDE_APPLICANTS일 때 --stream은 --shard-by와 함께 사용할 수 없습니다')
+        sys.exit(1)
+
+    if args.excel_applicants and not (args.excel_full and INCLUDE_APPLICANTS):
+        print('--excel-applicants는 --excel-full과 함께, INCLUDE_APPLICANTS=True에서만 사용할 수 있습니다')
+        sys.exit(1)
+
+    print('=' * 50)
+    print('모의지원 시뮬레이션 데이터 생성')
+    print('=' * 50)
+
+    # 1. 기본정보 시트 읽기
+    print('\n1. 기본정보 시트 읽기...')
+    df_basic = read_sheet(INPUT_FILE, '기본정보', columns=BASIC_COLUMNS)
+    print(f'   - {len(df_basic)}개 모집단위 로드')
+
+    # 2. 컷 데이터 가져오기 (db는 기본정보에 있는 모집단위만 조회)
+    if args.cut_source == 'db':
+        print('\n2. DB 입결 데이터 조회...')
+        cuts = fetch_admission_cuts_db(zip(df_basic['대학명'].tolist(), df_basic['모집단위'].tolist()))
+    else:
+        print(f'\n2. 백엔드 입결 데이터 조회{" (오프라인 캐시)" if args.offline else ""}...')
+        cuts = fetch_admission_cuts(API_BASE_URL, offline=args.offline, ttl=args.cache_ttl)
+
+    if args.verify:
+        print('\n3. 엔진 결과 비교...')
+        verify_engines(df_basic, cuts, args.bin_width, args.seed)
+        return
+
+    if args.compare_analytic:
+        print('\n3. analytic / 표본 추출 결과 비교...')
+        compare_analytic(df_basic, cuts, args.bin_width, args.seed)
+        return
+
+    # 3. 시뮬레이션 실행 및 JSON 구조 생성
+    print(f'\n3. 시뮬레이션 실행 ({args.engine}, 시드 {args.seed}, 도수분포 {args.bin_width:g}점 간격)...')
+    started = time.perf_counter()
+
+    def simulate(df):
+        if args.workers > 1:
+            return run_parallel(df, cuts, args.workers, args.bin_width, args.seed)
+        return run_batch(df, cuts, bin_width=args.bin_width, seed=args.seed)
+
+    fingerprints = None
+    if args.engine == 'legacy':
+        np.random.seed(args.seed)
+    elif args.engine == 'batch':
+        fingerprints = input_fingerprints(df_basic, cuts, args.seed, args.bin_width)
+
+    excel = None
+    if args.stream:
+        # 시뮬레이션하면서 바로 저장 (반환값에는 지원자 목록이 없고 NaN/Inf는 정리되어 있음)
+        if args.excel_full:
+            excel_rss, excel_started = peak_rss(), time.perf_counter()
+            excel = open_excel_full(df_basic, args.excel_applicants)
+        if args.engine == 'legacy':
+            units = iter_legacy(df_basic, cuts, args.bin_width)
+        elif args.engine == 'analytic':
+            units = iter_analytic(df_basic, cuts, args.bin_width)
+        else:
+            units = iter_batch_chunked(df_basic, cuts, args.bin_width, args.seed)
+        json_data = write_stream(units, excel=excel)
+    elif args.engine == 'legacy':
+        json_data = run_legacy(df_basic, cuts, args.bin_width)
+    elif args.engine == 'analytic':
+        json_data = run_analytic(df_basic, cuts, args.bin_width)
+    elif args.incremental:
+        json_data = run_incremental(df_basic, fingerprints, simulate)
+    else:
+        json_data = simulate(df_basic)
+    elapsed = time.perf_counter() - started
+
+    applicant_count = sum(info['mockApplicantCount'] for info in json_data['basicInfo'].values())
+    print(f'   - 총 {len(json_data["basicInfo"])}개 모집단위, 지원자 {applicant_count:,}명 생성 ({elapsed:.2f}s)')
+
+    # 4. JSON 파일 저장
+    print('\n4. JSON 파일 저장...')
+
+    if args.stream:
+        json_data_clean = json_data
+        print('   - 시뮬레이션 중 모집단위별로 저장 완료')
+    else:
+        json_data_clean = convert_nan_to_none(json_data)
+
+        with open(OUTPUT_JSON, 'w', encoding='utf-8') as f:
+            json.dump(json_data_clean, f, ensure_ascii=False, indent=2)
+    print(f'   ✅ {OUTPUT_JSON} ({os.path.getsize(OUTPUT_JSON) / 1024 / 1024:,.1f}MB)')
+
+    write_lookup_index(json_data_clean['basicInfo'])
+
+    if args.shard_by:
+        print_shard_report(write_shards(json_data_clean, args.shard_by))
+
+    if args.columnar:
+        print_columnar_report(write_columnar_frequency(json_data_clean['frequencyDistribution']))
+
+    if args.pass_probability:
+        write_pass_probability(df_basic, cuts, args.replicates, args.seed)
+
+    if args.load_db:
+        # psycopg2/susi-back/bulk_load.py는 DB 적재할 때만 필요
+        from mock_data_db import load_mock_data, print_load_report
+        print_load_report(load_mock_data(json_data_clean))
+
+    # 매니페스트는 batch 엔진 결과 기준 (legacy는 전역 난수열이라 행 단위로 재현되지 않음)
+    if fingerprints is not None:
+        save_manifest(fingerprints)
+        print(f'   ✅ {MANIFEST_FILE}')
+    elif os.path.exists(MANIFEST_FILE):
+        os.remove(MANIFEST_FILE)
+
+    if args.excel_full:
+        # 5. 엑셀 파일 생성 (전체 모집단위, 행 단위로 바로 기록하므로 모집단위 수와 관계없이 메모리 일정)
+        print(f'\n5. 엑셀 파일 생성 (전체 모집단위{" + 지원자목록" if args.excel_applicants else ""})...')
+        if excel is None:
+            excel_rss, excel_started = peak_rss(), time.perf_counter()
+            excel = open_excel_full(df_basic, args.excel_applicants)
+            applicants = json_data_clean.get('applicants', {})
+            for rid, freq_dist in json_data_clean['frequencyDistribution'].items():
+                export_unit_excel(excel, rid, freq_dist, applicants.get(rid))
+        else:
+            print('   - 도수분포/지원자 행은 시뮬레이션 중 기록 (시간에 시뮬레이션 포함)')
+        print_excel_report(excel.close(), OUTPUT_EXCEL, time.perf_counter() - excel_started, excel_rss)
+    else:
+        # 5. 엑셀 파일 생성 (기본정보 + 샘플, 전체는 --excel-full)
+        print('\n5. 엑셀 파일 생성 (기본정보 + 샘플)...')
 
-    # 5. 엑셀 파일 생성 (기본정보만, 전체 데이터는 너무 큼)
-    print('\n5. 엑셀 파일 생성 (기본정보 + 샘플)...')
+        # 샘플 데이터 (처음 100개만)
+        sample_ids = list(json_data['basicInfo'].keys())[:100]
 
-    # 샘플 데이터 (처음 100개만)
-    sample_ids = list(json_data['basicInfo'].keys())[:100]
+        sample_freq = []
 
-    sample_freq = []
+        for rid in sample_ids:
+            for f in json_data['frequencyDistribution'].get(rid, []):
+                sample_freq.append({'row_id': rid, **f})
 
-    for rid in sample_ids:
-        for f in json_data['frequencyDistribution'].get(rid, []):
-            sample_freq.append({'row_id': rid, **f})
+        df_sample_freq = pd.DataFrame(sample_freq)
 
-    df_sample_freq = pd.DataFrame(sample_freq)
+        with pd.ExcelWriter(OUTPUT_EXCEL, engine='openpyxl') as writer:
+            df_basic.to_excel(writer, sheet_name='기본정보', index=False)
+            if not df_sample_freq.empty:
+                df_sample_freq.to_excel(writer, sheet_name='도수분포_샘플', index=False)
 
-    with pd.ExcelWriter(OUTPUT_EXCEL, engine='openpyxl') as writer:
-        df_basic.to_excel(writer, sheet_name='기본정보', index=False)
-        if not df_sample_freq.empty:
-            df_sample_freq.to_excel(writer, sheet_name='도수분포_샘플', index=False)
+        print(f'   ✅ {OUTPUT_EXCEL}')
 
-    print(f'   ✅ {OUTPUT_EXCEL}')
+    print_timings()
+    print_peak_rss()
 
     print('\n' + '=' * 50)
     print('✅ 완료!')
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+모의지원 시뮬레이션 결과 PostgreSQL 적재 (generate_simulation.py --load-db)
+
+정적 JSON 대신 백엔드가 row_id 인덱스로 모집단위 하나만 조회할 수 있도록
+기본정보/통계/도수분포를 정규화 테이블 세 개에 나눠 적재한다.
+
+    mock_application_unit       row_id PK, 대학/모집단위 정보 (대학명+모집단위 인덱스)
+    mock_application_stats      row_id PK, 평균/표준편차/기준점/기준점 이상 인원/백분위 점수표
+    mock_application_frequency  (row_id, bin_no) PK, 도수분포 구간 (점수 높은 순 bin_no)
+
+row_id는 JSON/프론트엔드 키와 같은 문자열로 저장한다 (엑셀 row_id가 정수가 아니어도 그대로 적재).
+
+적재 순서 (susi-back/bulk_load.py의 swap_load와 같은 방식, 단 세 테이블을 한 번에 교체)
+1. 테이블마다 {table}_shadow 를 만들고 COPY FROM STDIN(CSV)으로 적재, 인덱스 생성 후 ANALYZE하고 커밋
+2. 짧은 트랜잭션에서 원본 세 개를 잠그고 삭제한 뒤 섀도 테이블 이름을 원본으로 변경
+
+2번이 커밋되기 전까지 조회는 기존 결과를 그대로 보고, 커밋 후에는 세 테이블이 함께 바뀐다.
+원본 테이블이 없으면(첫 적재) 섀도 테이블 이름만 바꾼다.
+COPY 직렬화(copy_rows)와 섀도 이름 규칙(shadow_name)은 susi-back/bulk_load.py의 것을 그대로 쓴다.
+
+접속 정보는 백엔드 .env와 같은 DB_HOST/DB_PORT/DB_NAME/DB_USER/DB_PASSWORD 환경변수에서 읽는다.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'susi-back'))
+from bulk_load import copy_rows, shadow_name
+
+# 데이터베이스 연결 정보 (환경변수가 없으면 개발 DB)
+DB_CONFIG = {
+    'host': os.environ.get('DB_HOST', '127.0.0.1'),
+    'port': int(os.environ.get('DB_PORT', '5432')),
+    'database': os.environ.get('DB_NAME', 'geobukschool_dev'),
+    'user': os.environ.get('DB_USER', 'tsuser'),
+    'password': os.environ.get('DB_PASSWORD', 'tsuser1234'),
+}
+
+# 교체 시 원본 테이블 잠금 대기 한도 (조회가 길게 물려 있으면 교체를 포기)
+SWAP_LOCK_TIMEOUT = '5s'
+
+# 테이블별 컬럼 정의, 기본키, 추가 인덱스 (인덱스 이름은 idx_{테이블}_{키})
+TABLES = {
+    'mock_application_unit': {
+        'columns': [
+            ('row_id', 'TEXT NOT NULL'),
+            ('university_code', 'VARCHAR(20)'),
+            ('university_name', 'VARCHAR(300)'),
+            ('admission_type', 'VARCHAR(10)'),
+            ('recruitment_unit', 'VARCHAR(400)'),
+            ('recruitment_count', 'INTEGER'),
+            ('competition_rate', 'NUMERIC(10, 2)'),
+            ('additional_pass_rank', 'INTEGER'),
+            ('total_pass_count', 'INTEGER'),
+            ('mock_applicant_count', 'INTEGER'),
+        ],
+        'primary_key': ['row_id'],
+        'indexes': {'lookup': ['university_name', 'recruitment_unit']},
+    },
+    'mock_application_stats': {
+        'columns': [
+            ('row_id', 'TEXT NOT NULL'),
+            ('mean', 'DOUBLE PRECISION'),
+            ('std_dev', 'DOUBLE PRECISION'),
+            ('min_score', 'DOUBLE PRECISION'),
+            ('max_score', 'DOUBLE PRECISION'),
+            ('safe_pass_threshold', 'DOUBLE PRECISION'),
+            ('pass_threshold', 'DOUBLE PRECISION'),
+            ('safe_pass_count', 'INTEGER'),
+            ('pass_count', 'INTEGER'),
+            ('score_quantiles', 'DOUBLE PRECISION[]'),
+        ],
+        'primary_key': ['row_id'],
+        'indexes': {},
+    },
+    'mock_application_frequency': {
+        'columns': [
+            ('row_id', 'TEXT NOT NULL'),
+            ('bin_no', 'INTEGER NOT NULL'),
+            ('score_lower', 'DOUBLE PRECISION'),
+            ('score_upper', 'DOUBLE PRECISION'),
+            ('applicant_count', 'INTEGER'),
+            ('cumulative_count', 'INTEGER'),
+            ('pass_status', 'VARCHAR(20)'),
+        ],
+        'primary_key': ['row_id', 'bin_no'],
+        'indexes': {},
+    },
+}
+
+
+def _array_literal(values):
+    """PostgreSQL 배열 리터럴 ({1.5,2,...}), None이면 NULL"""
+    if values is None:
+        return None
+    return '{' + ','.join('NULL' if value is None else str(value) for value in values) + '}'
+
+
+def unit_rows(json_data):
+    """basicInfo -> mock_application_unit 행"""
+    for row_id, info in json_data['basicInfo'].items():
+        yield (
+            row_id, info['universityCode'], info['universityName'], info['admissionType'],
+            info['recruitmentUnit'], info['recruitmentCount'], info['competitionRate'],
+            info['additionalPassRank'], info['totalPassCount'], info['mockApplicantCount'],
+        )
+
+
+def stats_rows(json_data):
+    """basicInfo.stats + scoreQuantiles -> mock_application_stats 행"""
+    quantiles = json_data.get('scoreQuantiles', {})
+    for row_id, info in json_data['basicInfo'].items():
+        stats = info.get('stats') or {}
+        table = quantiles.get(row_id) or {}
+        yield (
+            row_id, stats.get('mean'), stats.get('stdDev'), stats.get('min'), stats.get('max'),
+            stats.get('safePassThreshold'), stats.get('passThreshold'),
+            table.get('safePassCount'), table.get('passCount'), _array_literal(table.get('scores')),
+        )
+
+
+def frequency_rows(json_data):
+    """frequencyDistribution -> mock_application_frequency 행 (bin_no는 모집단위 내 순서)"""
+    for row_id, items in json_data['frequencyDistribution'].items():
+        for bin_no, item in enumerate(items):
+            yield (
+                row_id, bin_no, item['scoreLower'], item['scoreUpper'],
+                item['applicantCount'], item['cumulativeCount'], item['passStatus'],
+            )
+
+
+ROW_BUILDERS = {
+    'mock_application_unit': unit_rows,
+    'mock_application_stats': stats_rows,
+    'mock_application_frequency': frequency_rows,
+}
+
+
+def _create_table(cursor, table, spec):
+    columns = ', '.join(f'{name} {definition}' for name, definition in spec['columns'])
+    cursor.execute(f"CREATE TABLE {table} ({columns})")
+
+
+def _build_indexes(cursor, table, shadow, spec):
+    """
+    섀도 테이블에 기본키/인덱스를 임시 이름으로 생성
+
+    Returns:
+        renames: 교체 후 원래 이름으로 되돌릴 [(종류, 임시 이름, 원래 이름)]
+    """
+    renames = []
+    primary_key = f'{table}_pkey'
+    cursor.execute(
+        f"ALTER TABLE {shadow} ADD CONSTRAINT {shadow_name(primary_key)} "
+        f"PRIMARY KEY ({', '.join(spec['primary_key'])})"
+    )
+    renames.append(('constraint', shadow_name(primary_key), primary_key))
+
+    for suffix, columns in spec['indexes'].items():
+        index_name = f'idx_{table}_{suffix}'
+        cursor.execute(f"CREATE INDEX {shadow_name(index_name)} ON {shadow} ({', '.join(columns)})")
+        renames.append(('index', shadow_name(index_name), index_name))
+    return renames
+
+
+def _existing_tables(cursor, tables):
+    cursor.execute(
+        "SELECT to_regclass(name) IS NOT NULL FROM unnest(%s::text[]) WITH ORDINALITY AS t(name, i) ORDER BY i",
+        (list(tables),),
+    )
+    return [table for table, (exists,) in zip(tables, cursor.fetchall()) if exists]
+
+
+def load_mock_data(json_data, db_config=None):
+    """
+    시뮬레이션 결과(JSON 구조, 지원자 목록 제외)를 섀도 테이블에 적재한 뒤 원본 세 개와 한 번에 교체
+
+    Returns:
+        {'rows': {테이블: 행 수}, 'load': 초, 'index': 초, 'swap': 초}
+    """
+    import psycopg2
+
+    report = {'rows': {}}
+    conn = psycopg2.connect(**(db_config or DB_CONFIG))
+    try:
+        cursor = conn.cursor()
+
+        started = time.perf_counter()
+        for table, spec in TABLES.items():
+            shadow = shadow_name(table)
+            cursor.execute(f"DROP TABLE IF EXISTS {shadow}")
+            _create_table(cursor, shadow, spec)
+            columns = [name for name, _ in spec['columns']]
+            report['rows'][table] = copy_rows(cursor, shadow, columns, ROW_BUILDERS[table](json_data))
+        report['load'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        renames = {}
+        for table, spec in TABLES.items():
+            shadow = shadow_name(table)
+            renames[table] = _build_indexes(cursor, table, shadow, spec)
+            cursor.execute(f"ANALYZE {shadow}")
+        conn.commit()
+        report['index'] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        try:
+            cursor.execute(f"SET LOCAL lock_timeout = '{SWAP_LOCK_TIMEOUT}'")
+            existing = _existing_tables(cursor, TABLES)
+            if existing:
+                cursor.execute(f"LOCK TABLE {', '.join(existing)} IN ACCESS EXCLUSIVE MODE")
+            for table in TABLES:
+                if table in existing:
+                    cursor.execute(f"DROP TABLE {table}")
+                cursor.execute(f"ALTER TABLE {shadow_name(table)} RENAME TO {table}")
+                for kind, temp_name, name in renames[table]:
+                    if kind == 'constraint':
+                        cursor.execute(f"ALTER TABLE {table} RENAME CONSTRAINT {temp_name} TO {name}")
+                    else:
+                        cursor.execute(f"ALTER INDEX {temp_name} RENAME TO {name}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        report['swap'] = time.perf_counter() - started
+        cursor.close()
+    finally:
+        conn.close()
+    return report
+
+
+def print_load_report(report):
+    total = sum(report['rows'].values())
+    print(f'   ✅ PostgreSQL 적재: {total:,}행 (COPY {report["load"]:.2f}s, '
+          f'인덱스 {report["index"]:.2f}s, 교체 {report["swap"] * 1000:.0f}ms)')
+    for table, count in report['rows'].items():
+        print(f'      · {table}: {count:,}행')
@@ -0,0 +1,683 @@
+# -*- coding: utf-8 -*-
+"""
+모의지원 데이터 출력 - generate_simulation.py / convert-excel-to-json.py 공용
+
+write_shards: mock-application-data.json과 같은 구조를 모집단위(row_id)별 또는 대학코드별
+작은 JSON 파일로 나눠 쓰고 index.json 매니페스트를 함께 만든다.
+프론트(use-mock-application-data.ts)는 index.json으로 row_id를 찾은 뒤 해당 샤드만 받는다.
+
+    public/data/mock-application/
+        index.json                 # 샤드 목록 + row_id별 매칭 정보
+        units/<row_id>.json        # --shard-by row
+        universities/<코드>.json   # --shard-by university
+
+write_columnar_frequency: frequencyDistribution을 모집단위별 병렬 배열로 저장 (+ .gz / .br)
+
+    {"version": 1, "binWidth": 5, "passStatuses": ["안정합격", ...],
+     "columns": ["scoreLower", "applicantCount", "passStatus"],
+     "units": {"<row_id>": [[하한...], [인원...], [상태 코드...]]}}
+
+    scoreUpper = scoreLower + binWidth, cumulativeCount = applicantCount 누적합.
+    모든 구간 폭이 같지 않거나 누적인원이 누적합과 다르면 해당 컬럼을 그대로 포함한다.
+
+build_lookup_index / write_lookup_index: 정규화한 (대학명, 모집단위) -> row_id 직접 조회 인덱스
+
+    {"version": 1, "byName": {"강원대학교|건축토목환경공학부": "12", ...},
+     "byCode": {"U012|건축토목환경공학부": "12", ...}}
+
+    키는 use-mock-application-data.ts의 normalizeString과 같은 규칙으로 정규화한다.
+    같은 키에 모집단위가 여럿이면(군만 다른 경우 등) 시트 순서상 첫 row_id를 쓰고 충돌 리포트에 남긴다.
+
+MockDataStreamWriter: mock-application-data.json을 모집단위 단위로 바로 쓰는 스트리밍 저장
+    섹션별 임시 파일에 항목을 이어 쓰고 close()에서 하나의 JSON으로 합친다.
+    json.dump(mock_data, indent=2)와 같은 바이트를 만들며, 전체 dict를 메모리에 두지 않는다.
+
+ExcelStreamWriter: openpyxl write-only 모드로 행을 바로 기록하는 엑셀 저장
+    시트가 행 한도(1,048,576)를 넘으면 '<시트명>_2' 이어짐 시트로 넘어간다.
+"""
+
+import gzip
+import json
+import os
+import re
+import shutil
+import math
+import statistics
+import sys
+from datetime import datetime
+
+SHARD_DIR = 'public/data/mock-application'
+SHARD_MODES = ['row', 'university']
+SHARD_SUBDIRS = {'row': 'units', 'university': 'universities'}
+INDEX_FILE = 'index.json'
+SECTIONS = ['basicInfo', 'frequencyDistribution', 'scoreQuantiles', 'applicants']
+
+# index.json rows의 배열 순서 (키 이름 반복을 줄이기 위해 객체 대신 배열로 저장)
+INDEX_ROW_FIELDS = ['shard', 'universityCode', 'universityName', 'recruitmentUnit', 'admissionType']
+
+COMPACT = (',', ':')
+
+COLUMNAR_FREQUENCY_FILE = 'public/data/mock-frequency.columnar.json'
+
+LOOKUP_FILE = 'public/data/mock-application-lookup.json'
+LOOKUP_REPORT_FILE = 'Uploads/mock-application-lookup-report.json'
+
+# 엑셀 시트당 최대 행 수 (헤더 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+# normalizeString: str.replace(/[·\s\-_·]/g, "").toLowerCase() (JS \s에 포함되는 BOM도 제거)
+_NORMALIZE_PATTERN = re.compile(r'[·\s\-_\ufeff]')
+
+# 상태 코드 순서 (generate_simulation.PASS_STATUSES와 같음, 그 밖의 상태는 뒤에 추가)
+PASS_STATUS_ORDER = ['안정합격', '추가합격', '합격가능', '불합격']
+
+try:
+    import brotli
+except ImportError:  # pip install brotli (없으면 .br 파일은 만들지 않음)
+    brotli = None
+
+try:
+    import resource
+except ImportError:  # Windows (최대 RSS는 psutil 또는 GetProcessMemoryInfo로 측정)
+    resource = None
+
+try:
+    import psutil
+except ImportError:  # pip install psutil (Windows에서 없으면 ctypes로 GetProcessMemoryInfo 호출)
+    psutil = None
+
+
+def _file_name(value):
+    """샤드 키를 파일명으로 쓸 수 있게 정리"""
+    name = re.sub(r'[^0-9A-Za-z가-힣._-]', '_', str(value)).strip('.')
+    return name or '_'
+
+
+def shard_key(row_id, info, shard_by):
+    if shard_by == 'row':
+        return _file_name(row_id)
+    code = info.get('universityCode')
+    return _file_name(code if code not in (None, '') else 'unknown')
+
+
+def _dump(obj, path):
+    """압축 JSON 저장 (NaN/Inf는 호출 전에 None으로 바꿔야 함), 저장한 바이트 수 반환"""
+    data = json.dumps(obj, ensure_ascii=False, separators=COMPACT, allow_nan=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def write_shards(mock_data, shard_by='row', out_dir=SHARD_DIR):
+    """
+    mock_data({basicInfo, frequencyDistribution, applicants?})를 샤드 파일 + index.json으로 저장
+
+    임시 디렉터리에 모두 쓴 뒤 out_dir와 교체하므로 이전 실행의 샤드 파일은 남지 않는다.
+
+    Returns:
+        report: {'shards': {키: 바이트}, 'index_bytes': 바이트, 'total_bytes': 바이트}
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f'shard_by는 {SHARD_MODES} 중 하나여야 합니다: {shard_by}')
+
+    sections = [section for section in SECTIONS if section in mock_data]
+    groups = {}
+    for row_id, info in mock_data['basicInfo'].items():
+        groups.setdefault(shard_key(row_id, info, shard_by), []).append(row_id)
+
+    subdir = SHARD_SUBDIRS[shard_by]
+    temp_dir = f'{out_dir}.tmp'
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(os.path.join(temp_dir, subdir))
+
+    shards = {}
+    shard_sizes = {}
+    for key, row_ids in groups.items():
+        payload = {
+            section: {row_id: mock_data[section][row_id] for row_id in row_ids if row_id in mock_data[section]}
+            for section in sections
+        }
+        file_name = f'{subdir}/{key}.json'
+        shard_sizes[key] = _dump(payload, os.path.join(temp_dir, file_name))
+        shards[key] = {'file': file_name, 'bytes': shard_sizes[key], 'rows': len(row_ids)}
+
+    rows = {}
+    for key, row_ids in groups.items():
+        for row_id in row_ids:
+            info = mock_data['basicInfo'][row_id]
+            rows[row_id] = [key] + [info.get(field) for field in INDEX_ROW_FIELDS[1:]]
+
+    index = {
+        'version': 1,
+        'shardBy': shard_by,
+        'generatedAt': datetime.now().isoformat(timespec='seconds'),
+        'sections': sections,
+        'rowFields': INDEX_ROW_FIELDS,
+        'shards': shards,
+        'rows': rows,
+    }
+    index_bytes = _dump(index, os.path.join(temp_dir, INDEX_FILE))
+
+    # 교체: 기존 디렉터리를 치우고 임시 디렉터리를 제자리로
+    old_dir = f'{out_dir}.old'
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(out_dir):
+        os.rename(out_dir, old_dir)
+    os.rename(temp_dir, out_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+    return {
+        'shards': shard_sizes,
+        'index_bytes': index_bytes,
+        'total_bytes': index_bytes + sum(shard_sizes.values()),
+    }
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f'{size:,.0f}{unit}' if unit == 'B' else f'{size:,.1f}{unit}'
+        size /= 1024
+
+
+def print_shard_report(report, out_dir=SHARD_DIR, largest=5):
+    """샤드 전체/개별 크기 요약 출력"""
+    sizes = report['shards']
+    print(f'   ✅ {out_dir}/ ({len(sizes)}개 샤드, 합계 {_format_bytes(report["total_bytes"])}, '
+          f'index.json {_format_bytes(report["index_bytes"])})')
+    if not sizes:
+        return
+    values = list(sizes.values())
+    print(f'      샤드 크기: 최소 {_format_bytes(min(values))}, 중앙값 {_format_bytes(statistics.median(values))}, '
+          f'최대 {_format_bytes(max(values))}')
+    for key, size in sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:largest]:
+        print(f'      · {key}: {_format_bytes(size)}')
+
+
+def _fixed_bin_width(frequency_distribution):
+    """모든 구간의 scoreUpper - scoreLower가 같으면 그 폭, 아니면 None"""
+    widths = {
+        item['scoreUpper'] - item['scoreLower']
+        for items in frequency_distribution.values()
+        for item in items
+    }
+    return widths.pop() if len(widths) == 1 else None
+
+
+def _cumulative_is_running_sum(frequency_distribution):
+    for items in frequency_distribution.values():
+        total = 0
+        for item in items:
+            total += item['applicantCount']
+            if item['cumulativeCount'] != total:
+                return False
+    return True
+
+
+def encode_columnar_frequency(frequency_distribution):
+    """frequencyDistribution({row_id: [구간 객체...]})을 컬럼형 구조로 변환"""
+    observed = {item['passStatus'] for items in frequency_distribution.values() for item in items}
+    statuses = [status for status in PASS_STATUS_ORDER if status in observed]
+    statuses += sorted(observed - set(statuses), key=str)
+    status_codes = {status: code for code, status in enumerate(statuses)}
+
+    bin_width = _fixed_bin_width(frequency_distribution)
+    columns = ['scoreLower', 'applicantCount', 'passStatus']
+    if bin_width is None:
+        columns.append('scoreUpper')
+    if not _cumulative_is_running_sum(frequency_distribution):
+        columns.append('cumulativeCount')
+
+    units = {}
+    for row_id, items in frequency_distribution.items():
+        units[row_id] = [
+            [status_codes[item[column]] for item in items] if column == 'passStatus'
+            else [item[column] for item in items]
+            for column in columns
+        ]
+
+    return {
+        'version': 1,
+        'binWidth': bin_width,
+        'passStatuses': statuses,
+        'columns': columns,
+        'units': units,
+    }
+
+
+def decode_columnar_frequency(columnar):
+    """encode_columnar_frequency의 역변환 (기존 frequencyDistribution 형식)"""
+    columns = columnar['columns']
+    statuses = columnar['passStatuses']
+    frequency_distribution = {}
+    for row_id, arrays in columnar['units'].items():
+        values = dict(zip(columns, arrays))
+        items = []
+        total = 0
+        for i, lower in enumerate(values['scoreLower']):
+            total += values['applicantCount'][i]
+            items.append({
+                'scoreLower': lower,
+                'scoreUpper': values['scoreUpper'][i] if 'scoreUpper' in values else lower + columnar['binWidth'],
+                'applicantCount': values['applicantCount'][i],
+                'cumulativeCount': values['cumulativeCount'][i] if 'cumulativeCount' in values else total,
+                'passStatus': statuses[values['passStatus'][i]],
+            })
+        frequency_distribution[row_id] = items
+    return frequency_distribution
+
+
+def write_columnar_frequency(frequency_distribution, path=COLUMNAR_FREQUENCY_FILE):
+    """
+    컬럼형 도수분포 JSON과 미리 압축한 .gz(/.br) 파일 저장
+
+    Returns:
+        report: {'baseline': 기존 형식(indent=2) 바이트, 'baseline_gzip': 기존 형식 gzip 바이트,
+                 'columnar': 바이트, 'gzip': 바이트, 'brotli': 바이트 또는 None}
+    """
+    columnar = encode_columnar_frequency(frequency_distribution)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    size = _dump(columnar, path)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    gzip_data = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip_data)
+
+    brotli_size = None
+    if brotli is not None:
+        brotli_data = brotli.compress(data, quality=11)
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli_data)
+        brotli_size = len(brotli_data)
+
+    baseline = json.dumps(frequency_distribution, ensure_ascii=False, indent=2).encode('utf-8')
+    return {
+        'baseline': len(baseline),
+        'baseline_gzip': len(gzip.compress(baseline, compresslevel=9, mtime=0)),
+        'columnar': size,
+        'gzip': len(gzip_data),
+        'brotli': brotli_size,
+    }
+
+
+def print_columnar_report(report, path=COLUMNAR_FREQUENCY_FILE):
+    """기존 형식 대비 크기 비교 출력"""
+    baseline = report['baseline']
+
+    def describe(size):
+        return f'{_format_bytes(size)} (-{(1 - size / baseline) * 100:.1f}%)' if baseline else _format_bytes(size)
+
+    print(f'   ✅ {path}')
+    print(f'      기존 형식(indent=2): {_format_bytes(baseline)}, gzip {_format_bytes(report["baseline_gzip"])}')
+    print(f'      컬럼형: {describe(report["columnar"])}')
+    print(f'      컬럼형 gzip: {describe(report["gzip"])}')
+    if report['brotli'] is None:
+        print('      컬럼형 brotli: 건너뜀 (pip install brotli)')
+    else:
+        print(f'      컬럼형 brotli: {describe(report["brotli"])}')
+
+
+def normalize_key(value):
+    """use-mock-application-data.ts normalizeString과 같은 정규화 (중간점, 공백, -, _ 제거 후 소문자)"""
+    if value is None:
+        return ''
+    return _NORMALIZE_PATTERN.sub('', str(value)).lower()
+
+
+def university_aliases(name):
+    """'강원대학교' <-> '강원대' 표기 차이용 별칭 (정규화된 이름 기준)"""
+    if name.endswith('대학교'):
+        return [name[:-2]]
+    if name.endswith('대'):
+        return [name + '학교']
+    return []
+
+
+def lookup_key(university, unit):
+    return f'{university}|{unit}'
+
+
+def _substring_match(a, b):
+    return a == b or a in b or b in a
+
+
+def build_lookup_index(basic_info):
+    """
+    basicInfo에서 정규화 키 -> row_id 인덱스와 충돌 리포트 생성
+
+    - byName: 정규화 대학명|모집단위 (정식 키가 없을 때만 대학교/대 별칭 키 추가)
+    - byCode: 대학코드|정규화 모집단위
+    - 리포트 collisions: 같은 키에 row_id가 여럿인 경우 (첫 row_id 사용)
+    - 리포트 shadowed: 기존 부분 문자열 순차 탐색이었다면 다른 row_id가 먼저 매칭되던 키
+      (예: '경영' 모집단위가 앞에 있으면 '경영학부' 조회가 '경영'으로 잡힘)
+    """
+    entries = []
+    for order, (row_id, info) in enumerate(basic_info.items()):
+        unit = normalize_key(info.get('recruitmentUnit'))
+        if unit:
+            entries.append((order, row_id, normalize_key(info.get('universityName')), unit, info))
+
+    by_name = {}
+    by_code = {}
+    collisions = {}
+    for _, row_id, university, unit, info in entries:
+        key = lookup_key(university, unit)
+        if key in by_name:
+            collisions.setdefault(key, [by_name[key]]).append(row_id)
+        else:
+            by_name[key] = row_id
+        code = info.get('universityCode')
+        if code:
+            by_code.setdefault(lookup_key(code, unit), row_id)
+
+    alias_count = 0
+    for _, row_id, university, unit, _ in entries:
+        for alias in university_aliases(university):
+            key = lookup_key(alias, unit)
+            if key not in by_name:
+                by_name[key] = row_id
+                alias_count += 1
+
+    # 기존 런타임 매칭(대학명/모집단위 부분 문자열, 시트 순서상 첫 행)과 비교
+    rows_by_university = {}
+    for entry in entries:
+        rows_by_university.setdefault(entry[2], []).append(entry)
+    related = {
+        university: [other for other in rows_by_university if _substring_match(university, other)]
+        for university in rows_by_university
+    }
+
+    shadowed = []
+    for _, row_id, university, unit, _ in entries:
+        key = lookup_key(university, unit)
+        if by_name[key] != row_id:
+            continue
+        first = None
+        for other in related[university]:
+            for order, other_row_id, _, other_unit, _ in rows_by_university[other]:
+                if first is not None and order >= first[0]:
+                    break
+                if _substring_match(unit, other_unit):
+                    first = (order, other_row_id)
+                    break
+        if first[1] != row_id:
+            shadowed.append({'key': key, 'rowId': row_id, 'substringMatch': first[1]})
+
+    report = {
+        'entries': len(entries),
+        'aliases': alias_count,
+        'collisions': [
+            {
+                'key': key,
+                'rowIds': row_ids,
+                'admissionTypes': [basic_info[row_id].get('admissionType') for row_id in row_ids],
+            }
+            for key, row_ids in collisions.items()
+        ],
+        'shadowed': shadowed,
+    }
+    return {'version': 1, 'byName': by_name, 'byCode': by_code}, report
+
+
+def write_lookup_index(basic_info, path=LOOKUP_FILE, report_path=LOOKUP_REPORT_FILE, examples=5):
+    """조회 인덱스 저장 + 충돌 리포트 출력/저장"""
+    lookup, report = build_lookup_index(basic_info)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    size = _dump(lookup, path)
+    os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f'   ✅ {path} ({_format_bytes(size)}, 대학명 키 {len(lookup["byName"])}개 '
+          f'(별칭 {report["aliases"]}개), 대학코드 키 {len(lookup["byCode"])}개)')
+    print(f'      충돌 {len(report["collisions"])}건 (첫 row_id 사용), '
+          f'부분 문자열 매칭과 결과가 달라지는 키 {len(report["shadowed"])}건 -> {report_path}')
+    for collision in report['collisions'][:examples]:
+        print(f'      · 충돌 {collision["key"]}: {collision["rowIds"]} {collision["admissionTypes"]}')
+    for item in report['shadowed'][:examples]:
+        print(f'      · {item["key"]}: {item["rowId"]} (기존 매칭 {item["substringMatch"]})')
+    return lookup, report
+
+
+def convert_nan_to_none(obj):
+    """NaN/Inf를 None으로 바꾼 사본 (JSON 표준에 없는 값 제거)"""
+    if isinstance(obj, dict):
+        return {k: convert_nan_to_none(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [convert_nan_to_none(item) for item in obj]
+    elif isinstance(obj, float) and (math.isnan(obj) or math.isinf(obj)):
+        return None
+    return obj
+
+
+class MockDataStreamWriter:
+    """
+    mock-application-data.json 스트리밍 저장
+
+        with MockDataStreamWriter(path, ['basicInfo', 'frequencyDistribution']) as writer:
+            for row_id, basic, freq in units:
+                writer.write(row_id, {'basicInfo': basic, 'frequencyDistribution': freq})
+
+    항목은 쓰는 시점에 NaN/Inf -> None으로 정리하고 섹션별 임시 파일(<path>.<섹션>.tmp)에 바로 기록한다.
+    close()에서 섹션 순서대로 이어 붙여 <path>.tmp를 만든 뒤 path와 교체하므로,
+    중간에 실패하면 기존 파일이 그대로 남는다. 같은 row_id를 두 번 쓰면 중복 키가 되므로 호출하는 쪽에서 막아야 한다.
+    """
+
+    def __init__(self, path, sections, indent=2):
+        self.path = path
+        self.sections = list(sections)
+        self.counts = dict.fromkeys(self.sections, 0)
+        self.bytes = 0
+        if indent is None:
+            self._newline, self._item_pad, self._section_pad = '', '', ''
+            self._separators = COMPACT
+        else:
+            self._newline = '\n'
+            self._section_pad = ' ' * indent
+            self._item_pad = ' ' * (indent * 2)
+            self._separators = (',', ': ')
+        self._indent = indent
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._spools = {section: open(self._spool_path(section), 'w', encoding='utf-8') for section in self.sections}
+
+    def _spool_path(self, section):
+        return f'{self.path}.{section}.tmp'
+
+    def _encode(self, value):
+        return json.dumps(value, ensure_ascii=False, indent=self._indent, separators=self._separators, allow_nan=False)
+
+    def write(self, row_id, values):
+        """
+        모집단위 하나의 섹션별 값 기록 ({섹션: 값}, 없는 섹션은 건너뜀)
+
+        Returns:
+            NaN/Inf를 정리한 {섹션: 값}
+        """
+        clean = {}
+        for section, value in values.items():
+            value = convert_nan_to_none(value)
+            # 중첩 깊이 2(최상위 -> 섹션 -> row_id)에 맞춰 두 번째 줄부터 들여쓰기
+            encoded = self._encode(value).replace('\n', '\n' + self._item_pad)
+            spool = self._spools[section]
+            if self.counts[section]:
+                spool.write(',' + self._newline)
+            spool.write(f'{self._item_pad}{self._encode(str(row_id))}{self._separators[1]}{encoded}')
+            self.counts[section] += 1
+            clean[section] = value
+        return clean
+
+    def close(self):
+        """섹션 임시 파일을 합쳐 path에 저장, 저장한 바이트 수 반환"""
+        for spool in self._spools.values():
+            spool.close()
+
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as out:
+            out.write('{' + self._newline)
+            for i, section in enumerate(self.sections):
+                if i:
+                    out.write(',' + self._newline)
+                out.write(f'{self._section_pad}{self._encode(section)}{self._separators[1]}')
+                if not self.counts[section]:
+                    out.write('{}')
+                    continue
+                out.write('{' + self._newline)
+                with open(self._spool_path(section), encoding='utf-8') as spool:
+                    shutil.copyfileobj(spool, out)
+                out.write(self._newline + self._section_pad + '}')
+            out.write(self._newline + '}')
+
+        os.replace(temp_path, self.path)
+        self._remove_spools()
+        self.bytes = os.path.getsize(self.path)
+        return self.bytes
+
+    def abort(self):
+        for spool in self._spools.values():
+            spool.close()
+        self._remove_spools()
+
+    def _remove_spools(self):
+        for section in self.sections:
+            if os.path.exists(self._spool_path(section)):
+                os.remove(self._spool_path(section))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+
+class ExcelStreamWriter:
+    """
+    행 단위로 기록하는 write-only 엑셀 (openpyxl write_only=True, 시트별 임시 파일에 바로 기록)
+
+        writer = ExcelStreamWriter(path, {'freq': ('도수분포', ['row_id', ...])})
+        writer.append('freq', [row_id, ...])
+        writer.close()
+
+    시트는 생성자에 준 순서대로 만들고 시트마다 아무 때나 행을 추가할 수 있다.
+    한 시트가 max_rows(헤더 포함)를 채우면 '<시트명>_2', '_3', ... 이어짐 시트를 만들어 계속 기록한다.
+    """
+
+    def __init__(self, path, sheets, max_rows=EXCEL_MAX_ROWS):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.max_rows = max_rows
+        self.workbook = Workbook(write_only=True)
+        self.sheets = {}
+        for key, (title, header) in sheets.items():
+            self.sheets[key] = {'title': title, 'header': list(header), 'parts': [], 'rows': 0, 'free': 0}
+            self._new_part(key)
+
+    def _new_part(self, key):
+        sheet = self.sheets[key]
+        if not sheet['parts']:
+            worksheet = self.workbook.create_sheet(sheet['title'])
+        else:
+            # 이어짐 시트는 같은 시트의 마지막 부분 바로 뒤에 배치
+            index = self.workbook.worksheets.index(sheet['parts'][-1]) + 1
+            worksheet = self.workbook.create_sheet(f'{sheet["title"]}_{len(sheet["parts"]) + 1}', index)
+        worksheet.append(sheet['header'])
+        sheet['parts'].append(worksheet)
+        sheet['free'] = self.max_rows - 1
+
+    def append(self, key, row):
+        sheet = self.sheets[key]
+        if not sheet['free']:
+            self._new_part(key)
+        # NaN은 빈 셀로 (pandas to_excel과 같음)
+        sheet['parts'][-1].append([None if isinstance(v, float) and math.isnan(v) else v for v in row])
+        sheet['free'] -= 1
+        sheet['rows'] += 1
+
+    def close(self):
+        """
+        저장 후 시트별 요약 반환
+
+        Returns:
+            {시트명: {'rows': 데이터 행 수, 'sheets': 이어짐 시트 포함 시트 수}}
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.workbook.save(self.path)
+        return {
+            sheet['title']: {'rows': sheet['rows'], 'sheets': len(sheet['parts'])}
+            for sheet in self.sheets.values()
+        }
+
+
+def print_excel_report(report, path, elapsed, rss_before=None):
+    print(f'   ✅ {path} ({_format_bytes(os.path.getsize(path))}, {elapsed:.2f}s)')
+    for title, summary in report.items():
+        continued = f' (이어짐 시트 {summary["sheets"] - 1}개)' if summary['sheets'] > 1 else ''
+        print(f'      · {title}: {summary["rows"]:,}행{continued}')
+    peak = peak_rss()
+    if peak is not None:
+        growth = f' (내보내기 전 {_format_bytes(rss_before)})' if rss_before is not None else ''
+        print(f'      · 최대 메모리(RSS): {_format_bytes(peak)}{growth}')
+
+
+def _windows_peak_rss():
+    """Windows 최대 작업 집합(PeakWorkingSetSize, 바이트)"""
+    if psutil is not None:
+        return psutil.Process().memory_info().peak_wset
+
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ('cb', wintypes.DWORD),
+            ('PageFaultCount', wintypes.DWORD),
+            ('PeakWorkingSetSize', ctypes.c_size_t),
+            ('WorkingSetSize', ctypes.c_size_t),
+            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+            ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+            ('PagefileUsage', ctypes.c_size_t),
+            ('PeakPagefileUsage', ctypes.c_size_t),
+        ]
+
+    kernel32, psapi = ctypes.WinDLL('kernel32'), ctypes.WinDLL('psapi')
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    psapi.GetProcessMemoryInfo.argtypes = [
+        wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD,
+    ]
+    psapi.GetProcessMemoryInfo.restype = wintypes.BOOL
+
+    counters = ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.PeakWorkingSetSize
+
+
+def peak_rss():
+    """프로세스 최대 RSS (바이트, 측정할 수 없으면 None)"""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss 단위: Linux KB, macOS 바이트
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if sys.platform == 'win32':
+        try:
+            return _windows_peak_rss()
+        except (OSError, AttributeError):
+            return None
+    return None
+
+
+def print_peak_rss():
+    peak = peak_rss()
+    if peak is None:
+        print('\n최대 메모리(RSS): 측정 불가')
+    else:
+        print(f'\n최대 메모리(RSS): {_format_bytes(peak)}')
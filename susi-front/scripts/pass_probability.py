@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+"""
+모집단위별 점수 -> 합격 확률 곡선
+
+generate_simulation.py --pass-probability 가 모집단위마다 시뮬레이션을 여러 번 반복해 얻은
+기준점(안정합격: 모집인원 순위 점수, 합격: 합격자수 순위 점수) 분포를 분위수 LEVELS개로 줄여 저장한다.
+
+    {"version": 1, "replicates": 200, "seed": 20241, "levels": 21,
+     "rowIds": ["1", ...], "safe": [[분위수 점수...], ...], "pass": [[...], ...]}
+
+점수 X의 합격 확률 = P(기준점 <= X), 분위수 사이는 선형 보간.
+PassProbabilityIndex.evaluate(X)는 전체 모집단위 곡선을 이어 붙인 배열 하나에 searchsorted를
+한 번 호출해 모든 모집단위의 확률을 함께 구한다.
+
+사용법:
+    python scripts/pass_probability.py 652.5            # 점수 652.5의 모집단위별 합격 확률 요약 + 지연 시간 측정
+    python scripts/pass_probability.py 652.5 --top 20
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+PASS_PROBABILITY_FILE = 'public/data/mock-pass-probability.json'
+
+# 곡선 하나에 저장하는 분위수 개수 (0%, 5%, ..., 100%)
+LEVELS = 21
+KINDS = ['safe', 'pass']
+
+COMPACT = (',', ':')
+
+
+def build_curves(row_ids, thresholds, levels=LEVELS):
+    """
+    반복 시뮬레이션 기준점으로 곡선 생성
+
+    Args:
+        row_ids: 모집단위 row_id 목록
+        thresholds: {'safe': (모집단위 수, 반복 수) 배열, 'pass': 같은 형식}
+
+    Returns:
+        {'rowIds': [...], 'safe': (모집단위 수, levels) 배열, 'pass': 같은 형식}
+    """
+    probabilities = np.linspace(0, 1, levels)
+    curves = {'rowIds': [str(row_id) for row_id in row_ids]}
+    for kind in KINDS:
+        curves[kind] = np.round(np.quantile(thresholds[kind], probabilities, axis=1).T, 2)
+    return curves
+
+
+def save_curves(curves, replicates, seed, path=PASS_PROBABILITY_FILE):
+    """곡선 JSON 저장 (압축), 저장한 바이트 수 반환"""
+    payload = {
+        'version': 1,
+        'replicates': replicates,
+        'seed': seed,
+        'levels': curves['safe'].shape[1] if len(curves['rowIds']) else LEVELS,
+        'rowIds': curves['rowIds'],
+        **{kind: curves[kind].tolist() for kind in KINDS},
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    data = json.dumps(payload, ensure_ascii=False, separators=COMPACT, allow_nan=False).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def load_curves(path=PASS_PROBABILITY_FILE):
+    with open(path, encoding='utf-8') as f:
+        payload = json.load(f)
+    curves = {'rowIds': payload['rowIds']}
+    for kind in KINDS:
+        curves[kind] = np.array(payload[kind], dtype=float).reshape(len(payload['rowIds']), payload['levels'])
+    return curves
+
+
+class PassProbabilityIndex:
+    """
+    전체 모집단위 곡선을 한 배열로 이어 붙인 조회 인덱스
+
+    모집단위 i의 곡선 값에 i * span을 더해 모집단위별 구간이 겹치지 않게 만들면,
+    점수 하나를 모집단위마다 같은 방식으로 옮긴 질의 배열에 searchsorted 한 번으로
+    모든 모집단위의 '곡선에서 점수 이하인 분위수 개수'를 구할 수 있다.
+    """
+
+    def __init__(self, curves):
+        self.row_ids = curves['rowIds']
+        self.unit_count = len(self.row_ids)
+        self.curves = {kind: curves[kind] for kind in KINDS}
+        self.levels = self.curves['safe'].shape[1] if self.unit_count else LEVELS
+
+        values = np.concatenate([curve.ravel() for curve in self.curves.values()]) if self.unit_count else np.zeros(1)
+        self.base = float(values.min())
+        # 곡선 값은 [0, span - 1] 범위로 옮겨지고 질의는 [-0.25, span - 0.5]로 잘라 이웃 모집단위와 겹치지 않음
+        self.span = float(np.ceil(values.max() - self.base)) + 1
+        self.unit_shift = np.arange(self.unit_count) * self.span
+        self.flat = {
+            kind: (curve - self.base + self.unit_shift[:, None]).ravel()
+            for kind, curve in self.curves.items()
+        }
+        self.unit_start = np.arange(self.unit_count) * self.levels
+
+    def _probability(self, kind, score):
+        curve = self.curves[kind]
+        relative = min(max(score - self.base, -0.25), self.span - 0.5)
+        position = np.searchsorted(self.flat[kind], relative + self.unit_shift, side='right') - self.unit_start
+
+        # position: 점수 이하인 분위수 개수 (0이면 확률 0, levels면 1, 그 사이는 이웃 분위수로 선형 보간)
+        inner = np.clip(position, 1, self.levels - 1)
+        rows = np.arange(self.unit_count)
+        lower = curve[rows, inner - 1]
+        upper = curve[rows, inner]
+        fraction = np.clip((score - lower) / np.maximum(upper - lower, 1e-12), 0, 1)
+        probability = (inner - 1 + fraction) / (self.levels - 1)
+        return np.where(position <= 0, 0.0, np.where(position >= self.levels, 1.0, probability))
+
+    def evaluate(self, score):
+        """
+        학생 점수 하나에 대한 전체 모집단위 합격 확률
+
+        Returns:
+            {'safe': 안정합격 확률 배열, 'pass': 합격(충원 포함) 확률 배열} (row_ids 순서)
+        """
+        return {kind: self._probability(kind, float(score)) for kind in KINDS}
+
+    def evaluate_loop(self, score):
+        """비교용: 모집단위마다 np.interp를 호출하는 방식"""
+        probabilities = np.linspace(0, 1, self.levels)
+        return {
+            kind: np.array([
+                0.0 if score < curve[0] else np.interp(score, curve, probabilities, right=1.0)
+                for curve in self.curves[kind]
+            ])
+            for kind in KINDS
+        }
+
+
+def benchmark(index, scores, repeats=3):
+    """
+    점수별 전체 모집단위 평가 지연 시간 측정 (searchsorted 한 번 vs 모집단위별 np.interp)
+
+    Returns:
+        {'vectorized': 호출당 초(중앙값), 'loop': 호출당 초(중앙값), 'max_difference': 두 방식 확률 최대 차이}
+    """
+    def measure(evaluate, sample):
+        timings = []
+        for _ in range(repeats):
+            for score in sample:
+                started = time.perf_counter()
+                evaluate(score)
+                timings.append(time.perf_counter() - started)
+        return float(np.median(timings))
+
+    # 모집단위별 반복은 느리므로 일부 점수만 측정
+    loop_scores = scores[:max(len(scores) // 20, 1)]
+    max_difference = max(
+        float(np.abs(index.evaluate(score)[kind] - index.evaluate_loop(score)[kind]).max(initial=0))
+        for score in loop_scores for kind in KINDS
+    )
+    return {
+        'vectorized': measure(index.evaluate, scores),
+        'loop': measure(index.evaluate_loop, loop_scores),
+        'max_difference': max_difference,
+    }
+
+
+def print_benchmark(report, unit_count):
+    vectorized, loop = report['vectorized'], report['loop']
+    print(f'      전체 {unit_count:,}개 모집단위 평가 (점수 1개): searchsorted {vectorized * 1e3:.3f}ms, '
+          f'모집단위별 np.interp {loop * 1e3:.2f}ms ({loop / vectorized:,.0f}배), '
+          f'확률 최대 차이 {report["max_difference"]:.2e}')
+
+
+def main():
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+    parser = argparse.ArgumentParser(description='점수별 모집단위 합격 확률 조회')
+    parser.add_argument('score', type=float, help='학생 점수')
+    parser.add_argument('--file', default=PASS_PROBABILITY_FILE)
+    parser.add_argument('--top', type=int, default=10, help='합격 확률이 50%%에 가까운 모집단위 출력 개수')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = PassProbabilityIndex(load_curves(args.file))
+    print(f'{args.file}: {index.unit_count:,}개 모집단위 로드 ({time.perf_counter() - started:.2f}s)')
+    if not index.unit_count:
+        return
+
+    result = index.evaluate(args.score)
+    for kind, label in (('safe', '안정합격'), ('pass', '합격(충원 포함)')):
+        probability = result[kind]
+        print(f'  {label}: 90% 이상 {(probability >= 0.9).sum():,}개, 50% 이상 {(probability >= 0.5).sum():,}개, '
+              f'10% 미만 {(probability < 0.1).sum():,}개')
+
+    print(f'\n  합격 확률이 50%에 가까운 모집단위 {args.top}개')
+    for i in np.argsort(np.abs(result['pass'] - 0.5))[:args.top]:
+        print(f'    · row_id {index.row_ids[i]}: 합격 {result["pass"][i]:.1%}, 안정합격 {result["safe"][i]:.1%}')
+
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(index.base, index.base + index.span, 200)
+    print('\n  지연 시간')
+    print_benchmark(benchmark(index, scores), index.unit_count)
+
+
+if __name__ == '__main__':
+    main()
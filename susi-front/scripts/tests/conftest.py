@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""시뮬레이션 스크립트 테스트 공용 설정 (스크립트를 모듈로 import할 수 있도록 경로 추가)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
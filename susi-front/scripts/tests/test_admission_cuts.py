@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""admission_cuts: 응답 캐시의 ETag/304 재검증, 연결 실패 시 만료 캐시 사용, offline 모드 확인 (http.server 스텁)"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from admission_cuts import CacheMiss, ResponseCache, fetch_admission_cuts, get_json
+
+ETAG = '"cuts-v1"'
+
+
+def _page_body(admission_type, page):
+    """군마다 2페이지, 페이지마다 전형 하나"""
+    return {
+        'data': {
+            'items': [{
+                'university': {'name': f'{admission_type}대학'},
+                'recruitmentName': f'모집단위{page}',
+                'minCut': 500 + page,
+                'maxCut': 600 + page,
+                'totalScore': 1000,
+            }],
+            'meta': {'totalPages': 2},
+        },
+    }
+
+
+class StubServer:
+    """/explore/regular 스텁. 받은 요청 헤더를 기록하고 If-None-Match가 맞으면 304"""
+
+    def __init__(self):
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                params = {key: values[0] for key, values in parse_qs(url.query).items()}
+                server.requests.append((url.path, params, self.headers.get('If-None-Match')))
+
+                if self.headers.get('If-None-Match') == ETAG:
+                    self.send_response(304)
+                    self.send_header('ETag', ETAG)
+                    self.end_headers()
+                    return
+
+                payload = json.dumps(_page_body(params['admission_type'], int(params.get('page', 1))))
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', ETAG)
+                self.send_header('Content-Length', str(len(payload.encode('utf-8'))))
+                self.end_headers()
+                self.wfile.write(payload.encode('utf-8'))
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    stub = StubServer()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def session():
+    # create_session의 재시도(backoff)가 연결 실패 테스트를 늦추지 않도록 재시도 없는 세션 사용
+    with requests.Session() as s:
+        yield s
+
+
+PARAMS = {'year': 2024, 'admission_type': '가'}
+
+
+def test_expired_entry_is_revalidated_with_etag(server, session, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    url = f'{server.base_url}/explore/regular'
+
+    body, source = get_json(session, cache, url, PARAMS)
+    assert source == 'network'
+    fetched_at = cache.load(url, PARAMS)['fetchedAt']
+
+    revalidated, source = get_json(session, cache, url, PARAMS)
+    assert source == 'revalidated'
+    assert revalidated == body
+    # 두 번째 요청은 저장된 ETag로 조건부 요청, 304를 받으면 받은 시각만 갱신
+    assert [etag for _, _, etag in server.requests] == [None, ETAG]
+    entry = cache.load(url, PARAMS)
+    assert entry['etag'] == ETAG
+    assert entry['fetchedAt'] >= fetched_at
+
+
+def test_fresh_entry_is_served_without_request(server, session, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=3600)
+    url = f'{server.base_url}/explore/regular'
+
+    body, _ = get_json(session, cache, url, PARAMS)
+    assert get_json(session, cache, url, PARAMS) == (body, 'cache')
+    assert len(server.requests) == 1
+
+
+def test_connection_error_falls_back_to_stale_entry(server, session, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    url = f'{server.base_url}/explore/regular'
+    body, _ = get_json(session, cache, url, PARAMS)
+    server.stop()
+
+    assert get_json(session, cache, url, PARAMS) == (body, 'stale')
+    # 캐시가 없으면 연결 오류를 그대로 올림
+    with pytest.raises(requests.exceptions.ConnectionError):
+        get_json(session, cache, url, {**PARAMS, 'admission_type': '나'})
+
+
+def test_offline_mode_uses_cache_only(server, session, tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=0)
+    url = f'{server.base_url}/explore/regular'
+
+    with pytest.raises(CacheMiss):
+        get_json(session, cache, url, PARAMS, offline=True)
+    assert server.requests == []
+
+    body, _ = get_json(session, cache, url, PARAMS)
+    # 만료된 항목이라도 offline이면 재검증 없이 사용
+    assert get_json(session, cache, url, PARAMS, offline=True) == (body, 'cache')
+    assert len(server.requests) == 1
+
+
+def test_fetch_admission_cuts_merges_pages_and_replays_offline(server, tmp_path, capsys):
+    cache_dir = str(tmp_path)
+    cuts = fetch_admission_cuts(server.base_url, admission_types=['가', '나'], cache_dir=cache_dir, ttl=0)
+    assert cuts == {
+        (f'{admission_type}대학', f'모집단위{page}'): {'minCut': 500.0 + page, 'maxCut': 600.0 + page,
+                                                      'totalScore': 1000.0}
+        for admission_type in ['가', '나']
+        for page in (1, 2)
+    }
+    assert len(server.requests) == 4
+
+    server.stop()
+    # 다군은 캐시에 없으므로 건너뛰고, 나머지는 네트워크 없이 같은 결과
+    offline = fetch_admission_cuts(server.base_url, admission_types=['가', '나', '다'], offline=True,
+                                   cache_dir=cache_dir)
+    assert offline == cuts
+    assert '다군: 오프라인 캐시 없음' in capsys.readouterr().out
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""generate_simulation: legacy/batch 엔진 결과 일치, 증분 실행(매니페스트/기존 결과 재사용) 확인 (합성 기본정보 시트)"""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import generate_simulation as gs
+
+SEED = 7
+
+
+def _basic_frame(rows=20, seed=1):
+    """기본정보 시트 형식의 합성 DataFrame (모집인원/충원합격순위 결측 포함)"""
+    rs = np.random.RandomState(seed)
+    return pd.DataFrame({
+        'row_id': np.arange(rows),
+        '대학코드': [f'U{i % 5}' for i in range(rows)],
+        '대학명': [f'대학{i % 5}' for i in range(rows)],
+        '구분': '가',
+        '모집단위': [f'학과{i}' for i in range(rows)],
+        '모집인원': np.where(rs.rand(rows) < 0.1, np.nan, rs.randint(1, 40, rows)).astype(float),
+        '경쟁률': np.round(rs.uniform(0.5, 20, rows), 2),
+        '충원합격순위': np.where(rs.rand(rows) < 0.1, np.nan, rs.randint(0, 30, rows)),
+        '총합격자': rs.randint(1, 60, rows),
+        '모의지원자수': 0,
+    })
+
+
+def _cuts(df, seed=2):
+    rs = np.random.RandomState(seed)
+    return {
+        (row['대학명'], row['모집단위']): {
+            'minCut': float(rs.uniform(500, 900)), 'maxCut': float(rs.uniform(400, 490)), 'totalScore': 1000.0,
+        }
+        for row in df.to_dict('records')[::2]
+    }
+
+
+@pytest.mark.parametrize('include_applicants', [False, True])
+@pytest.mark.parametrize('bin_width', [None, 5, 2.5])
+def test_batch_engine_matches_legacy(bin_width, include_applicants, monkeypatch):
+    monkeypatch.setattr(gs, 'INCLUDE_APPLICANTS', include_applicants)
+    df = _basic_frame(rows=60)
+    legacy, mismatches = gs.engine_mismatches(df, _cuts(df), bin_width, seed=SEED)
+    assert mismatches == []
+    assert len(legacy['basicInfo']) > 40
+    assert ('applicants' in legacy) == include_applicants
+
+
+class Simulator:
+    """run_batch(seed) 래퍼, 다시 계산한 row_id를 기록"""
+
+    def __init__(self, cuts):
+        self.cuts = cuts
+        self.calls = []
+
+    def __call__(self, df):
+        self.calls.append([str(row_id) for row_id in df['row_id']])
+        return gs.run_batch(df, self.cuts, seed=SEED)
+
+
+def _save(json_data, fingerprints):
+    """main()과 같이 OUTPUT_JSON을 저장한 뒤 매니페스트 저장"""
+    os.makedirs(os.path.dirname(gs.OUTPUT_JSON), exist_ok=True)
+    with open(gs.OUTPUT_JSON, 'w', encoding='utf-8') as f:
+        json.dump(gs.convert_nan_to_none(json_data), f, ensure_ascii=False, indent=2)
+    gs.save_manifest(fingerprints)
+
+
+@pytest.fixture
+def previous_run(tmp_path, monkeypatch):
+    """tmp_path에서 전체 실행을 한 번 해 둔 상태 (df, 지문, 시뮬레이터, 결과)"""
+    monkeypatch.chdir(tmp_path)
+    df = _basic_frame()
+    simulate = Simulator(_cuts(df))
+    fingerprints = gs.input_fingerprints(df, simulate.cuts, SEED)
+    full = gs.run_incremental(df, fingerprints, simulate)
+    _save(full, fingerprints)
+    simulate.calls.clear()
+    return df, fingerprints, simulate, gs.convert_nan_to_none(full)
+
+
+def _skipped(df, full):
+    """지원자가 없어 결과에 없는 row_id (지문이 같아도 매번 다시 확인됨)"""
+    return [str(row_id) for row_id in df['row_id'] if str(row_id) not in full['basicInfo']]
+
+
+def test_unchanged_inputs_reuse_existing_output(previous_run):
+    df, fingerprints, simulate, full = previous_run
+    assert gs.convert_nan_to_none(gs.run_incremental(df, fingerprints, simulate)) == full
+    assert simulate.calls == [_skipped(df, full)]
+
+
+def test_changed_row_is_recomputed(previous_run):
+    df, _, simulate, full = previous_run
+    df.loc[3, '경쟁률'] += 1
+    fingerprints = gs.input_fingerprints(df, simulate.cuts, SEED)
+    result = gs.run_incremental(df, fingerprints, simulate)
+    assert simulate.calls == [sorted(['3', *_skipped(df, full)], key=int)]
+    assert gs.convert_nan_to_none(result) == gs.convert_nan_to_none(gs.run_batch(df, simulate.cuts, seed=SEED))
+
+
+def test_row_missing_from_output_is_recomputed(previous_run):
+    df, fingerprints, simulate, full = previous_run
+    # 지문은 그대로인데 기존 결과에 없는 행 (매니페스트는 출력과 함께 저장된 상태)
+    missing = next(iter(full['basicInfo']))
+    partial = {section: {k: v for k, v in units.items() if k != missing} for section, units in full.items()}
+    _save(partial, fingerprints)
+
+    result = gs.run_incremental(df, fingerprints, simulate)
+    assert simulate.calls == [sorted([missing, *_skipped(df, full)], key=int)]
+    assert gs.convert_nan_to_none(result) == full
+
+
+def test_output_overwritten_elsewhere_forces_full_run(previous_run):
+    df, fingerprints, simulate, full = previous_run
+    # convert-excel-to-json.py처럼 매니페스트를 갱신하지 않고 같은 파일을 덮어씀
+    with open(gs.OUTPUT_JSON, 'w', encoding='utf-8') as f:
+        json.dump({section: {} for section in full}, f)
+
+    result = gs.run_incremental(df, fingerprints, simulate)
+    assert simulate.calls == [[str(row_id) for row_id in df['row_id']]]
+    assert gs.convert_nan_to_none(result) == full
@@ -2,10 +2,11 @@ import React, { useMemo, useState } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Label } from "@/components/ui/label";
-import type { FrequencyDistributionItem, MockApplicationBasicInfo } from "./types";
+import type { FrequencyDistributionItem, MockApplicationBasicInfo, ScoreQuantileTable } from "./types";
 
 interface FrequencyDistributionTableProps {
   frequencyDistribution: FrequencyDistributionItem[];
+  scoreQuantiles?: ScoreQuantileTable | null;
   basicInfo: MockApplicationBasicInfo | null;
   myScore?: number;
 }
@@ -98,8 +99,43 @@ function aggregateDistribution(
   return result;
 }
 
+// 백분위 점수표에서 이진 탐색으로 점수의 백분위와 예상 순위 계산
+function locateScore(
+  table: ScoreQuantileTable,
+  score: number,
+  applicantCount: number
+): { percentile: number; rank: number } | null {
+  const { scores } = table;
+  if (scores.length < 2 || applicantCount <= 0) return null;
+
+  // scores[low] <= score < scores[high]가 되는 인접 백분위 찾기
+  const last = scores.length - 1;
+  let percentile: number;
+  if (score < scores[0]) {
+    percentile = 0;
+  } else if (score >= scores[last]) {
+    percentile = 100;
+  } else {
+    let low = 0;
+    let high = last;
+    while (high - low > 1) {
+      const mid = (low + high) >> 1;
+      if (scores[mid] <= score) low = mid;
+      else high = mid;
+    }
+    const span = scores[high] - scores[low];
+    const fraction = span > 0 ? (score - scores[low]) / span : 0;
+    percentile = ((low + fraction) / last) * 100;
+  }
+
+  // 백분위 q는 내림차순 1 + (1 - q/100) x (지원인원 - 1)등에 해당
+  const rank = Math.round(1 + (1 - percentile / 100) * (applicantCount - 1));
+  return { percentile, rank: Math.min(Math.max(rank, 1), applicantCount) };
+}
+
 export const FrequencyDistributionTable: React.FC<FrequencyDistributionTableProps> = ({
   frequencyDistribution,
+  scoreQuantiles,
   basicInfo,
   myScore,
 }) => {
@@ -136,6 +172,12 @@ export const FrequencyDistributionTable: React.FC<FrequencyDistributionTableProp
     );
   }, [myScore, aggregatedData]);
 
+  // 백분위 점수표가 있으면 구간 누적인원 대신 점수 단위 순위 사용
+  const myPosition = useMemo(() => {
+    if (!myScore || !scoreQuantiles || !basicInfo) return null;
+    return locateScore(scoreQuantiles, myScore, basicInfo.mockApplicantCount);
+  }, [myScore, scoreQuantiles, basicInfo]);
+
   // 입력값 변경 핸들러
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const value = e.target.value;
@@ -303,7 +345,16 @@ export const FrequencyDistributionTable: React.FC<FrequencyDistributionTableProp
               <span className="font-medium text-primary">내 예상 위치:</span>
               <span>
                 점수 <strong>{myScore.toFixed(1)}</strong>점 →{" "}
-                누적 <strong>{myScoreRange.cumulativeCount}</strong>등 →{" "}
+                {myPosition ? (
+                  <>
+                    <strong>{myPosition.rank}</strong>등 (상위{" "}
+                    {(100 - myPosition.percentile).toFixed(1)}%) →{" "}
+                  </>
+                ) : (
+                  <>
+                    누적 <strong>{myScoreRange.cumulativeCount}</strong>등 →{" "}
+                  </>
+                )}
                 <span
                   className={`font-bold ${
                     STATUS_STYLES[myScoreRange.passStatus]?.text || "text-gray-700"
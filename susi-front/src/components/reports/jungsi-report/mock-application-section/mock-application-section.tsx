@@ -20,7 +20,7 @@ export const MockApplicationSection: React.FC<MockApplicationSectionProps> = ({
   admissionType,
   myScore,
 }) => {
-  const { isLoading, error, basicInfo, frequencyDistribution, applicants, rowId } =
+  const { isLoading, error, basicInfo, frequencyDistribution, scoreQuantiles, applicants, rowId } =
     useMockApplicationData({
       universityCode,
       universityName,
@@ -87,6 +87,7 @@ export const MockApplicationSection: React.FC<MockApplicationSectionProps> = ({
       {frequencyDistribution.length > 0 && (
         <FrequencyDistributionTable
           frequencyDistribution={frequencyDistribution}
+          scoreQuantiles={scoreQuantiles}
           basicInfo={basicInfo}
           myScore={myScore}
         />
@@ -35,12 +35,40 @@ export interface ApplicantItem {
   note: string | null;
 }
 
+// 모집단위별 백분위 점수표 (scripts/generate_simulation.py)
+// scores[q]: 백분위 q(0~100)의 점수 (오름차순), *Count: 안정합격/합격 기준점 이상 인원
+export interface ScoreQuantileTable {
+  scores: number[];
+  safePassCount: number;
+  passCount: number;
+}
+
 export interface MockApplicationData {
   basicInfo: Record<string, MockApplicationBasicInfo>;
   frequencyDistribution: Record<string, FrequencyDistributionItem[]>;
+  scoreQuantiles?: Record<string, ScoreQuantileTable>; // 이전 버전 데이터에는 없음
   applicants: Record<string, ApplicantItem[]>;
 }
 
+// 샤드 출력 매니페스트 (public/data/mock-application/index.json)
+// rows[rowId] 값은 rowFields 순서의 배열: [shard, universityCode, universityName, recruitmentUnit, admissionType]
+export interface MockApplicationIndex {
+  version: number;
+  shardBy: "row" | "university";
+  generatedAt: string;
+  sections: (keyof MockApplicationData)[];
+  rowFields: string[];
+  shards: Record<string, { file: string; bytes: number; rows: number }>;
+  rows: Record<string, [string, string, string, string, string]>;
+}
+
+// mock-application-lookup.json (scripts/mock_data_writer.py): 정규화 키 -> row_id
+export interface MockApplicationLookup {
+  version: number;
+  byName: Record<string, string>; // "대학명|모집단위"
+  byCode: Record<string, string>; // "대학코드|모집단위"
+}
+
 // 히스토그램 차트용 데이터 타입
 export interface HistogramBin {
   range: string;
@@ -2,7 +2,10 @@ import { useState, useEffect, useMemo } from "react";
 import type {
   MockApplicationData,
   MockApplicationBasicInfo,
+  MockApplicationIndex,
+  MockApplicationLookup,
   FrequencyDistributionItem,
+  ScoreQuantileTable,
   ApplicantItem,
 } from "./types";
 
@@ -18,18 +21,113 @@ interface UseMockApplicationDataResult {
   error: string | null;
   basicInfo: MockApplicationBasicInfo | null;
   frequencyDistribution: FrequencyDistributionItem[];
+  scoreQuantiles: ScoreQuantileTable | null;
   applicants: ApplicantItem[];
   rowId: string | null;
 }
 
-// 데이터 캐시
-let cachedData: MockApplicationData | null = null;
+// 샤드 출력 (scripts/mock_data_writer.py): index.json으로 row_id를 찾고 해당 샤드만 받는다
+const SHARD_BASE_URL = "/data/mock-application";
+// 샤드 출력이 없으면 전체 파일 사용
+const SINGLE_FILE_URL = "/data/mock-application-data.json";
+// 정규화 키 직접 조회 인덱스 (없으면 부분 문자열 순차 매칭만 사용)
+const LOOKUP_URL = "/data/mock-application-lookup.json";
+
+type MatchInfo = Pick<
+  MockApplicationBasicInfo,
+  "universityCode" | "universityName" | "recruitmentUnit" | "admissionType"
+>;
+
+type DataSource = (
+  | { kind: "sharded"; index: MockApplicationIndex; entries: [string, MatchInfo][] }
+  | { kind: "single"; data: MockApplicationData; entries: [string, MatchInfo][] }
+) & { lookup: MockApplicationLookup | null };
+
+// 데이터 캐시 (index.json 또는 전체 파일, 샤드별 응답)
+let cachedSource: DataSource | null = null;
+let sourcePromise: Promise<DataSource> | null = null;
+const shardPromises = new Map<string, Promise<MockApplicationData>>();
+
+async function fetchJson<T>(url: string): Promise<T> {
+  const response = await fetch(url);
+  if (!response.ok) {
+    throw new Error("데이터를 불러오는데 실패했습니다.");
+  }
+  return (await response.json()) as T;
+}
+
+async function fetchSource(): Promise<DataSource> {
+  const lookupPromise = fetchJson<MockApplicationLookup>(LOOKUP_URL).catch(() => null);
+  try {
+    const index = await fetchJson<MockApplicationIndex>(`${SHARD_BASE_URL}/index.json`);
+    const entries = Object.entries(index.rows).map(
+      ([id, [, universityCode, universityName, recruitmentUnit, admissionType]]): [string, MatchInfo] => [
+        id,
+        { universityCode, universityName, recruitmentUnit, admissionType },
+      ],
+    );
+    return { kind: "sharded", index, entries, lookup: await lookupPromise };
+  } catch {
+    // 샤드 출력이 없는 배포 (개발 서버는 없는 파일에 index.html을 돌려주므로 파싱 실패도 포함)
+    const data = await fetchJson<MockApplicationData>(SINGLE_FILE_URL);
+    return { kind: "single", data, entries: Object.entries(data.basicInfo), lookup: await lookupPromise };
+  }
+}
+
+function hasRow(source: DataSource, rowId: string): boolean {
+  return source.kind === "sharded" ? rowId in source.index.rows : rowId in source.data.basicInfo;
+}
+
+function loadSource(): Promise<DataSource> {
+  if (!sourcePromise) {
+    sourcePromise = fetchSource().then(
+      (source) => {
+        cachedSource = source;
+        return source;
+      },
+      (err) => {
+        sourcePromise = null;
+        throw err;
+      },
+    );
+  }
+  return sourcePromise;
+}
+
+function loadShard(index: MockApplicationIndex, rowId: string): Promise<MockApplicationData> {
+  const shard = index.shards[index.rows[rowId][0]];
+  let promise = shardPromises.get(shard.file);
+  if (!promise) {
+    promise = fetchJson<MockApplicationData>(`${SHARD_BASE_URL}/${shard.file}`);
+    promise.catch(() => shardPromises.delete(shard.file));
+    shardPromises.set(shard.file, promise);
+  }
+  return promise;
+}
 
 // 문자열 정규화 (중간점, 공백, 특수문자 제거)
 function normalizeString(str: string): string {
   return str.replace(/[·\s\-_·]/g, "").toLowerCase();
 }
 
+// 정규화 키로 row_id 직접 조회 (대학명이 없으면 대학코드 사용)
+function lookupRowId(
+  source: DataSource,
+  universityCode: string,
+  universityName: string,
+  recruitmentUnit: string,
+): string | null {
+  if (!source.lookup) {
+    return null;
+  }
+  // 키에 항상 "|"가 들어가므로 Object.prototype 속성과 겹치지 않는다
+  const unit = normalizeString(recruitmentUnit);
+  const id = universityName
+    ? source.lookup.byName[`${normalizeString(universityName)}|${unit}`]
+    : source.lookup.byCode[`${universityCode}|${unit}`];
+  return id && hasRow(source, id) ? id : null;
+}
+
 // 대학명 매칭 (강원대 <-> 강원대학교)
 function matchUniversityName(name1: string, name2: string): boolean {
   const n1 = normalizeString(name1);
@@ -49,31 +147,24 @@ export function useMockApplicationData({
   universityName,
   recruitmentUnit,
 }: UseMockApplicationDataParams): UseMockApplicationDataResult {
-  const [data, setData] = useState<MockApplicationData | null>(cachedData);
-  const [isLoading, setIsLoading] = useState(!cachedData);
+  const [source, setSource] = useState<DataSource | null>(cachedSource);
+  const [shard, setShard] = useState<MockApplicationData | null>(null);
+  const [isLoading, setIsLoading] = useState(!cachedSource);
   const [error, setError] = useState<string | null>(null);
 
   useEffect(() => {
-    if (cachedData) {
-      setData(cachedData);
-      setIsLoading(false);
+    if (cachedSource) {
+      setSource(cachedSource);
       return;
     }
 
     const fetchData = async () => {
       try {
         setIsLoading(true);
-        const dataResponse = await fetch("/data/mock-application-data.json");
-        if (!dataResponse.ok) {
-          throw new Error("데이터를 불러오는데 실패했습니다.");
-        }
-        const mockData = await dataResponse.json() as MockApplicationData;
-        cachedData = mockData;
-        setData(mockData);
+        setSource(await loadSource());
         setError(null);
       } catch (err) {
         setError(err instanceof Error ? err.message : "알 수 없는 오류가 발생했습니다.");
-      } finally {
         setIsLoading(false);
       }
     };
@@ -83,11 +174,17 @@ export function useMockApplicationData({
 
   // 대학/모집단위만으로 매칭 (군은 제외)
   const rowId = useMemo(() => {
-    if (!data || !recruitmentUnit) {
+    if (!source || !recruitmentUnit) {
       return null;
     }
 
-    for (const [id, info] of Object.entries(data.basicInfo)) {
+    const directId = lookupRowId(source, universityCode, universityName, recruitmentUnit);
+    if (directId) {
+      return directId;
+    }
+
+    // 인덱스에 없는 표기는 부분 문자열 매칭으로 순차 탐색
+    for (const [id, info] of source.entries) {
       const nameMatch = universityName
         ? matchUniversityName(info.universityName, universityName)
         : info.universityCode === universityCode;
@@ -112,13 +209,51 @@ export function useMockApplicationData({
     });
 
     return null;
-  }, [data, universityCode, universityName, recruitmentUnit]);
+  }, [source, universityCode, universityName, recruitmentUnit]);
+
+  // 샤드 출력이면 매칭된 모집단위가 든 샤드만 받기
+  useEffect(() => {
+    if (!source) {
+      return;
+    }
+    if (source.kind === "single" || !rowId) {
+      setShard(null);
+      setIsLoading(false);
+      return;
+    }
+
+    let cancelled = false;
+    setIsLoading(true);
+    loadShard(source.index, rowId)
+      .then((data) => {
+        if (!cancelled) {
+          setShard(data);
+          setError(null);
+        }
+      })
+      .catch((err) => {
+        if (!cancelled) {
+          setError(err instanceof Error ? err.message : "알 수 없는 오류가 발생했습니다.");
+        }
+      })
+      .finally(() => {
+        if (!cancelled) {
+          setIsLoading(false);
+        }
+      });
+
+    return () => {
+      cancelled = true;
+    };
+  }, [source, rowId]);
 
   const result = useMemo(() => {
+    const data = source?.kind === "single" ? source.data : shard;
     if (!data || !rowId) {
       return {
         basicInfo: null,
         frequencyDistribution: [],
+        scoreQuantiles: null,
         applicants: [],
       };
     }
@@ -126,9 +261,10 @@ export function useMockApplicationData({
     return {
       basicInfo: data.basicInfo[rowId] || null,
       frequencyDistribution: data.frequencyDistribution?.[rowId] || [],
+      scoreQuantiles: data.scoreQuantiles?.[rowId] || null,
       applicants: data.applicants?.[rowId] || [],
     };
-  }, [data, rowId]);
+  }, [source, shard, rowId]);
 
   return {
     isLoading,